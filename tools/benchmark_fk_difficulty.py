@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+"""
+
+   Measures the time it takes to estimate the Flesch-Kincaid
+   difficulty of the articles in the test data, comparing
+   the cached syllable counting with creating a Pyphen object
+   for every word as we used to.
+
+        python benchmark_fk_difficulty.py [repetitions]
+
+"""
+
+import os
+import sys
+import timeit
+from collections import Counter
+
+import newspaper
+import pyphen
+
+from zeeguu.core.model import Language
+from zeeguu.core.language.difficulty_estimator_factory import (
+    DifficultyEstimatorFactory,
+)
+from zeeguu.core.language.strategies.flesch_kincaid_difficulty_estimator import (
+    FleschKincaidDifficultyEstimator,
+)
+from zeeguu.core.language import syllables
+from zeeguu.core.util.text import split_words_from_text
+from zeeguu.core.test.test_data.mocking_the_web import TESTDATA_FOLDER
+
+FIXTURES = {
+    "der_kleine_prinz.html": "de",
+    "diesel_fahrverbote.html": "de",
+    "spiegel_militar.html": "de",
+    "formation_professionnelle.html": "fr",
+    "vols_americans.html": "fr",
+    "fish_will_be_gone.html": "en",
+    "investing_in_index_funds.html": "en",
+    "plane_crashes.html": "en",
+}
+
+repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+
+def uncached_syllables_in_text(words, language_code):
+    # how syllables were counted before the cache
+    total = 0
+    for word, freq in Counter(words).items():
+        dic = pyphen.Pyphen(lang=language_code)
+        total += (len(dic.positions(word)) + 1) * freq
+    return total
+
+
+def article_text(file_name):
+    with open(os.path.join(TESTDATA_FOLDER, file_name), encoding="utf-8") as f:
+        art = newspaper.Article(url="")
+        art.download(input_html=f.read())
+        art.parse()
+        return art.text
+
+
+fk = DifficultyEstimatorFactory.get_difficulty_estimator("fk")
+
+articles = [
+    (file_name, article_text(file_name), Language(code, Language.LANGUAGE_NAMES[code]))
+    for file_name, code in FIXTURES.items()
+]
+
+
+def estimate_all():
+    for _, text, language in articles:
+        fk.estimate_difficulty(text, language, None)
+
+
+def time_per_article():
+    return timeit.timeit(estimate_all, number=repetitions) / (
+        repetitions * len(articles)
+    )
+
+
+# the estimator module imported the function by name
+fk_module = sys.modules[FleschKincaidDifficultyEstimator.__module__]
+try:
+    fk_module.syllables_in_text = uncached_syllables_in_text
+    before = time_per_article()
+finally:
+    fk_module.syllables_in_text = syllables.syllables_in_text
+
+syllables.syllables_in_word.cache_clear()
+after_cold = timeit.timeit(estimate_all, number=1) / len(articles)
+after = time_per_article()
+
+for file_name, text, language in articles:
+    words = [w.lower() for w in split_words_from_text(text)]
+    assert uncached_syllables_in_text(
+        words, language.code
+    ) == syllables.syllables_in_text(words, language.code), file_name
+
+print(f"{len(articles)} articles, {repetitions} repetitions")
+print(f"  per Pyphen word:   {1000 * before:8.2f} ms / article")
+print(f"  cached, cold:      {1000 * after_cold:8.2f} ms / article")
+print(f"  cached, warm:      {1000 * after:8.2f} ms / article")
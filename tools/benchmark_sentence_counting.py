@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+"""
+
+   Compares the ways of counting the sentences of the articles in
+   the test data: nltk.sent_tokenize (the English punkt model, loaded
+   at every call), the punkt tokenizer of the language with the spans
+   memoised by text hash, and the regex heuristic. For the heuristic,
+   also how far its counts are from those of punkt.
+
+        python benchmark_sentence_counting.py [repetitions]
+
+"""
+
+import os
+import sys
+import timeit
+
+import nltk
+from bs4 import BeautifulSoup
+
+from zeeguu.core.language import sentences
+from zeeguu.core.test.test_data.mocking_the_web import TESTDATA_FOLDER
+
+FIXTURES = {
+    "der_kleine_prinz.html": "de",
+    "diesel_fahrverbote.html": "de",
+    "spiegel_militar.html": "de",
+    "formation_professionnelle.html": "fr",
+    "vols_americans.html": "fr",
+    "fish_will_be_gone.html": "en",
+    "investing_in_index_funds.html": "en",
+    "plane_crashes.html": "en",
+}
+
+repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+
+def article_text(file_name):
+    with open(os.path.join(TESTDATA_FOLDER, file_name), encoding="utf-8") as f:
+        return BeautifulSoup(f.read(), "lxml").get_text()
+
+
+texts = [(article_text(file_name), code) for file_name, code in FIXTURES.items()]
+
+
+def sent_tokenize():
+    for text, code in texts:
+        len(nltk.sent_tokenize(text))
+
+
+def punkt_of_language():
+    for text, code in texts:
+        sentences.count_sentences(text, code)
+
+
+def heuristic():
+    for text, code in texts:
+        sentences.count_sentences_fast(text)
+
+
+def per_article(function):
+    return timeit.timeit(function, number=repetitions) / (repetitions * len(texts))
+
+
+time_sent_tokenize = per_article(sent_tokenize)
+
+time_cold = timeit.timeit(punkt_of_language, number=1) / len(texts)
+time_memoised = per_article(punkt_of_language)
+
+time_heuristic = per_article(heuristic)
+
+print(f"{len(texts)} articles, {repetitions} repetitions")
+print(f"  nltk.sent_tokenize:      {1000 * time_sent_tokenize:8.3f} ms / article")
+print(f"  punkt of language, cold: {1000 * time_cold:8.3f} ms / article")
+print(f"  punkt, memoised:         {1000 * time_memoised:8.3f} ms / article")
+print(f"  heuristic:               {1000 * time_heuristic:8.3f} ms / article")
+
+print()
+print("sentences: punkt / heuristic")
+total_error = 0
+for (text, code), file_name in zip(texts, FIXTURES):
+    expected = sentences.count_sentences(text, code)
+    estimated = sentences.count_sentences_fast(text)
+    error = abs(estimated - expected) / max(expected, 1)
+    total_error += error
+    print(f"  {file_name:32} {expected:5} / {estimated:5}  ({100 * error:.1f}% off)")
+print(f"  mean error: {100 * total_error / len(texts):.1f}%")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""
+
+   Measures the time it takes to tokenize and stem the articles in the
+   test data, comparing the shared text processing (one stemmer per
+   language, cached stems) with creating a stemmer for every text as
+   the estimators used to.
+
+        python benchmark_text_processing.py [repetitions]
+
+"""
+
+import os
+import sys
+import timeit
+
+import regex
+from bs4 import BeautifulSoup
+from nltk import SnowballStemmer
+
+from zeeguu.core.model import Language
+from zeeguu.core.language import text_processing
+from zeeguu.core.test.test_data.mocking_the_web import TESTDATA_FOLDER
+
+FIXTURES = {
+    "der_kleine_prinz.html": "de",
+    "diesel_fahrverbote.html": "de",
+    "spiegel_militar.html": "de",
+    "formation_professionnelle.html": "fr",
+    "vols_americans.html": "fr",
+    "fish_will_be_gone.html": "en",
+    "investing_in_index_funds.html": "en",
+    "plane_crashes.html": "en",
+}
+
+repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+
+def article_text(file_name):
+    with open(os.path.join(TESTDATA_FOLDER, file_name), encoding="utf-8") as f:
+        return BeautifulSoup(f.read(), "lxml").get_text()
+
+
+texts = [(article_text(file_name), code) for file_name, code in FIXTURES.items()]
+
+
+def before():
+    # how every estimator used to do it
+    for text, code in texts:
+        words = regex.findall(r"(\b\p{L}+\b)", text)
+        stemmer = SnowballStemmer(Language.LANGUAGE_NAMES[code].lower())
+        [stemmer.stem(w.lower()) for w in words]
+
+
+def after():
+    for text, code in texts:
+        text_processing.stemmed_words(text, code)
+
+
+def per_article(function):
+    return timeit.timeit(function, number=repetitions) / (repetitions * len(texts))
+
+
+for text, code in texts:
+    stemmer = SnowballStemmer(Language.LANGUAGE_NAMES[code].lower())
+    expected = [stemmer.stem(w.lower()) for w in regex.findall(r"(\b\p{L}+\b)", text)]
+    assert text_processing.stemmed_words(text, code) == expected
+
+time_before = per_article(before)
+
+text_processing.stem.cache_clear()
+time_cold = timeit.timeit(after, number=1) / len(texts)
+time_after = per_article(after)
+
+print(f"{len(texts)} articles, {repetitions} repetitions")
+print(f"  stemmer per text:  {1000 * time_before:8.2f} ms / article")
+print(f"  shared, cold:      {1000 * time_cold:8.2f} ms / article")
+print(f"  shared, warm:      {1000 * time_after:8.2f} ms / article")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+"""
+
+   (Re)builds the word score tables of the estimators, e.g. after
+   the frequency lists or the cognates were updated. A language code
+   builds the frequency table of the language; a pair of codes builds
+   the cognates table of a language for the speakers of another.
+
+        python build_word_score_tables.py de fr da-en nl-en
+
+   The tables are saved in WORD_SCORE_TABLES_FOLDER, which has to be
+   configured; the estimators build the missing ones themselves, but
+   that's slow.
+
+"""
+
+import sys
+import time
+
+import zeeguu.core
+from zeeguu.core.model import Language
+from zeeguu.core.language.word_score_tables import (
+    WordScoreTable,
+    table_path,
+    WORD_SCORE_TABLES_FOLDER,
+)
+from zeeguu.core.language.strategies.frequency_difficulty_estimator import (
+    FrequencyDifficultyEstimator,
+)
+from zeeguu.core.language.strategies.cognacy_difficulty_estimator import (
+    CognacyDifficultyEstimator,
+)
+
+if len(sys.argv) < 2:
+    print(__doc__)
+    exit(1)
+
+if not WORD_SCORE_TABLES_FOLDER:
+    print("Set ZEEGUU_WORD_SCORE_TABLES_FOLDER or ZEEGUU_DATA_FOLDER first")
+    exit(1)
+
+print(f"Saving the tables in: {WORD_SCORE_TABLES_FOLDER}")
+
+for each in sys.argv[1:]:
+    start = time.time()
+
+    if "-" in each and each != "zh-CN":
+        language_code, native_code = each.split("-")
+        name = f"cognates-{language_code}-{native_code}"
+        scores = CognacyDifficultyEstimator.cognate_scores(
+            Language.find(language_code), Language.find(native_code)
+        )
+    else:
+        name = f"frequency-{each}"
+        scores = FrequencyDifficultyEstimator.frequency_scores(Language.find(each))
+
+    WordScoreTable.write(table_path(name), scores)
+    print(f"{name}: {len(scores)} stems in {time.time() - start:.1f}s")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+"""
+
+   Computes the ArticleTokenProfile of the articles that don't have
+   one yet, i.e. the ones that were saved before the profiles were
+   introduced.
+
+   To do it only for the articles of the last 30 days:
+
+        python compute_article_token_profiles.py 30
+
+   Without argument, it's done for all the articles.
+
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+import zeeguu.core
+from zeeguu.core.model import Article, ArticleTokenProfile
+
+session = zeeguu.core.db.session
+
+BATCH_SIZE = 1000
+
+
+def compute_token_profiles(after_date=None):
+    query = (
+        Article.query.outerjoin(ArticleTokenProfile)
+        .filter(ArticleTokenProfile.article_id == None)
+        .filter(Article.content != None)
+        .order_by(Article.id)
+    )
+    if after_date:
+        query = query.filter(Article.published_time > after_date)
+
+    counter = 0
+    last_id = 0
+    while True:
+        batch = query.filter(Article.id > last_id).limit(BATCH_SIZE).all()
+        if not batch:
+            break
+
+        for article in batch:
+            try:
+                ArticleTokenProfile.for_article(article, session)
+                counter += 1
+            except Exception as e:
+                print(f"Could not compute the profile of {article.id}: {str(e)}")
+
+        last_id = batch[-1].id
+        session.commit()
+        print(f"{counter} profiles computed. last article id: {last_id}")
+
+    print(f"Done. Computed: {counter}")
+
+
+if __name__ == "__main__":
+    after_date = None
+    if len(sys.argv) > 1:
+        after_date = datetime.now() - timedelta(days=int(sys.argv[1]))
+
+    compute_token_profiles(after_date)
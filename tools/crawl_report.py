@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""
+
+   Summarizes the feed crawls of the last days (by default one):
+   the time spent in every stage of the crawl, the outcomes of
+   the feed items, and the slowest feeds.
+
+        python crawl_report.py 7
+
+"""
+
+import sys
+from collections import defaultdict
+
+import zeeguu.core
+from zeeguu.core.model import FeedCrawlRun
+
+SLOWEST_FEEDS_TO_SHOW = 20
+
+days = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+runs = FeedCrawlRun.since(days)
+if not runs:
+    print(f"No crawls in the last {days} days")
+    exit(0)
+
+total_time = sum(run.duration for run in runs)
+print(f"{len(runs)} feed crawls in the last {days} days; {total_time:.0f}s in total")
+print("")
+
+print("Stages:")
+stage_totals = {
+    stage: sum(getattr(run, f"{stage}_time") or 0 for run in runs)
+    for stage in FeedCrawlRun.STAGES
+}
+for stage, seconds in sorted(stage_totals.items(), key=lambda x: -x[1]):
+    print(f"  {stage:<12} {seconds:>10.1f}s  {100 * seconds / total_time:5.1f}%")
+print("")
+
+print("Outcomes:")
+for outcome in FeedCrawlRun.OUTCOMES:
+    print(f"  {outcome:<16} {sum(getattr(run, outcome) or 0 for run in runs):>8}")
+print("")
+
+runs_by_feed = defaultdict(list)
+for run in runs:
+    runs_by_feed[run.feed].append(run)
+
+
+def time_spent(feed_runs):
+    return sum(run.duration for run in feed_runs)
+
+
+def slowest_stage(feed_runs):
+    return max(
+        FeedCrawlRun.STAGES,
+        key=lambda stage: sum(getattr(run, f"{stage}_time") or 0 for run in feed_runs),
+    )
+
+
+print(f"Slowest feeds:")
+slowest = sorted(runs_by_feed.items(), key=lambda x: -time_spent(x[1]))
+for feed, feed_runs in slowest[:SLOWEST_FEEDS_TO_SHOW]:
+    downloaded = sum(run.downloaded or 0 for run in feed_runs)
+    print(
+        f"  {time_spent(feed_runs):>8.1f}s  {len(feed_runs):>3} crawls "
+        f"{downloaded:>4} articles  mostly in: {slowest_stage(feed_runs):<10} "
+        f"{feed.title if feed else '?'}"
+    )
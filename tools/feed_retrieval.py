@@ -13,14 +13,22 @@
    in a given feed was done while serving the request for
    items to read. That was too slow.
 
-   To be called from a cron job.
+   To be called from a cron job. Only the feeds that are due
+   according to their estimated publishing rate are crawled.
 
 """
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 
 import zeeguu.core
 from zeeguu.core import log
-from zeeguu.core.content_retriever.article_downloader import download_from_feed
+from zeeguu.core.content_retriever.article_downloader import (
+    download_from_feed,
+    save_enrichments,
+)
+from zeeguu.core.content_retriever.enrichment_queue import EnrichmentQueue
+from zeeguu.core.content_retriever.near_duplicates import NearDuplicateIndex
+from zeeguu.core.content_retriever.crawl_scheduler import feeds_due_for_crawling
 from zeeguu.core.model import RSSFeed
 
 session = zeeguu.core.db.session
@@ -31,20 +39,39 @@ def retrieve_articles_from_all_feeds():
     counter = 0
     all_feeds = RSSFeed.query.all()
     all_feeds_count = len(all_feeds)
-    for feed in all_feeds:
-        if feed.deactivated:
-            continue
 
-        counter += 1
-        try:
-            msg = f"*** >>>>>>>>> {feed.title} ({counter}/{all_feeds_count}) <<<<<<<<<< "  # .encode('utf-8')
-            log("")
-            log(f"{msg}")
-
-            download_from_feed(feed, zeeguu.core.db.session)
-
-        except Exception as e:
-            traceback.print_exc()
+    # shared by all the feeds; the same story is often in several of them
+    near_duplicates = NearDuplicateIndex.from_recent_articles()
+    log(f"Loaded {len(near_duplicates)} recent article fingerprints")
+
+    # the external difficulty services are called in the background
+    # while the other feeds are being crawled
+    enrichment_queue = EnrichmentQueue()
+
+    # the parsing of the articles is CPU bound; one worker per core
+    with ProcessPoolExecutor() as parse_pool:
+        for feed in feeds_due_for_crawling(all_feeds):
+
+            counter += 1
+            try:
+                msg = f"*** >>>>>>>>> {feed.title} ({counter}/{all_feeds_count}) <<<<<<<<<< "  # .encode('utf-8')
+                log("")
+                log(f"{msg}")
+
+                download_from_feed(
+                    feed,
+                    zeeguu.core.db.session,
+                    parse_pool=parse_pool,
+                    near_duplicates=near_duplicates,
+                    enrichment_queue=enrichment_queue,
+                )
+
+            except Exception as e:
+                traceback.print_exc()
+
+    log(f"Waiting for {len(enrichment_queue.pending)} enrichments")
+    save_enrichments(enrichment_queue, zeeguu.core.db.session, wait=True)
+    enrichment_queue.shutdown()
 
 
 if __name__ == "__main__":
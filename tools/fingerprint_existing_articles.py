@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+
+   Computes the content fingerprint (SimHash) for the articles
+   that don't have one yet, e.g. the ones that were crawled before
+   the near duplicate detection was introduced.
+
+   While doing so, it also reports the articles which are near
+   duplicates of previously fingerprinted articles.
+
+   To fingerprint only the articles of the last 30 days:
+
+        python fingerprint_existing_articles.py 30
+
+   Without argument, all the articles are fingerprinted.
+
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+import zeeguu.core
+from zeeguu.core.content_retriever.near_duplicates import (
+    NearDuplicateIndex,
+    simhash,
+    to_db_value,
+    from_db_value,
+)
+from zeeguu.core.model import Article
+
+session = zeeguu.core.db.session
+
+BATCH_SIZE = 1000
+
+
+def fingerprint_articles(after_date=None):
+    index = NearDuplicateIndex()
+
+    query = Article.query.order_by(Article.id)
+    if after_date:
+        query = query.filter(Article.published_time > after_date)
+
+    counter = 0
+    near_duplicates = 0
+    last_id = 0
+    while True:
+        batch = query.filter(Article.id > last_id).limit(BATCH_SIZE).all()
+        if not batch:
+            break
+
+        for article in batch:
+            if article.content_fingerprint is None:
+                fingerprint = simhash(article.content or "")
+                article.content_fingerprint = to_db_value(fingerprint)
+                session.add(article)
+                counter += 1
+            else:
+                fingerprint = from_db_value(article.content_fingerprint)
+
+            canonical_id = index.find_near_duplicate(fingerprint)
+            if canonical_id:
+                near_duplicates += 1
+                print(f"{article.id} is a near duplicate of {canonical_id}")
+            else:
+                index.add(fingerprint, article.id)
+
+        last_id = batch[-1].id
+        session.commit()
+        print(f"{counter} articles fingerprinted. last article id: {last_id}")
+
+    print(f"Done. Fingerprinted: {counter}. Near duplicates: {near_duplicates}")
+
+
+if __name__ == "__main__":
+    after_date = None
+    if len(sys.argv) > 1:
+        after_date = datetime.now() - timedelta(days=int(sys.argv[1]))
+
+    fingerprint_articles(after_date)
@@ -0,0 +1 @@
+alter table article add content_fingerprint bigint default null;
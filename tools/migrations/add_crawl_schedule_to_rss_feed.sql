@@ -0,0 +1,2 @@
+alter table rss_feed add publish_interval_estimate integer default null;
+alter table rss_feed add next_crawl_time datetime default null;
@@ -0,0 +1 @@
+alter table feed_crawl_run add enrichment_time float default null;
@@ -0,0 +1,7 @@
+alter table bookmark add last_outcome_id integer default null;
+alter table bookmark add last_exercise_time datetime default null;
+alter table bookmark add correct_days_in_streak integer default null;
+alter table bookmark add first_exercise_correct tinyint(1) default null;
+
+alter table bookmark
+    add constraint bookmark_ibfk_last_outcome foreign key (last_outcome_id) references exercise_outcome (id);
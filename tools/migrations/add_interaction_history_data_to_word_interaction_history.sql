@@ -0,0 +1 @@
+alter table word_interaction_history add interaction_history_data blob default null;
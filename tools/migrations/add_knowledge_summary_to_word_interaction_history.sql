@@ -0,0 +1,3 @@
+alter table word_interaction_history add event_count integer default null;
+alter table word_interaction_history add seen_in_context_count integer default null;
+alter table word_interaction_history add seen_out_of_context_count integer default null;
@@ -0,0 +1,9 @@
+alter table bookmark add quality_top_candidate tinyint(1) default null;
+
+-- see quality_top_candidate in bookmark_quality/positive_qualities.py
+update bookmark b
+    join user_word uw on uw.id = b.origin_id
+    join text t on t.id = b.text_id
+set b.quality_top_candidate = (char_length(uw.word) >= 5 and char_length(t.content) <= 140);
+
+create index bookmark_user_text on bookmark (user_id, text_id);
@@ -0,0 +1,34 @@
+# script used to compute the exercise summary of the existing
+# bookmarks from their exercise logs; to be run after
+# add_exercise_summary_to_bookmark.sql
+from sqlalchemy.orm import selectinload
+
+import zeeguu.core
+from zeeguu.core.model import Bookmark, Exercise
+
+session = zeeguu.core.db.session
+
+BATCH_SIZE = 1000
+
+last_id = 0
+backfilled = 0
+while True:
+    bookmarks = (
+        Bookmark.query.filter(Bookmark.id > last_id)
+        .filter(Bookmark.correct_days_in_streak == None)
+        .options(selectinload(Bookmark.exercise_log).joinedload(Exercise.outcome))
+        .order_by(Bookmark.id)
+        .limit(BATCH_SIZE)
+        .all()
+    )
+    if not bookmarks:
+        break
+
+    for each in bookmarks:
+        each.update_exercise_summary_from_log()
+        session.add(each)
+
+    session.commit()
+    last_id = bookmarks[-1].id
+    backfilled += len(bookmarks)
+    print(f"backfilled {backfilled} bookmarks")
@@ -0,0 +1,35 @@
+# script used to convert the json interaction histories
+# to their packed binary counterparts; to be run after
+# add_interaction_history_data_to_word_interaction_history.sql
+import zeeguu.core
+from zeeguu.core.model import WordInteractionHistory
+
+session = zeeguu.core.db.session
+
+BATCH_SIZE = 1000
+
+last_id = 0
+converted = 0
+while True:
+    histories = (
+        WordInteractionHistory.query.filter(WordInteractionHistory.id > last_id)
+        .filter(WordInteractionHistory.interaction_history_data == None)
+        .order_by(WordInteractionHistory.id)
+        .limit(BATCH_SIZE)
+        .all()
+    )
+    if not histories:
+        break
+
+    for each in histories:
+        # decodes the json, packs the events, and drops the json
+        each.interaction_history_data = each.interaction_history.to_bytes()
+        each.interaction_history_json = None
+        if each.event_count is None:
+            each.update_summary()
+        session.add(each)
+
+    session.commit()
+    last_id = histories[-1].id
+    converted += len(histories)
+    print(f"converted {converted} histories")
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+
+"""
+
+   Recomputes the fit for study and learned status of the bookmarks
+   from their exercise logs; see bookmark_quality/recompute_status.
+
+   Can run while the API is live.
+
+   Usage:
+
+        python tools/recompute_bookmark_status.py [--dry-run] [user_id ...]
+
+   Without user ids, recomputes the bookmarks of all the users.
+
+"""
+
+import sys
+from datetime import datetime
+
+from zeeguu.core.bookmark_quality.recompute_status import recompute_status
+
+arguments = sys.argv[1:]
+dry_run = "--dry-run" in arguments
+user_ids = [int(each) for each in arguments if each != "--dry-run"] or None
+
+start = datetime.now()
+checked, changed = recompute_status(user_ids, dry_run)
+
+print(
+    f"{changed} of {checked} bookmarks "
+    f"{'would change' if dry_run else 'changed'} "
+    f"(in {datetime.now() - start})"
+)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""
+
+   Recomputes the difficulties of the articles, e.g. after a change
+   in an estimator or in the hyphenation of a language.
+
+        python recompute_difficulties.py <estimator> [language_code] [from_id] [to_id]
+
+   e.g. to recompute the Flesch-Kincaid difficulties of the Polish articles:
+
+        python recompute_difficulties.py fk pl
+
+   The articles are loaded and written back in batches; the estimation
+   runs in parallel in one process per core, the same processes for
+   all the batches.
+
+   Only fk is supported for now: fk_difficulty is the only difficulty
+   that is estimated locally and stored in the article; the LingoRank
+   difficulties come from an external service.
+
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import zeeguu.core
+from zeeguu.core.model import Article, Language
+from zeeguu.core.language.difficulty_estimator_factory import (
+    DifficultyEstimatorFactory,
+)
+
+# the article column, and the value of the estimator that goes in it
+ESTIMATOR_COLUMNS = {
+    "fk": ("fk_difficulty", "grade"),
+}
+
+BATCH_SIZE = 1000
+
+session = zeeguu.core.db.session
+
+if len(sys.argv) < 2 or sys.argv[1] not in ESTIMATOR_COLUMNS:
+    print(__doc__)
+    print(f"Known estimators: {', '.join(ESTIMATOR_COLUMNS.keys())}")
+    exit(1)
+
+estimator_name = sys.argv[1]
+language_code = sys.argv[2] if len(sys.argv) > 2 else None
+from_id = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+to_id = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+column, score = ESTIMATOR_COLUMNS[estimator_name]
+
+query = Article.query.with_entities(Article.id, Article.content, Language.code).join(
+    Language
+)
+if language_code:
+    query = query.filter(Language.code == language_code)
+if to_id:
+    query = query.filter(Article.id <= to_id)
+
+print("starting...")
+
+total = 0
+last_id = from_id - 1
+with ProcessPoolExecutor() as pool:
+    while True:
+        batch = (
+            query.filter(Article.id > last_id)
+            .order_by(Article.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+
+        ids, scores = DifficultyEstimatorFactory.estimate_difficulties(
+            estimator_name, batch, score=score, pool=pool
+        )
+
+        session.bulk_update_mappings(
+            Article,
+            [{"id": int(id), column: int(value)} for id, value in zip(ids, scores)],
+        )
+        session.commit()
+
+        total += len(ids)
+        print(f"{total} articles done; last id: {last_id}")
+
+print("done.")
@@ -1,17 +1,43 @@
-from datetime import datetime
+#!/usr/bin/env python
+
+"""
+
+   Saturates the word interaction histories of the users with the
+   words they encountered while reading and in the exercises.
+
+        python saturate_word_interaction_history.py [processes]
+
+   The job is incremental: the WordHistoryWatermark of every user
+   remembers the last bookmark, fully read activity, and exercise
+   that were processed, and every run only processes the newer ones.
+   To process a user from scratch, delete their watermark.
+
+   The users are split across a pool of processes; the histories of
+   a user are updated in memory and saved in one transaction.
+
+"""
+
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 
 import zeeguu.core
 from zeeguu.core.model import (
+    Article,
     Bookmark,
-    UserArticle,
     Text,
+    User,
     UserWord,
     UserActivityData,
     Language,
     Exercise,
+    WordHistoryWatermark,
 )
 
-from zeeguu.core.model.bookmark import bookmark_exercise_mapping, Bookmark
+from zeeguu.core.model.bookmark import bookmark_exercise_mapping
 
 from zeeguu.core.model.word_knowledge.word_interaction_history import (
     WordInteractionHistory,
@@ -25,13 +51,14 @@ from zeeguu.core.constants import (
     EVENT_USER_FEEDBACK,
 )
 
-from zeeguu.core.util.text import split_words_from_text
+from zeeguu.core.language.text_processing import tokenize, stems
 
-from nltk.stem.snowball import SnowballStemmer
+# the feedback values are json strings, e.g. '"finished_difficulty_ok"';
+# a '%finished%' would also match the '"not_finished_for_boring"'
+ARTICLE_FULLY_READ = ['finished%', '"finished%']
 
-LOG_CONTEXT = "FEED RETRIEVAL"
-ARTICLE_FULLY_READ = "finished%"
-LONG_TIME_IN_THE_PAST = "2000-01-01T00:00:00"
+# the size of the IN (...) lists when loading words and histories
+QUERY_CHUNK_SIZE = 500
 
 session = zeeguu.core.db.session
 
@@ -39,192 +66,266 @@ session = zeeguu.core.db.session
 def extract_words_from_text(
     text, language: Language, stem: bool = True
 ):  # Tokenize the words and create a set of unique words
-    words = split_words_from_text(text)
+    words = tokenize(text)
 
     if stem:
-        stemmer = SnowballStemmer(language.name.lower())
-        words = [stemmer.stem(w.lower()) for w in words]
+        words = stems(words, language.code)
 
     return set(words)
 
 
-def get_fully_read_timestamps(user_article):
-    """
+def _chunks(items, size=QUERY_CHUNK_SIZE):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
 
-    Find all the fully read dates of an article by a user
-    If a user fully reads an article multiple times,
-    this returns all those dates (timestamps)
 
-    return: list of timestamps
+class HistoryUpdates(object):
+    """
+    The events of a user collected in memory, per language and word,
+    and saved together by flush
     """
 
-    url = user_article.article.url.as_string()
+    def __init__(self, user_id):
+        self.user_id = user_id
+        # by language id; a Language can't be a key
+        self.languages = {}
+        self.events = defaultdict(lambda: defaultdict(list))
 
-    query = UserActivityData.query.filter(
-        UserActivityData.user_id == user_article.user_id
-    )
-    query = query.filter(UserActivityData.event == EVENT_USER_FEEDBACK)
-    query = query.filter(UserActivityData.article_id == user_article.id)
-    query = query.filter(UserActivityData.value.like("%finished%"))
+    def add(self, language: Language, word, event_type, time):
+        self.languages[language.id] = language
+        self.events[language.id][word].append((time, event_type))
 
-    full_read_activity_results = query.all()
+    def __len__(self):
+        return sum(len(words) for words in self.events.values())
 
-    return [result.time for result in full_read_activity_results]
+    def flush(self):
+        user = User.query.get(self.user_id)
+        histories = []
 
+        # first all the words, since creating them might roll back
+        user_words_by_language = {
+            language_id: self._find_or_create_user_words(
+                self.languages[language_id], events_by_word.keys()
+            )
+            for language_id, events_by_word in self.events.items()
+        }
+
+        for language_id, events_by_word in self.events.items():
+            user_words = user_words_by_language[language_id]
+
+            existing = {}
+            for word_ids in _chunks(w.id for w in user_words.values()):
+                for history in WordInteractionHistory.query.filter(
+                    WordInteractionHistory.user_id == self.user_id
+                ).filter(WordInteractionHistory.word_id.in_(word_ids)):
+                    existing[history.word_id] = history
+
+            for word, events in events_by_word.items():
+                user_word = user_words[word]
+                history = existing.get(user_word.id) or WordInteractionHistory(
+                    user, user_word
+                )
+                for time, event_type in sorted(events, key=lambda e: e[0]):
+                    history.insert_event(event_type, time)
+                histories.append(history)
+
+        WordInteractionHistory.save_all(session, histories)
+        self.events.clear()
+
+    @staticmethod
+    def _find_or_create_user_words(language, words):
+        user_words = {}
+        for chunk in _chunks(words):
+            for user_word in UserWord.query.filter(
+                UserWord.language_id == language.id
+            ).filter(UserWord.word.in_(chunk)):
+                user_words[user_word.word] = user_word
+
+        missing = [UserWord(word, language) for word in words if word not in user_words]
+        if not missing:
+            return user_words
+
+        try:
+            session.add_all(missing)
+            session.commit()
+            user_words.update({user_word.word: user_word for user_word in missing})
+        except IntegrityError:
+            # another process created some of the words in the meantime
+            session.rollback()
+            for user_word in missing:
+                user_words[user_word.word] = UserWord.find_or_create(
+                    session, user_word.word, language
+                )
 
-def process_bookmarked_sentences(
-    user_article, start_time=LONG_TIME_IN_THE_PAST, end_time=datetime.now()
-):
-    """
-    Process all bookmarks for the user_article within the specified times
+        return user_words
+
+
+def add_bookmarked_sentence(updates, bookmark):
+    if bookmark.text is None:
+        return
+    language = bookmark.origin.language
 
-    Parameters:
-    user_article = user_article class object
-    start_time = datetime from which to take bookmarks
-    end_time = datetime of final bookmark to process
+    for word in extract_words_from_text(bookmark.text.content, language):
+        # label the word as clicked or not clicked
+        if word in bookmark.origin.word.lower():
+            event_type = WIH_READ_CLICKED
+        else:
+            event_type = WIH_READ_NOT_CLICKED_IN_SENTENCE
+        updates.add(language, word, event_type, bookmark.time)
 
-    returns: list of processed bookmarks
+
+def add_fully_read_article(updates, activity):
+    """
+    The words of the article that are not in the sentences
+    bookmarked since the previous time the article was fully read
+    are recorded as read and not clicked
     """
-    user = user_article.user
+    article = Article.query.get(activity.article_id)
+    if article is None:
+        return
+
+    previous = (
+        _fully_read(UserActivityData.query)
+        .filter(UserActivityData.user_id == activity.user_id)
+        .filter(UserActivityData.article_id == activity.article_id)
+        .filter(UserActivityData.id < activity.id)
+        .order_by(UserActivityData.id.desc())
+        .first()
+    )
 
-    # Get all the bookmarks for the specified article and dates
-    query = (
+    bookmarks = (
         Bookmark.query.join(Text)
-        .filter(Bookmark.user == user)
-        .filter(Text.url == user_article.article.url)
+        .filter(Bookmark.user_id == activity.user_id)
+        .filter(Text.url_id == article.url_id)
+        .filter(Bookmark.time <= activity.time)
     )
-    query = query.filter(Bookmark.time >= start_time).filter(Bookmark.time <= end_time)
-    bookmarks = query.order_by(Bookmark.time).all()
+    if previous:
+        bookmarks = bookmarks.filter(Bookmark.time > previous.time)
 
+    words = extract_words_from_text(article.content, article.language)
     for bookmark in bookmarks:
+        if bookmark.text is None:
+            continue
+        words -= extract_words_from_text(bookmark.text.content, article.language)
 
-        # Get text in the sentence of the bookmark
-        sentence = Text.query.filter(Text.id == bookmark.text_id).one().content
-
-        # Get unique words in sentence
-        unique_words_in_sentence = extract_words_from_text(
-            sentence, user_article.article.language
+    for word in words:
+        updates.add(
+            article.language, word, WIH_READ_NOT_CLICKED_OUT_SENTENCE, activity.time
         )
 
-        for word in unique_words_in_sentence:
-
-            # label the word as clicked or not clicked
-            if word in bookmark.origin.word.lower():
-                event_type = WIH_READ_CLICKED
-            else:
-                event_type = WIH_READ_NOT_CLICKED_IN_SENTENCE
-
-            # Get or create word object
-            user_word = UserWord.find_or_create(
-                session=session, _word=word, language=user_article.article.language
-            )
-
-            # Find a WordInteractionHistory
-            word_interaction_history = WordInteractionHistory.find_or_create(
-                user=user, word=user_word
-            )
 
-            # Add event
-            word_interaction_history.insert_event(event_type, bookmark.time)
-
-            word_interaction_history.save_to_db(session)
-
-    return bookmarks
-
-
-# ==============================READING================================
-# Fill reading sessions word history information
-for ua in UserArticle.query.all():
-
-    if ua.opened == None or ua.article == None:
-        continue
-
-    user = ua.user
-    text = ua.article.content
-
-    print(ua.id)
-
-    fully_read_dates = get_fully_read_timestamps(ua)
+def add_exercise(updates, bookmark, exercise):
+    event_type = WordInteractionEvent.encodeExerciseResult(
+        exercise.outcome_id, exercise.source_id
+    )
+    if event_type is None:
+        return
 
-    # If the article has nos been marked as fully read, we only process the sentences of the bookmarks
-    if not fully_read_dates:
-        process_bookmarked_sentences(ua)
-        continue
-    else:  # If article has been fully read
+    words = extract_words_from_text(bookmark.origin.word, bookmark.origin.language)
+    if not words:
+        return
 
-        # If article is fully read, process the remaning words as not read out of bookmarked sentence
-        # NOTE: The article can be fully read multiple times, therefore we only consider the corresponding bookmarks
+    updates.add(bookmark.origin.language, words.pop(), event_type, exercise.time)
 
-        # Get all the unique article words
-        unique_words_in_article = extract_words_from_text(text, ua.article.language)
 
-        # For each fully read date, we process the corresponding bookmarked sentences
-        # this is because an article can be read multiple times
-        # thus, the second time when it was fully read
-        # the analyzed bopokmarks might be different
-        previous_fully_read_date = LONG_TIME_IN_THE_PAST
-        for fully_read_date in fully_read_dates:
-            processed_bookmarks = process_bookmarked_sentences(
-                ua, previous_fully_read_date, fully_read_date
-            )
-            previous_fully_read_date = fully_read_date
+def _fully_read(query):
+    query = query.filter(UserActivityData.event == EVENT_USER_FEEDBACK)
+    return query.filter(
+        or_(*[UserActivityData.value.like(value) for value in ARTICLE_FULLY_READ])
+    )
 
-            # Extract words from bookmarked sentences
-            for bookmark in processed_bookmarks:
-                # Get text in the sentece of the bookmark
-                sentence = Text.query.filter(Text.id == bookmark.text_id).one().content
 
-                # Get unique words in sentence
-                unique_words_in_sentence = extract_words_from_text(
-                    sentence, ua.article.language
-                )
+def saturate_user(user_id):
+    """
+    Processes the bookmarks, fully read articles, and exercises of
+    the user that are newer than their watermark. When that fails,
+    the watermark stays, and the next run tries the user again.
 
-                # Remove already processed words
-                unique_words_in_article = unique_words_in_article.difference(
-                    unique_words_in_sentence
-                )
+    :return: the number of updated word histories
+    """
+    try:
+        return _saturate_user(user_id)
+    except Exception as e:
+        session.rollback()
+        zeeguu.core.warning(f"could not saturate the histories of user {user_id}: {e}")
+        return 0
+
+
+def _saturate_user(user_id):
+    watermark = WordHistoryWatermark.find_or_create(session, user_id)
+    updates = HistoryUpdates(user_id)
+
+    # ==============================READING================================
+    bookmarks = (
+        Bookmark.query.filter(Bookmark.user_id == user_id)
+        .filter(Bookmark.id > watermark.last_bookmark_id)
+        .order_by(Bookmark.id)
+        .all()
+    )
+    for bookmark in bookmarks:
+        add_bookmarked_sentence(updates, bookmark)
+
+    fully_read = (
+        _fully_read(UserActivityData.query)
+        .filter(UserActivityData.user_id == user_id)
+        .filter(UserActivityData.id > watermark.last_activity_id)
+        .filter(UserActivityData.article_id != None)
+        .order_by(UserActivityData.id)
+        .all()
+    )
+    for activity in fully_read:
+        add_fully_read_article(updates, activity)
+
+    # ==============================EXERCISES================================
+    exercises = (
+        session.query(Bookmark, Exercise)
+        .join(bookmark_exercise_mapping, bookmark_exercise_mapping.c.bookmark_id == Bookmark.id)
+        .join(Exercise, bookmark_exercise_mapping.c.exercise_id == Exercise.id)
+        .filter(Bookmark.user_id == user_id)
+        .filter(Exercise.id > watermark.last_exercise_id)
+        .order_by(Exercise.id)
+        .all()
+    )
+    for bookmark, exercise in exercises:
+        add_exercise(updates, bookmark, exercise)
 
-            # Insert remaining words as not clicked out of sentence
-            for word in unique_words_in_article:
-                user_word = UserWord.find_or_create(
-                    session=session, _word=word, language=ua.article.language
-                )
-                word_interaction_history = WordInteractionHistory.find_or_create(
-                    user=user, word=user_word
-                )
-                word_interaction_history.insert_event(
-                    WIH_READ_NOT_CLICKED_OUT_SENTENCE, fully_read_date
-                )
+    updated = len(updates)
+    if updated:
+        updates.flush()
 
-                word_interaction_history.save_to_db(session)
+    if bookmarks:
+        watermark.last_bookmark_id = bookmarks[-1].id
+    if fully_read:
+        watermark.last_activity_id = fully_read[-1].id
+    if exercises:
+        watermark.last_exercise_id = exercises[-1][1].id
+    session.add(watermark)
+    session.commit()
 
-# ==============================EXERCISES================================
-# words encountered in exercises
-bmex_mapping = data = session.query(bookmark_exercise_mapping).all()
+    return updated
 
 
-for bm_id, ex_id in bmex_mapping:
+def _init_worker():
+    # the forked processes must not share the connections of the parent
+    session.remove()
+    zeeguu.core.db.engine.dispose()
 
-    try:
-        bm = Bookmark.query.filter(Bookmark.id == bm_id).one()
-        ex = Exercise.query.filter(Exercise.id == ex_id).one()
-    except:
-        print("bookmark or exercise not found")
-        continue
-
-    language = bm.origin.language
-    word_interaction_event = WordInteractionEvent.encodeExerciseResult(
-        ex.outcome_id, ex.source_id
-    )
 
-    word_list = extract_words_from_text(bm.origin.word, bm.origin.language)
-    if len(word_list) == 0:
-        continue
+if __name__ == "__main__":
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else None
 
-    word = word_list.pop()
+    user_ids = [user_id for (user_id,) in session.query(User.id).order_by(User.id)]
+    session.remove()
+    zeeguu.core.db.engine.dispose()
 
-    userWord = UserWord.find_or_create(session, word, bm.origin.language)
-    wih = WordInteractionHistory.find_or_create(bm.user, userWord)
-    wih.insert_event(word_interaction_event, ex.time)
+    total = 0
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+        for user_id, updated in zip(
+            user_ids, pool.map(saturate_user, user_ids, chunksize=16)
+        ):
+            if updated:
+                print(f"user {user_id}: {updated} word histories updated")
+            total += updated
 
-    wih.save_to_db(session)
+    print(f"{total} word histories updated for {len(user_ids)} users")
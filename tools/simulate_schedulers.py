@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+"""
+
+   Replays the exercise logs of the most active users and compares
+   the word schedulers offline.
+
+   Before every exercise each scheduler has an interval after which it
+   would have brought the word back; read as a half-life, that gives
+   the probability of the exercise being correct after the time that
+   actually passed. For each scheduler this prints:
+
+   - the log-loss and the mean absolute error of those predictions
+   - the share of the exercises that the scheduler considered due
+   - the mean interval, in days
+
+   The basic SR is replayed with apply_outcome; the adaptive scheduler
+   with the half-life regression (see half_life_regression).
+
+   Usage:
+
+        python tools/simulate_schedulers.py [user_count]
+
+"""
+
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy import func
+
+import zeeguu.core
+from zeeguu.core.model import Bookmark, Exercise, ExerciseOutcome
+from zeeguu.core.model.bookmark import bookmark_exercise_mapping
+from zeeguu.core.word_scheduling.adaptive.half_life_regression import (
+    half_lives,
+    recall_probabilities,
+    elapsed_days,
+    counts_before_each_event,
+    MIN_HALF_LIFE,
+    MAX_HALF_LIFE,
+    TARGET_RECALL,
+)
+from zeeguu.core.word_scheduling.basicSR.basicSR import (
+    apply_outcome,
+    ONE_DAY,
+    LEARNED,
+)
+
+db_session = zeeguu.core.db.session
+
+user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+# predictions are kept away from 0 and 1 for the log-loss
+EPSILON = 0.0001
+
+
+def most_active_users(count):
+    return [
+        user_id
+        for user_id, _ in db_session.query(
+            Bookmark.user_id, func.count(bookmark_exercise_mapping.c.exercise_id)
+        )
+        .join(
+            bookmark_exercise_mapping,
+            bookmark_exercise_mapping.c.bookmark_id == Bookmark.id,
+        )
+        .group_by(Bookmark.user_id)
+        .order_by(func.count(bookmark_exercise_mapping.c.exercise_id).desc())
+        .limit(count)
+    ]
+
+
+def exercise_log(user_ids):
+    """
+    :return: the bookmark, time, and correctness of each exercise of
+    the users; the exercises of a bookmark consecutive, in chronological
+    order
+    """
+    rows = (
+        db_session.query(
+            bookmark_exercise_mapping.c.bookmark_id,
+            Exercise.time,
+            ExerciseOutcome.outcome,
+        )
+        .join(Exercise, bookmark_exercise_mapping.c.exercise_id == Exercise.id)
+        .join(ExerciseOutcome, Exercise.outcome_id == ExerciseOutcome.id)
+        .join(Bookmark, bookmark_exercise_mapping.c.bookmark_id == Bookmark.id)
+        .filter(Bookmark.user_id.in_(user_ids))
+        .order_by(bookmark_exercise_mapping.c.bookmark_id, Exercise.time)
+        .all()
+    )
+
+    bookmark_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    times = np.array([row[1] for row in rows], dtype="datetime64[s]")
+    correct = np.array(
+        [row[2] in ExerciseOutcome.correct_outcomes for row in rows], dtype=bool
+    )
+    return bookmark_ids, times, correct
+
+
+def basic_sr_half_lives(bookmark_ids, times, correct, first):
+    """
+    The cooling interval of the basic SR before each exercise, in days
+    """
+    result = np.empty(len(bookmark_ids))
+    schedule = None
+    learned = False
+
+    for i in range(len(bookmark_ids)):
+        now = times[i].astype(object)
+        if first[i]:
+            schedule = SimpleNamespace(
+                next_practice_time=now,
+                consecutive_correct_answers=0,
+                cooling_interval=0,
+            )
+            learned = False
+
+        if learned:
+            result[i] = MAX_HALF_LIFE
+            continue
+
+        result[i] = max(schedule.cooling_interval / ONE_DAY, MIN_HALF_LIFE)
+        learned = apply_outcome(schedule, correct[i], now) == LEARNED
+
+    return result
+
+
+def report(name, half_life, elapsed, correct):
+    predicted = np.clip(recall_probabilities(elapsed, half_life), EPSILON, 1 - EPSILON)
+    log_loss = -np.mean(
+        np.where(correct, np.log(predicted), np.log(1 - predicted))
+    )
+    mae = np.mean(np.abs(correct - predicted))
+    due = np.mean(predicted <= TARGET_RECALL)
+
+    print(
+        f"{name:<12} log-loss: {log_loss:.3f}  MAE: {mae:.3f}  "
+        f"due: {due:.1%}  mean interval: {np.mean(half_life):.1f} days"
+    )
+
+
+user_ids = most_active_users(user_count)
+bookmark_ids, times, correct = exercise_log(user_ids)
+print(f"{len(bookmark_ids)} exercises of {len(user_ids)} users")
+
+corrects, wrongs, first = counts_before_each_event(bookmark_ids, correct)
+
+# the first exercise of a word has no time since the previous one
+elapsed = np.zeros(len(times))
+elapsed[1:] = elapsed_days(times[:-1], times[1:])
+replayed = ~first
+
+report(
+    "basic SR",
+    basic_sr_half_lives(bookmark_ids, times, correct, first)[replayed],
+    elapsed[replayed],
+    correct[replayed],
+)
+report(
+    "adaptive",
+    half_lives(corrects, wrongs)[replayed],
+    elapsed[replayed],
+    correct[replayed],
+)
@@ -7,7 +7,7 @@ from sqlalchemy.orm.exc import NoResultFound
 from zeeguu.core.bookmark_quality import top_bookmarks
 from zeeguu.core.model import User, Article, Bookmark, ExerciseSource, ExerciseOutcome
 from . import api, db_session
-from .utils.json_result import json_result
+from .utils.json_result import json_result, json_result_stream
 from .utils.route_wrappers import cross_domain, with_session
 
 
@@ -29,8 +29,7 @@ def top_bookmarks_route(count):
     Returns a list of the words that the user is currently studying.
     """
     bookmarks = top_bookmarks(flask.g.user, count)
-    json_bookmarks = [b.json_serializable_dict(True) for b in bookmarks]
-    return json_result(json_bookmarks)
+    return json_result_stream(Bookmark.json_serializable_dicts(bookmarks))
 
 
 @api.route("/learned_bookmarks/<int:count>", methods=["GET"])
@@ -41,8 +40,7 @@ def learned_bookmarks(count):
     Returns a list of the words that the user is currently studying.
     """
     top_bookmarks = flask.g.user.learned_bookmarks(count)
-    json_bookmarks = [b.json_serializable_dict(True) for b in top_bookmarks]
-    return json_result(json_bookmarks)
+    return json_result_stream(Bookmark.json_serializable_dicts(top_bookmarks))
 
 
 @api.route("/starred_bookmarks/<int:count>", methods=["GET"])
@@ -53,8 +51,7 @@ def starred_bookmarks(count):
     Returns a list of the words that the user is currently studying.
     """
     top_bookmarks = flask.g.user.starred_bookmarks(count)
-    json_bookmarks = [b.json_serializable_dict(True) for b in top_bookmarks]
-    return json_result(json_bookmarks)
+    return json_result_stream(Bookmark.json_serializable_dicts(top_bookmarks))
 
 
 @api.route("/bookmarks_by_day/<return_context>", methods=["GET"])
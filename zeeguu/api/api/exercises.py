@@ -1,15 +1,19 @@
+import json
 import traceback
 import flask
 
 
-from zeeguu.core.exercises.similar_words import similar_words
+from zeeguu.core.exercises.similar_words import similar_words, similar_words_for_each
 from zeeguu.core.model import Bookmark
 from zeeguu.core.word_scheduling.basicSR.basicSR import BasicSRSchedule
 
 from .utils.route_wrappers import cross_domain, with_session
-from .utils.json_result import json_result
+from .utils.json_result import json_result, json_result_stream
 from . import api, db_session
 
+# exercises in one call of /report_exercise_outcomes; all in one transaction
+MAX_REPORTED_OUTCOMES = 500
+
 
 @api.route("/bookmarks_to_study/<bookmark_count>", methods=["GET"])
 @cross_domain
@@ -25,7 +29,7 @@ def bookmarks_to_study(bookmark_count):
 
     to_study = flask.g.user.bookmarks_to_study(int_count)
 
-    return json_result([bookmark.json_serializable_dict() for bookmark in to_study])
+    return json_result_stream(Bookmark.json_serializable_dicts(to_study))
 
 
 @api.route("/get_exercise_log_for_bookmark/<bookmark_id>", methods=("GET",))
@@ -85,12 +89,86 @@ def report_exercise_outcome(
         return "FAIL"
 
 
+@api.route("/report_exercise_outcomes", methods=["POST"])
+@cross_domain
+@with_session
+def report_exercise_outcomes():
+    """
+    Reports many exercises at once, e.g. those of a whole exercise
+    session, or those done while a client was offline; saves the
+    round trips of calling /report_exercise_outcome for each of them.
+
+    The body is a JSON array of at most MAX_REPORTED_OUTCOMES objects
+    with the same fields as the parameters of /report_exercise_outcome,
+    and optionally the time when the exercise was done (by default, now):
+
+        [{"bookmark_id": 1, "outcome": "C", "source": "Recognize",
+          "solving_speed": 1200, "time": "2021-03-01T10:15:00.000Z"}, ...]
+
+    :return: a JSON array with "OK" or "FAIL" for each of the exercises
+    """
+
+    try:
+        reported_outcomes = json.loads(flask.request.data)
+    except ValueError:
+        return "FAIL"
+
+    if not isinstance(reported_outcomes, list) or not all(
+        isinstance(each, dict) for each in reported_outcomes
+    ):
+        return "FAIL"
+
+    if len(reported_outcomes) > MAX_REPORTED_OUTCOMES:
+        return "FAIL"
+
+    return json_result(
+        Bookmark.report_exercise_outcomes(db_session, flask.g.user, reported_outcomes)
+    )
+
+
 @api.route("/similar_words/<bookmark_id>", methods=["GET"])
 @cross_domain
 @with_session
 def similar_words_api(bookmark_id):
 
     bookmark = Bookmark.find(bookmark_id)
-    return json_result(
-        similar_words(bookmark.origin.word, bookmark.origin.language, flask.g.user)
+    return json_result(similar_words(bookmark.origin.word, bookmark.origin.language))
+
+
+@api.route("/similar_words_for_bookmarks", methods=["POST"])
+@cross_domain
+@with_session
+def similar_words_for_bookmarks():
+    """
+    Same as /similar_words, for several bookmarks at once; e.g. for
+    all the bookmarks of an exercise session.
+
+    The body is a JSON array of bookmark ids.
+
+    :return: a JSON object with the similar words of each of the
+    bookmarks of the user, by bookmark id
+    """
+
+    try:
+        bookmark_ids = [int(each) for each in json.loads(flask.request.data)]
+    except (ValueError, TypeError):
+        return "FAIL"
+
+    bookmarks = Bookmark.query.filter(Bookmark.id.in_(bookmark_ids)).filter(
+        Bookmark.user_id == flask.g.user.id
     )
+
+    by_language = {}
+    for bookmark in bookmarks:
+        by_language.setdefault(bookmark.origin.language_id, []).append(bookmark)
+
+    result = {}
+    for bookmarks_in_language in by_language.values():
+        words = similar_words_for_each(
+            [bookmark.origin.word for bookmark in bookmarks_in_language],
+            bookmarks_in_language[0].origin.language,
+        )
+        for bookmark, similar in zip(bookmarks_in_language, words):
+            result[bookmark.id] = similar
+
+    return json_result(result)
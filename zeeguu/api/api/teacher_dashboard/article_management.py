@@ -10,6 +10,7 @@ from sqlalchemy.orm.exc import NoResultFound
 import zeeguu.core
 from zeeguu.api.api.utils.abort_handling import make_error
 from zeeguu.core.emailer.zeeguu_mailer import ZeeguuMailer
+from zeeguu.core.language.background_difficulty import estimate_difficulty_later
 from zeeguu.core.model import Cohort, Language, Article, Url, User
 from zeeguu.core.model.cohort_article_map import CohortArticleMap
 from ._only_teachers_decorator import only_teachers
@@ -88,6 +89,7 @@ def upload_articles(cohort_id):
     check_permission_for_cohort(cohort_id)
 
     try:
+        estimated_later = []
         for article_data in json.loads(request.data):
             url = Url("userarticle/{}".format(uuid.uuid4().hex))
             title = article_data["title"]
@@ -97,6 +99,7 @@ def upload_articles(cohort_id):
             published_time = datetime.now()
             language_code = article_data["language_code"]
             language = Language.find(language_code)
+            inline = Article.estimate_difficulty_inline(content)
 
             new_article = Article(
                 url,
@@ -107,11 +110,14 @@ def upload_articles(cohort_id):
                 published_time,
                 None,  # rss feed
                 language,
+                estimate_difficulty=inline,
             )
 
             db.session.add(new_article)
             db.session.flush()
             db.session.refresh(new_article)
+            if not inline:
+                estimated_later.append(new_article.id)
 
             cohort = Cohort.find(cohort_id)
             now = datetime.now()
@@ -119,6 +125,9 @@ def upload_articles(cohort_id):
 
             db.session.add(new_cohort_article_map)
         db.session.commit()
+
+        for article_id in estimated_later:
+            estimate_difficulty_later(article_id)
         return "OK"
     except ValueError:
         flask.abort(400)
@@ -209,6 +209,7 @@ def update_translation(bookmark_id):
     bookmark.origin = origin
     bookmark.translation = translation
     bookmark.text = text
+    bookmark.update_quality_flags()
 
     db_session.add(bookmark)
     db_session.commit()
@@ -1,9 +1,15 @@
 import decimal
 import json
 from datetime import datetime, date
+from itertools import islice
 
 import flask
 
+import zeeguu.core
+
+# longer lists are streamed
+MAX_ITEMS_NOT_STREAMED = 1000
+
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, o):
@@ -22,3 +28,41 @@ def json_result(dictionary):
     stringified = json.dumps(dictionary, cls=DateTimeEncoder)
     resp = flask.Response(stringified, status=200, mimetype="application/json")
     return resp
+
+
+def json_result_stream(items):
+    """
+    A JSON array of the items; for long lists, which are then never all
+    in memory as one string. The first MAX_ITEMS_NOT_STREAMED items are
+    serialized before anything is sent, such that an error in them is
+    an error response; only the rest is sent as it is serialized.
+
+    :param items: e.g. a generator that loads them batch by batch
+    """
+    items = iter(items)
+    first = [
+        json.dumps(each, cls=DateTimeEncoder)
+        for each in islice(items, MAX_ITEMS_NOT_STREAMED + 1)
+    ]
+    if len(first) <= MAX_ITEMS_NOT_STREAMED:
+        return flask.Response(
+            "[" + ",".join(first) + "]", status=200, mimetype="application/json"
+        )
+
+    def generate():
+        yield "[" + ",".join(first)
+        try:
+            for each in items:
+                yield "," + json.dumps(each, cls=DateTimeEncoder)
+        except Exception as e:
+            # the status was sent already; the array is closed, such that
+            # the client can still read the items that came before
+            from sentry_sdk import capture_exception
+
+            zeeguu.core.warning(f"Could not stream the rest of the list: {e}")
+            capture_exception(e)
+        yield "]"
+
+    return flask.Response(
+        flask.stream_with_context(generate()), status=200, mimetype="application/json"
+    )
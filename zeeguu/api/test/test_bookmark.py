@@ -149,3 +149,78 @@ class BookmarkTest(APITestMixin, TestCase):
         """
         result = self.raw_data_from_api_get("/top_bookmarks/10")
         assert len(result) > 0
+
+    def test_report_exercise_outcomes(self):
+        from zeeguu.core.exercises.after_exercise import wait_for_pending_updates
+
+        reported_outcomes = [
+            dict(
+                bookmark_id=self.example_bookmark_id,
+                outcome="C",
+                source="Recognize",
+                solving_speed=1200,
+            ),
+            dict(bookmark_id=self.example_bookmark_id, outcome="Wrong", source="Recognize"),
+            dict(bookmark_id=-1, outcome="C", source="Recognize", solving_speed=800),
+        ]
+
+        result = self.json_from_api_post(
+            "/report_exercise_outcomes", json.dumps(reported_outcomes)
+        )
+        wait_for_pending_updates()
+
+        assert result == ["OK", "OK", "FAIL"]
+
+        exercise_log = self.json_from_api_get(
+            f"/get_exercise_log_for_bookmark/{self.example_bookmark_id}"
+        )
+        assert [each["outcome"] for each in exercise_log] == ["C", "Wrong"]
+
+    def test_report_exercise_outcomes_done_offline(self):
+        from zeeguu.core.exercises.after_exercise import wait_for_pending_updates
+
+        reported_outcomes = [
+            dict(
+                bookmark_id=self.example_bookmark_id,
+                outcome="C",
+                source="Recognize",
+                time="2021-03-01T10:15:00.000Z",
+            ),
+            dict(
+                bookmark_id=self.example_bookmark_id,
+                outcome="C",
+                source="Recognize",
+                time="2999-03-01T10:15:00.000Z",
+            ),
+            dict(
+                bookmark_id=self.example_bookmark_id,
+                outcome="C",
+                source="Recognize",
+                time="yesterday",
+            ),
+        ]
+
+        result = self.json_from_api_post(
+            "/report_exercise_outcomes", json.dumps(reported_outcomes)
+        )
+        wait_for_pending_updates()
+
+        assert result == ["OK", "FAIL", "FAIL"]
+
+        exercise_log = self.json_from_api_get(
+            f"/get_exercise_log_for_bookmark/{self.example_bookmark_id}"
+        )
+        assert [each["time"] for each in exercise_log] == ["03/01/2021"]
+
+    def test_too_many_exercise_outcomes(self):
+        from zeeguu.api.api.exercises import MAX_REPORTED_OUTCOMES
+
+        reported_outcomes = [
+            dict(bookmark_id=self.example_bookmark_id, outcome="C", source="Recognize")
+        ] * (MAX_REPORTED_OUTCOMES + 1)
+
+        result = self.raw_data_from_api_post(
+            "/report_exercise_outcomes", json.dumps(reported_outcomes)
+        )
+
+        assert result == b"FAIL"
@@ -1,25 +1,35 @@
 from zeeguu.core.bookmark_quality import quality_bookmark
-from zeeguu.core.definition_of_learned import is_learned_based_on_exercise_outcomes
-from zeeguu.core.model.sorted_exercise_log import SortedExerciseLog
+from zeeguu.core.definition_of_learned import is_learned_based_on_exercise_summary
 from zeeguu.core.util.timer_logging_decorator import time_this
 
 
 def fit_for_study(bookmark):
-    exercise_log = SortedExerciseLog(bookmark)
+    bookmark.ensure_exercise_summary()
 
+    return fit_for_study_based_on(
+        bookmark,
+        is_learned_based_on_exercise_summary(bookmark),
+        bookmark.last_outcome,
+    )
+
+
+def fit_for_study_based_on(bookmark, learned, last_outcome, bookmarks_in_text=None):
+    """
+    Same as fit_for_study, for when the learned status and the last
+    outcome of the bookmark are already known; see recompute_status
+    """
     return (
 
-            (quality_bookmark(bookmark) or bookmark.starred) and
+            (quality_bookmark(bookmark, bookmarks_in_text) or bookmark.starred) and
 
-            not is_learned_based_on_exercise_outcomes(exercise_log) and
+            not learned and
 
-            not feedback_prevents_further_study(exercise_log)
+            not feedback_prevents_further_study(last_outcome)
 
     )
 
 
-def feedback_prevents_further_study(exercise_log):
-    last_outcome = exercise_log.latest_exercise_outcome()
+def feedback_prevents_further_study(last_outcome):
 
     if not last_outcome:
         return False
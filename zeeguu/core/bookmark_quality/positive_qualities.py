@@ -1,9 +1,14 @@
 import zeeguu.core
 from zeeguu.core.bookmark_quality.negative_qualities import bad_quality_bookmark
 
+MIN_TOP_BOOKMARK_WORD_LENGTH = 5
+MAX_TOP_BOOKMARK_CONTEXT_LENGTH = 140
+# including the bookmark itself
+MAX_TOP_BOOKMARKS_IN_CONTEXT = 2
 
-def quality_bookmark(bookmark):
-    return not bad_quality_bookmark(bookmark)
+
+def quality_bookmark(bookmark, bookmarks_in_text=None):
+    return not bad_quality_bookmark(bookmark, bookmarks_in_text)
 
 
 def quality_top_bookmark(bookmark):
@@ -14,10 +19,7 @@ def quality_top_bookmark(bookmark):
     although it could be decided to merge them in the future
 
     """
-    context = bookmark.text
-
-    # word should not be too short
-    if len(bookmark.origin.word) < 5:
+    if not quality_top_candidate(bookmark):
         return False
 
     # if there are other bookmarks in this context
@@ -26,13 +28,28 @@ def quality_top_bookmark(bookmark):
     from zeeguu.core.model import Bookmark
 
     other_bookmarks_in_this_context = Bookmark.find_all_for_text_and_user(
-        context, bookmark.user
+        bookmark.text, bookmark.user
     )
-    if len(other_bookmarks_in_this_context) > 2:
+    if len(other_bookmarks_in_this_context) > MAX_TOP_BOOKMARKS_IN_CONTEXT:
+        return False
+
+    return True
+
+
+def quality_top_candidate(bookmark):
+    """
+
+    the part of quality_top_bookmark that depends only on
+    the bookmark itself; stored with the bookmark, such
+    that top_bookmarks can select by it
+
+    """
+    # word should not be too short
+    if len(bookmark.origin.word) < MIN_TOP_BOOKMARK_WORD_LENGTH:
         return False
 
     # context not too long
-    if len(context.content) > 140:
+    if len(bookmark.text.content) > MAX_TOP_BOOKMARK_CONTEXT_LENGTH:
         return False
 
     return True
@@ -0,0 +1,190 @@
+"""
+
+    Recomputes the fit for study and learned status of all the
+    bookmarks, from their exercise logs, in bulk.
+
+    The bookmarks of a user are loaded in one query, their exercise
+    logs in another, and grouped by text, such that the quality rules
+    that look at the other bookmarks in the text do not query for them.
+    Only the bookmarks whose flags changed are written, in one UPDATE
+    statement per user.
+
+    The users are split in partitions that are recomputed in parallel.
+    It is safe to run while the API is live: a bookmark is only written
+    if it was not starred, unstarred, or exercised since it was loaded;
+    otherwise the API already updated it anyway.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm import joinedload, selectinload
+
+import zeeguu.core
+from zeeguu.core.bookmark_quality.fit_for_study import fit_for_study_based_on
+from zeeguu.core.definition_of_learned import is_learned_based_on_exercise_outcomes
+
+WORKERS = 4
+USERS_PER_PARTITION = 50
+
+
+def recompute_status(user_ids=None, dry_run=False, workers=WORKERS):
+    """
+    :param user_ids: by default, all the users with bookmarks
+    :param dry_run: only count the bookmarks that would change
+    :return: the number of bookmarks that were checked, and that were
+    changed (or would be, on a dry run)
+    """
+    from zeeguu.core.model import Bookmark
+
+    if user_ids is None:
+        session = zeeguu.core.db.session
+        user_ids = [
+            user_id
+            for (user_id,) in session.query(Bookmark.user_id)
+            .distinct()
+            .order_by(Bookmark.user_id)
+        ]
+
+    partitions = [
+        user_ids[i : i + USERS_PER_PARTITION]
+        for i in range(0, len(user_ids), USERS_PER_PARTITION)
+    ]
+
+    checked = changed = 0
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="recompute_status"
+    ) as executor:
+        for partition_checked, partition_changed in executor.map(
+            lambda partition: _recompute_partition(partition, dry_run), partitions
+        ):
+            checked += partition_checked
+            changed += partition_changed
+
+    return checked, changed
+
+
+def _recompute_partition(user_ids, dry_run):
+    # the scoped session of this thread
+    session = zeeguu.core.db.session
+    checked = changed = 0
+    try:
+        for user_id in user_ids:
+            try:
+                user_checked, user_changed = recompute_status_for_user(
+                    session, user_id, dry_run
+                )
+                checked += user_checked
+                changed += user_changed
+            except Exception as e:
+                session.rollback()
+                zeeguu.core.warning(
+                    f"could not recompute the bookmarks of user {user_id}: {e}"
+                )
+        zeeguu.core.log(
+            f"users {user_ids[0]}..{user_ids[-1]}: {changed} of {checked} bookmarks changed"
+        )
+    finally:
+        session.remove()
+
+    return checked, changed
+
+
+def recompute_status_for_user(session, user_id, dry_run=False):
+    """
+    :return: the number of bookmarks of the user that were checked,
+    and that were changed (or would be, on a dry run)
+    """
+    from zeeguu.core.model import Bookmark, Exercise
+
+    bookmarks = (
+        Bookmark.query.filter(Bookmark.user_id == user_id)
+        .options(
+            joinedload(Bookmark.origin),
+            joinedload(Bookmark.translation),
+            joinedload(Bookmark.text),
+            selectinload(Bookmark.exercise_log).joinedload(Exercise.outcome),
+        )
+        # within a text, in the order find_all_for_text_and_user has them
+        .order_by(Bookmark.text_id, Bookmark.id)
+        .all()
+    )
+
+    changes = []
+    for _, bookmarks_in_text in groupby(bookmarks, key=lambda b: b.text_id):
+        bookmarks_in_text = list(bookmarks_in_text)
+        for bookmark in bookmarks_in_text:
+            change = _status_change(bookmark, bookmarks_in_text)
+            if change:
+                changes.append(change)
+
+    if dry_run or not changes:
+        # nothing was modified; ends the transaction of the queries
+        session.rollback()
+        return len(bookmarks), len(changes)
+
+    # the bookmarks that changed since they were loaded are not matched
+    result = session.execute(_guarded_update(), changes)
+    session.commit()
+    return len(bookmarks), result.rowcount
+
+
+def _status_change(bookmark, bookmarks_in_text):
+    """
+    :return: the parameters of _guarded_update for the bookmark, or
+    None if its flags are right
+    """
+    from zeeguu.core.model.sorted_exercise_log import SortedExerciseLog
+
+    log = SortedExerciseLog(bookmark)
+
+    learned = bookmark.learned
+    learned_time = bookmark.learned_time
+    # without exercises, there is nothing to tell whether it's learned
+    if not log.is_empty():
+        learned = is_learned_based_on_exercise_outcomes(log)
+        if learned and not bookmark.learned:
+            learned_time = log.last_exercise_time()
+
+    fit = fit_for_study_based_on(
+        bookmark, learned, log.latest_exercise_outcome(), bookmarks_in_text
+    )
+
+    if bool(fit) == bool(bookmark.fit_for_study) and bool(learned) == bool(
+        bookmark.learned
+    ):
+        return None
+
+    return dict(
+        b_id=bookmark.id,
+        b_seen_starred=bookmark.starred,
+        b_seen_exercise_time=bookmark.last_exercise_time,
+        b_fit_for_study=bool(fit),
+        b_learned=bool(learned),
+        b_learned_time=learned_time,
+    )
+
+
+def _guarded_update():
+    from zeeguu.core.model import Bookmark
+
+    table = Bookmark.__table__
+    return (
+        table.update()
+        .where(table.c.id == bindparam("b_id"))
+        .where(
+            table.c.starred.isnot_distinct_from(bindparam("b_seen_starred"))
+        )
+        .where(
+            table.c.last_exercise_time.isnot_distinct_from(
+                bindparam("b_seen_exercise_time")
+            )
+        )
+        .values(
+            fit_for_study=bindparam("b_fit_for_study"),
+            learned=bindparam("b_learned"),
+            learned_time=bindparam("b_learned_time"),
+        )
+    )
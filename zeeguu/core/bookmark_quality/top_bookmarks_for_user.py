@@ -1,26 +1,54 @@
 import zeeguu.core
-from wordstats import Word
-from zeeguu.core.bookmark_quality import quality_top_bookmark
+from sqlalchemy import func
+
+from zeeguu.core.bookmark_quality.positive_qualities import (
+    MAX_TOP_BOOKMARKS_IN_CONTEXT,
+)
+
+# the bookmarks to choose from; the most recent ones
+RECENT_BOOKMARKS = 400
+
+UNKNOWN_RANK = 100000
 
 
 def top_bookmarks(self, count=50):
+    """
+    The bookmarks of the most frequent words among the recent, not
+    yet learned bookmarks of the user that are good for the top
+    bookmarks (see quality_top_bookmark); selected and ranked in one
+    query, by the quality_top_candidate flag of the bookmarks, the
+    number of bookmarks of the user in each text, and user_word.rank
+    """
     from zeeguu.core.model import Bookmark, UserWord
 
-    def rank(b):
-        return Word.stats(b.origin.word, b.origin.language.code).rank
-
-    query = zeeguu.core.db.session.query(Bookmark)
-    all_bookmarks = (query.
-                     join(UserWord, Bookmark.origin_id == UserWord.id).
-                     filter(UserWord.language_id == self.learned_language_id).
-                     filter(Bookmark.user_id == self.id).
-                     filter(Bookmark.learned == False).order_by(
-        Bookmark.time.desc()).limit(400))
+    session = zeeguu.core.db.session
 
-    single_word_bookmarks = [each for each in all_bookmarks if quality_top_bookmark(each)]
+    recent = (
+        session.query(Bookmark.id)
+        .join(UserWord, Bookmark.origin_id == UserWord.id)
+        .filter(UserWord.language_id == self.learned_language_id)
+        .filter(Bookmark.user_id == self.id)
+        .filter(Bookmark.learned == False)
+        .order_by(Bookmark.time.desc())
+        .limit(RECENT_BOOKMARKS)
+        .subquery()
+    )
 
-    sorted_bookmarks = sorted(single_word_bookmarks,
-                              key=lambda b: rank(b))
-    sorted_bookmarks = sorted_bookmarks[:count]
+    bookmarks_per_text = (
+        session.query(Bookmark.text_id, func.count(Bookmark.id).label("bookmarks"))
+        .filter(Bookmark.user_id == self.id)
+        .group_by(Bookmark.text_id)
+        .subquery()
+    )
 
-    return sorted_bookmarks
+    return (
+        session.query(Bookmark)
+        .join(recent, recent.c.id == Bookmark.id)
+        .join(UserWord, Bookmark.origin_id == UserWord.id)
+        .join(bookmarks_per_text, bookmarks_per_text.c.text_id == Bookmark.text_id)
+        .filter(Bookmark.quality_top_candidate == True)
+        .filter(bookmarks_per_text.c.bookmarks <= MAX_TOP_BOOKMARKS_IN_CONTEXT)
+        .order_by(func.coalesce(UserWord.rank, UNKNOWN_RANK), Bookmark.time.desc())
+        .limit(count)
+        .all()
+    )
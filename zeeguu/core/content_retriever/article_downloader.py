@@ -8,6 +8,7 @@
 
 import newspaper
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from pymysql import DataError
 
@@ -17,6 +18,10 @@ from zeeguu.core import log, debug
 from zeeguu.core import model
 from zeeguu.core.content_retriever.content_cleaner import cleanup_non_content_bits
 from zeeguu.core.content_retriever.quality_filter import sufficient_quality
+from zeeguu.core.content_retriever.near_duplicates import simhash, to_db_value
+from zeeguu.core.content_retriever.crawl_scheduler import update_crawl_schedule
+from zeeguu.core.content_retriever.crawl_report import CrawlReport
+from zeeguu.core.content_retriever.enrichment_queue import EnrichmentQueue
 from zeeguu.core.content_retriever.unicode_normalization import (
     flatten_composed_unicode_characters,
 )
@@ -27,6 +32,8 @@ from elasticsearch import Elasticsearch
 from zeeguu.core.elastic.settings import ES_CONN_STRING, ES_ZINDEX
 from zeeguu.core.elastic.indexing import document_from_article
 from zeeguu.core.model.article import MAX_CHAR_COUNT_IN_SUMMARY
+from zeeguu.core.language.difficulty_estimator_factory import DifficultyEstimatorFactory
+from zeeguu.core.language.token_profile import TokenProfile
 
 from zeeguu.core.model.difficulty_lingo_rank import DifficultyLingoRank
 from sentry_sdk import capture_exception as capture_to_sentry
@@ -35,6 +42,12 @@ from zeeguu.core.elastic.indexing import index_in_elasticsearch
 
 LOG_CONTEXT = "FEED RETRIEVAL"
 
+# fetching is I/O bound, so it's fine to have more threads than cores
+FETCH_WORKERS = 8
+
+# how many feed items go together through the fetch / parse / persist stages
+PARSE_BATCH_SIZE = 16
+
 
 class SkippedForTooOld(Exception):
     pass
@@ -72,7 +85,15 @@ def banned_url(url):
     return False
 
 
-def download_from_feed(feed: RSSFeed, session, limit=1000, save_in_elastic=True):
+def download_from_feed(
+    feed: RSSFeed,
+    session,
+    limit=1000,
+    save_in_elastic=True,
+    parse_pool=None,
+    near_duplicates=None,
+    enrichment_queue=None,
+):
     """
 
     Session is needed because this saves stuff to the DB.
@@ -83,89 +104,223 @@ def download_from_feed(feed: RSSFeed, session, limit=1000, save_in_elastic=True)
     can't be retrieved, so they won't be cached.
 
 
+    The crawl is a pipeline that goes through the feed items in batches:
+        - fetching (redirects and html) is I/O bound and done by a pool of threads
+        - parsing, cleaning, quality checking and difficulty estimation are
+          CPU bound and done in the parse_pool (e.g. a ProcessPoolExecutor)
+          if one is given; otherwise they run in this process
+        - persisting the resulting records happens at the end of every batch
+          on this thread, since the session can't be shared
+
+    If a NearDuplicateIndex is given, articles that are near duplicates
+    of already indexed ones are skipped, and the new ones are indexed.
+
+    The time spent in every stage and the outcomes of the items are
+    saved in a FeedCrawlRun; see tools/crawl_report.py
+
+    The difficulties computed by external services are retrieved in the
+    background by the enrichment_queue; the results which are ready are
+    saved after every batch. If no queue is given, one is created
+    and the crawl waits for it at the end.
+
+
     """
 
     print(feed.url)
 
+    report = CrawlReport(feed)
     downloaded = 0
-    skipped_due_to_low_quality = 0
-    skipped_already_in_db = 0
+
+    own_enrichment_queue = enrichment_queue is None
+    if own_enrichment_queue:
+        enrichment_queue = EnrichmentQueue()
 
     last_retrieval_time_from_DB = None
-    last_retrieval_time_seen_this_crawl = None
 
     if feed.last_crawled_time:
         last_retrieval_time_from_DB = feed.last_crawled_time
         log(f"LAST CRAWLED::: {last_retrieval_time_from_DB}")
 
     try:
-        items = feed.feed_items(last_retrieval_time_from_DB)
+        with report.stage("feed_items"):
+            items = feed.feed_items(last_retrieval_time_from_DB)
     except Exception as e:
         capture_to_sentry(e)
+        # try again later, but not at the very next run
+        update_crawl_schedule(feed, [])
+        session.add(feed)
+        session.commit()
+        report.count("failed")
+        _save_report(report, session)
+        if own_enrichment_queue:
+            enrichment_queue.shutdown()
         return
 
+    fresh_items = []
     for feed_item in items:
 
-        skipped_already_in_db = 0
-
-        if downloaded >= limit:
-            break
-
         feed_item_timestamp = feed_item["published_datetime"]
 
         if _date_in_the_future(feed_item_timestamp):
             log("Article from the future!")
             continue
 
-        if (not last_retrieval_time_seen_this_crawl) or (
-            feed_item_timestamp > last_retrieval_time_seen_this_crawl
-        ):
-            last_retrieval_time_seen_this_crawl = feed_item_timestamp
+        fresh_items.append(feed_item)
 
-        if last_retrieval_time_seen_this_crawl > feed.last_crawled_time:
-            feed.last_crawled_time = last_retrieval_time_seen_this_crawl
-            log(
-                f"+updated feed's last crawled time to {last_retrieval_time_seen_this_crawl}"
-            )
+    update_crawl_schedule(feed, [each["published_datetime"] for each in fresh_items])
+    log(f"Next crawl at: {feed.next_crawl_time}")
+    session.add(feed)
+    session.commit()
 
-        try:
-            log("before redirects")
-            log(feed_item["url"])
-            url = _url_after_redirects(feed_item["url"])
-            log("after redirects")
-            log(url)
-
-        except requests.exceptions.TooManyRedirects:
-            raise Exception(f"- Too many redirects")
-        except Exception:
-            raise Exception(
-                f"- Could not get url after redirects for {feed_item['url']}"
-            )
+    # the oldest first: the last crawled time only goes past the
+    # items that were processed; those after the limit, or after
+    # an error, are crawled the next time
+    fresh_items.sort(key=lambda each: each["published_datetime"])
+
+    try:
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as fetch_pool:
+
+            while fresh_items and downloaded < limit:
+
+                batch_size = min(PARSE_BATCH_SIZE, limit - downloaded)
+                batch = fresh_items[:batch_size]
+                fresh_items = fresh_items[batch_size:]
+
+                downloaded += _crawl_batch(
+                    batch,
+                    feed,
+                    session,
+                    fetch_pool,
+                    parse_pool,
+                    near_duplicates,
+                    enrichment_queue,
+                    report,
+                    save_in_elastic,
+                )
+
+                _advance_last_crawled_time(
+                    feed, batch[-1]["published_datetime"], session
+                )
+
+                with report.stage("enrichment"):
+                    save_enrichments(enrichment_queue, session, save_in_elastic)
+
+        if own_enrichment_queue:
+            with report.stage("enrichment"):
+                save_enrichments(enrichment_queue, session, save_in_elastic, wait=True)
+
+    except Exception:
+        session.rollback()
+        report.count("failed")
+        raise
+
+    finally:
+        if own_enrichment_queue:
+            enrichment_queue.shutdown()
+
+        report.count("downloaded", downloaded)
+
+        log(f"*** Downloaded: {downloaded} From: {feed.title}")
+        log(f"*** Low Quality: {report.outcomes['low_quality']}")
+        log(f"*** Already in DB: {report.outcomes['already_in_db']}")
+        log(f"*** Near Duplicates: {report.outcomes['near_duplicates']}")
+        log(f"*** Failed: {report.outcomes['failed']}")
+        log(f"*** Took: {report.duration():.1f}s")
+        log(f"*** ")
+
+        _save_report(report, session)
+
+
+def _crawl_batch(
+    batch,
+    feed,
+    session,
+    fetch_pool,
+    parse_pool,
+    near_duplicates,
+    enrichment_queue,
+    report,
+    save_in_elastic,
+):
+    """
+    Takes a batch of feed items through the stages of download_from_feed
+
+    :return: the number of downloaded articles
+    """
+    downloaded = 0
+
+    # Stage 1: resolve the redirects; I/O bound
+    with report.stage("redirects"):
+        urls = list(fetch_pool.map(_resolve_url, [each["url"] for each in batch]))
+
+    to_download = []
+    for feed_item, url in zip(batch, urls):
+        if url is None:
+            report.count("failed")
+            continue
 
         if banned_url(url):
             log("Banned Url")
             continue
 
-        session.add(feed)
-        session.commit()
-
-        try:
-            new_article = download_feed_item(session, feed, feed_item, url)
-            downloaded += 1
-        except SkippedForTooOld:
-            log("- Article too old")
+        if _already_in_db(url):
+            report.count("already_in_db")
+            log(" - Already in DB")
             continue
-        except SkippedForLowQuality as e:
-            log(f" - Low quality: {e.reason}")
-            skipped_due_to_low_quality += 1
+
+        to_download.append((feed_item, url))
+
+    # Stage 2: download the html; I/O bound
+    with report.stage("download"):
+        htmls = list(fetch_pool.map(_fetch_html, [url for _, url in to_download]))
+    report.count("failed", htmls.count(None))
+
+    # Stage 3: parse, clean, check quality, estimate difficulty; CPU bound
+    parse_jobs = [
+        (url, html, feed_item["summary"], feed.language.code)
+        for (feed_item, url), html in zip(to_download, htmls)
+        if html
+    ]
+    with report.stage("parse"):
+        if parse_pool:
+            parsed_records = list(parse_pool.map(_parse_job, parse_jobs))
+        else:
+            parsed_records = [_parse_job(job) for job in parse_jobs]
+
+    # Stage 4: persist; the batch is done on this thread
+    feed_items_by_url = {url: feed_item for feed_item, url in to_download}
+    for record in parsed_records:
+        if not record:
+            report.count("failed")
             continue
-        except SkippedAlreadyInDB:
-            skipped_already_in_db += 1
-            log(" - Already in DB")
+
+        if record["low_quality_reason"]:
+            log(f" - Low quality: {record['low_quality_reason']}")
+            report.count("low_quality")
             continue
 
+        if near_duplicates is not None:
+            canonical_id = near_duplicates.find_near_duplicate(
+                record["content_fingerprint"]
+            )
+            if canonical_id:
+                log(f" - Near duplicate of article {canonical_id}")
+                report.count("near_duplicates")
+                continue
+
+        try:
+            new_article = persist_parsed_article(
+                session,
+                feed,
+                feed_items_by_url[record["url"]],
+                record,
+                report,
+                enrichment_queue,
+            )
+            downloaded += 1
         except Exception as e:
             capture_to_sentry(e)
+            report.count("failed")
 
             if hasattr(e, "message"):
                 log(e.message)
@@ -173,25 +328,75 @@ def download_from_feed(feed: RSSFeed, session, limit=1000, save_in_elastic=True)
                 log(e)
             continue
 
+        if near_duplicates is not None and new_article and new_article.id:
+            near_duplicates.add(record["content_fingerprint"], new_article.id)
+
         if save_in_elastic:
             if new_article:
-                index_in_elasticsearch(new_article, session)
+                with report.stage("elastic"):
+                    index_in_elasticsearch(new_article, session)
 
-    log(f"*** Downloaded: {downloaded} From: {feed.title}")
-    log(f"*** Low Quality: {skipped_due_to_low_quality}")
-    log(f"*** Already in DB: {skipped_already_in_db}")
-    log(f"*** ")
+    return downloaded
 
 
-def download_feed_item(session, feed, feed_item, url):
-    new_article = None
+def _advance_last_crawled_time(feed, processed_until, session):
+    if feed.last_crawled_time and processed_until <= feed.last_crawled_time:
+        return
 
-    title = feed_item["title"]
+    feed.last_crawled_time = processed_until
+    log(f"+updated feed's last crawled time to {processed_until}")
+    session.add(feed)
+    session.commit()
+
+
+def save_enrichments(enrichment_queue, session, save_in_elastic=True, wait=False):
+    try:
+        enriched = enrichment_queue.save_completed(session, wait)
+    except Exception as e:
+        capture_to_sentry(e)
+        log(f"* Could not save the enrichments: {str(e)}")
+        session.rollback()
+        return
+
+    if save_in_elastic:
+        # the documents were indexed without the new difficulties
+        for article in enriched:
+            index_in_elasticsearch(article, session)
 
-    published_datetime = feed_item["published_datetime"]
 
+def _save_report(report, session):
+    # the crawl is more important than its statistics
     try:
-        art = model.Article.find(url)
+        report.save(session)
+    except Exception as e:
+        capture_to_sentry(e)
+        log(f"* Could not save the crawl report: {str(e)}")
+        session.rollback()
+
+
+def _resolve_url(url):
+    """
+    :return: the url after the redirects, or None if it can't be resolved
+    """
+    try:
+        log("before redirects")
+        log(url)
+        url_after_redirects = _url_after_redirects(url)
+        log("after redirects")
+        log(url_after_redirects)
+        return url_after_redirects
+
+    except requests.exceptions.TooManyRedirects:
+        log(f"- Too many redirects for {url}")
+        return None
+    except Exception:
+        log(f"- Could not get url after redirects for {url}")
+        return None
+
+
+def _already_in_db(url):
+    try:
+        return model.Article.find(url) is not None
     except:
         import sys
 
@@ -200,63 +405,171 @@ def download_feed_item(session, feed, feed_item, url):
             f" {LOG_CONTEXT}: For some reason excepted during Article.find \n{str(ex)}"
         )
 
-    if art:
-        raise SkippedAlreadyInDB()
 
+def _fetch_html(url):
+    """
+    :return: the html at the url, or None if it can't be downloaded
+    """
     try:
-
         art = newspaper.Article(url)
         art.download()
-        art.parse()
+        return art.html
+    except newspaper.ArticleException:
+        zeeguu.core.log(f"can't download article at: {url}")
+        return None
+
+
+def _parse_job(job):
+    # the pool passes a single argument to the function; and
+    # one article that can't be parsed should not fail the batch
+    try:
+        return parse_article(*job)
+    except Exception as e:
+        capture_to_sentry(e)
+        log(f"* Could not parse article at {job[0]}: {str(e)}")
+        return None
+
+
+def parse_article(url, html, feed_item_summary, language_code):
+    """
+
+    Does all the CPU bound work for a downloaded article. Does not
+    touch the DB, so it's safe to run in a worker process.
+
+    :return: a plain dictionary with everything that's needed to
+    create the Article; if the article is not good enough the
+    low_quality_reason is set.
+
+    """
 
-        debug("- Succesfully parsed")
+    art = newspaper.Article(url)
+    art.download(input_html=html)
+    art.parse()
 
-        cleaned_up_text = cleanup_non_content_bits(art.text)
+    debug("- Succesfully parsed")
 
-        cleaned_up_text = flatten_composed_unicode_characters(cleaned_up_text)
+    cleaned_up_text = cleanup_non_content_bits(art.text)
 
-        is_quality_article, reason = sufficient_quality(art)
+    cleaned_up_text = flatten_composed_unicode_characters(cleaned_up_text)
 
-        if not is_quality_article:
-            raise SkippedForLowQuality(reason)
+    record = dict(
+        url=url,
+        low_quality_reason=None,
+        authors=", ".join(art.authors),
+        content=cleaned_up_text,
+        summary=None,
+        fk_difficulty=None,
+        token_profile=None,
+        content_fingerprint=None,
+    )
 
-        summary = feed_item["summary"]
-        # however, this is not so easy... there have been cases where
-        # the summary is just malformed HTML... thus we try to extract
-        # the text:
-        from bs4 import BeautifulSoup
+    is_quality_article, reason = sufficient_quality(art)
 
-        soup = BeautifulSoup(summary, "lxml")
-        summary = soup.get_text()
-        # then there are cases where the summary is huge... so we clip it
-        summary = summary[:MAX_CHAR_COUNT_IN_SUMMARY]
-        # and if there is still no summary, we simply use the beginning of
-        # the article
-        if len(summary) < 10:
-            summary = cleaned_up_text[:MAX_CHAR_COUNT_IN_SUMMARY]
+    if not is_quality_article:
+        record["low_quality_reason"] = reason
+        return record
 
-            # Create new article and save it to DB
+    # however, this is not so easy... there have been cases where
+    # the summary is just malformed HTML... thus we try to extract
+    # the text:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(feed_item_summary, "lxml")
+    summary = soup.get_text()
+    # then there are cases where the summary is huge... so we clip it
+    summary = summary[:MAX_CHAR_COUNT_IN_SUMMARY]
+    # and if there is still no summary, we simply use the beginning of
+    # the article
+    if len(summary) < 10:
+        summary = cleaned_up_text[:MAX_CHAR_COUNT_IN_SUMMARY]
+    record["summary"] = summary
+
+    # the worker has no DB; the estimator only needs the language code
+    language = model.Language(
+        language_code, model.Language.LANGUAGE_NAMES.get(language_code)
+    )
+    token_profile = TokenProfile.from_text(cleaned_up_text, language_code)
+    fk_estimator = DifficultyEstimatorFactory.get_difficulty_estimator("fk")
+    record["token_profile"] = token_profile
+    record["fk_difficulty"] = fk_estimator.estimate_difficulty_from_profile(
+        token_profile, language, None
+    )["grade"]
+
+    record["content_fingerprint"] = simhash(cleaned_up_text)
+
+    return record
+
+
+def download_feed_item(session, feed, feed_item, url):
+
+    if _already_in_db(url):
+        raise SkippedAlreadyInDB()
+
+    html = _fetch_html(url)
+    if not html:
+        return None
+
+    record = _parse_job((url, html, feed_item["summary"], feed.language.code))
+    if not record:
+        return None
+
+    if record["low_quality_reason"]:
+        raise SkippedForLowQuality(record["low_quality_reason"])
+
+    return persist_parsed_article(session, feed, feed_item, record)
+
+
+def persist_parsed_article(
+    session, feed, feed_item, record, report=None, enrichment_queue=None
+):
+    """
+
+    Creates the Article out of a record returned by parse_article
+    together with its topics, keywords, and extra difficulties,
+    and saves it in the DB.
+
+    If a CrawlReport is given, the time of the stages is added to it.
+
+    If an EnrichmentQueue is given, the extra difficulties are computed
+    in the background; otherwise they are retrieved before the commit.
+
+    """
+    report = report or CrawlReport(feed)
+    new_article = None
+
+    title = feed_item["title"]
+    url = record["url"]
+
+    try:
+        # Create new article and save it to DB
         new_article = zeeguu.core.model.Article(
             Url.find_or_create(session, url),
             title,
-            ", ".join(art.authors),
-            cleaned_up_text,
-            summary,
-            published_datetime,
+            record["authors"],
+            record["content"],
+            record["summary"],
+            feed_item["published_datetime"],
             feed,
             feed.language,
+            fk_difficulty=record["fk_difficulty"],
+            token_profile=record["token_profile"],
         )
+        new_article.content_fingerprint = to_db_value(record["content_fingerprint"])
         session.add(new_article)
 
-        topics = add_topics(new_article, session)
+        with report.stage("topics"):
+            topics = add_topics(new_article, session)
         log(f" Topics ({topics})")
 
-        add_searches(title, url, new_article, session)
+        with report.stage("keywords"):
+            add_searches(title, url, new_article, session)
         debug(" Added keywords")
 
+        needs_lingo_rank = new_article.language.code == "fr"
+
         # compute extra difficulties for french articles
         try:
-            if new_article.language.code == "fr":
+            if needs_lingo_rank and not enrichment_queue:
                 from zeeguu.core.language.services.lingo_rank_service import (
                     retrieve_lingo_rank,
                 )
@@ -268,14 +581,12 @@ def download_feed_item(session, feed, feed_item, url):
         except Exception as e:
             capture_to_sentry(e)
 
-        session.commit()
+        with report.stage("commit"):
+            session.commit()
         log(f"SUCCESS for: {new_article.title}")
 
-    except SkippedForLowQuality as e:
-        raise e
-
-    except newspaper.ArticleException as e:
-        zeeguu.core.log(f"can't download article at: {url}")
+        if needs_lingo_rank and enrichment_queue:
+            enrichment_queue.submit(new_article)
 
     except DataError as e:
         zeeguu.core.log(f"Data error for: {url}")
@@ -0,0 +1,45 @@
+"""
+
+    Collects, while a feed is being crawled, the time spent in
+    every stage of the crawl and the outcome of every feed item;
+    at the end of the crawl the report is saved as a FeedCrawlRun.
+
+"""
+
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class CrawlReport(object):
+    def __init__(self, feed):
+        self.feed = feed
+        self.start_time = datetime.now()
+        self._started = time.perf_counter()
+        self.stage_times = defaultdict(float)
+        self.outcomes = Counter()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_times[name] += time.perf_counter() - started
+
+    def count(self, outcome, how_many=1):
+        self.outcomes[outcome] += how_many
+
+    def duration(self):
+        return time.perf_counter() - self._started
+
+    def save(self, session):
+        from zeeguu.core.model import FeedCrawlRun
+
+        run = FeedCrawlRun(
+            self.feed, self.start_time, self.duration(), self.stage_times, self.outcomes
+        )
+        session.add(run)
+        session.commit()
+        return run
@@ -0,0 +1,97 @@
+"""
+
+    Not all the feeds publish at the same rate: some publish
+    every hour, others once a month. Instead of crawling all of
+    them at every run, we keep for every feed an estimate of the
+    time between two of its items (an exponentially weighted
+    average of the inter-arrival times) and from it we compute
+    when the feed is due to be crawled again.
+
+"""
+
+import heapq
+from datetime import datetime, timedelta
+
+# weight of the newest inter-arrival time in the average
+SMOOTHING = 0.3
+
+# we check a feed a bit before we expect the next item,
+# to not lag too much behind the publisher
+POLLS_PER_PUBLISH_INTERVAL = 2
+
+MIN_CRAWL_INTERVAL = timedelta(minutes=30)
+MAX_CRAWL_INTERVAL = timedelta(days=3)
+
+
+def _smoothed(previous_estimate, new_interval):
+    if previous_estimate is None:
+        return new_interval
+    return SMOOTHING * new_interval + (1 - SMOOTHING) * previous_estimate
+
+
+def update_crawl_schedule(feed, new_item_timestamps, now=None):
+    """
+
+    To call after a feed was crawled.
+
+    :param feed: the RSSFeed; its publish_interval_estimate and
+    next_crawl_time are updated but not committed
+    :param new_item_timestamps: publishing times of the items which
+    were published after the previous crawl of the feed
+    :param now: for testing
+    """
+    now = now or datetime.now()
+    estimate = feed.publish_interval_estimate
+
+    previous = feed.last_crawled_time
+    for timestamp in sorted(new_item_timestamps):
+        if previous and timestamp > previous:
+            interval = (timestamp - previous).total_seconds()
+            estimate = _smoothed(estimate, interval)
+        previous = timestamp
+
+    if not new_item_timestamps and feed.last_crawled_time and estimate:
+        # nothing new; the time since the last item is a lower bound
+        # for the current interval, so an idle feed slowly backs off
+        silence = (now - feed.last_crawled_time).total_seconds()
+        if silence > estimate:
+            estimate = _smoothed(estimate, silence)
+
+    if estimate is not None:
+        feed.publish_interval_estimate = int(estimate)
+
+    feed.next_crawl_time = now + crawl_interval(feed.publish_interval_estimate)
+
+
+def crawl_interval(publish_interval_estimate):
+    if publish_interval_estimate is None:
+        # we know nothing about the feed yet
+        return MIN_CRAWL_INTERVAL
+
+    interval = timedelta(
+        seconds=publish_interval_estimate / POLLS_PER_PUBLISH_INTERVAL
+    )
+    return max(MIN_CRAWL_INTERVAL, min(MAX_CRAWL_INTERVAL, interval))
+
+
+def feeds_due_for_crawling(feeds, now=None):
+    """
+
+    :return: generator of the active feeds that are due, the most
+    overdue first; feeds that were never scheduled come first
+
+    """
+    now = now or datetime.now()
+
+    queue = []
+    for feed in feeds:
+        if feed.deactivated:
+            continue
+
+        due_time = feed.next_crawl_time or datetime.min
+        if due_time <= now:
+            heapq.heappush(queue, (due_time, feed.id, feed))
+
+    while queue:
+        _, _, feed = heapq.heappop(queue)
+        yield feed
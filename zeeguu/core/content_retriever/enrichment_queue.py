@@ -0,0 +1,126 @@
+"""
+
+    Some difficulties (e.g. LingoRank for French) are computed by
+    external services which can be slow or down. Instead of calling
+    them while the article is being saved, the crawl submits the
+    saved articles to an EnrichmentQueue: a few threads call the
+    service (with a timeout and a few retries) while the crawl
+    goes on, and the crawl saves the results whenever it has time.
+
+    The results are cached by the hash of the text, since the
+    same text is often published by several feeds.
+
+"""
+
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait as wait_for_futures
+
+from sentry_sdk import capture_exception as capture_to_sentry
+
+from zeeguu.core import log
+from zeeguu.core.util import text_hash
+
+ENRICHMENT_WORKERS = 4
+RETRIES = 2
+RETRY_DELAY = 2  # seconds; doubled after every retry
+MAX_CACHED_RESULTS = 10000
+
+
+def _retrieve_lingo_rank(text):
+    # imported here such that it can be patched in the tests
+    from zeeguu.core.language.services.lingo_rank_service import (
+        retrieve_lingo_rank,
+    )
+
+    return retrieve_lingo_rank(text)
+
+
+class EnrichmentQueue(object):
+    def __init__(
+        self,
+        retrieve=_retrieve_lingo_rank,
+        max_workers=ENRICHMENT_WORKERS,
+        retries=RETRIES,
+        retry_delay=RETRY_DELAY,
+    ):
+        self.retrieve = retrieve
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.pending = []  # (article_id, hash, future)
+        self.cache = OrderedDict()
+
+    def submit(self, article):
+        hash = text_hash(article.content)
+        future = self.executor.submit(self._retrieve_with_retries, hash, article.content)
+        self.pending.append((article.id, hash, future))
+
+    def _retrieve_with_retries(self, hash, text):
+        if hash in self.cache:
+            return self.cache[hash]
+
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                result = self.retrieve(text)
+                self._cache(hash, result)
+                return result
+            except Exception as e:
+                log(f"Enrichment attempt {attempt + 1} failed: {str(e)}")
+                if attempt == self.retries:
+                    capture_to_sentry(e)
+                    return None
+                time.sleep(delay)
+                delay *= 2
+
+    def _cache(self, hash, result):
+        self.cache[hash] = result
+        if len(self.cache) > MAX_CACHED_RESULTS:
+            self.cache.popitem(last=False)
+
+    def completed(self, wait=False):
+        """
+        :param wait: if True, waits for all the submitted articles
+        :return: list of (article_id, result) for the articles that
+        are done; those that failed have None as result
+        """
+        if wait:
+            wait_for_futures([future for _, _, future in self.pending])
+
+        # in one pass: a future might finish while we go through them
+        done = []
+        still_pending = []
+        for each in self.pending:
+            if each[2].done():
+                done.append(each)
+            else:
+                still_pending.append(each)
+        self.pending = still_pending
+
+        return [(article_id, future.result()) for article_id, _, future in done]
+
+    def save_completed(self, session, wait=False):
+        """
+        Saves the results of the completed articles in the DB
+
+        :return: the articles that got a new difficulty
+        """
+        from zeeguu.core.model import Article, DifficultyLingoRank
+
+        enriched = []
+        for article_id, difficulty in self.completed(wait):
+            if difficulty is None:
+                continue
+            article = Article.query.get(article_id)
+            session.add(DifficultyLingoRank(article, difficulty))
+            enriched.append(article)
+
+        if enriched:
+            session.commit()
+
+        return enriched
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,160 @@
+"""
+
+    The same wire story is often published by several of our
+    feeds under different urls. To avoid downloading, estimating,
+    and recommending every copy, we compute a SimHash fingerprint
+    of the cleaned up text of every article and look it up in
+    an index of the fingerprints of the recent articles.
+
+    Two texts are near duplicates if their fingerprints differ
+    in at most MAX_HAMMING_DISTANCE bits. The index splits every
+    fingerprint into BANDS bands; by the pigeonhole principle two
+    fingerprints within that distance share at least one band
+    exactly, so only the fingerprints in the same band buckets
+    have to be compared.
+
+"""
+
+from collections import deque, Counter
+from datetime import datetime, timedelta
+from hashlib import blake2b
+
+import numpy
+
+from zeeguu.core.language.text_processing import tokenize
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+
+MAX_HAMMING_DISTANCE = 3
+BANDS = MAX_HAMMING_DISTANCE + 1
+BAND_BITS = FINGERPRINT_BITS // BANDS
+
+# the wire stories are republished within days of each other
+RECENT_DAYS = 7
+MAX_INDEXED_FINGERPRINTS = 100000
+
+
+def simhash(text: str) -> int:
+    """
+    :return: a 64 bit fingerprint of the text computed from
+    the word trigrams of the text; similar texts have
+    fingerprints that differ in few bits
+    """
+    words = [w.lower() for w in tokenize(text)]
+    if not words:
+        return 0
+
+    shingles = Counter(
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(max(1, len(words) - SHINGLE_SIZE + 1))
+    )
+
+    hashes = b"".join(
+        blake2b(shingle.encode("utf8"), digest_size=8).digest()
+        for shingle in shingles.keys()
+    )
+    # one row of 64 bits for every shingle
+    bits = numpy.unpackbits(
+        numpy.frombuffer(hashes, dtype=numpy.uint8).reshape(-1, 8), axis=1
+    )
+    weights = numpy.array(list(shingles.values()))
+
+    votes = (weights[:, None] * (2 * bits.astype(numpy.int64) - 1)).sum(axis=0)
+
+    fingerprint = 0
+    for bit in votes > 0:
+        fingerprint = (fingerprint << 1) | int(bit)
+    return fingerprint
+
+
+def hamming_distance(fingerprint_a: int, fingerprint_b: int) -> int:
+    return bin(fingerprint_a ^ fingerprint_b).count("1")
+
+
+def to_db_value(fingerprint: int) -> int:
+    # the DB column is a signed BIGINT
+    if fingerprint >= 1 << (FINGERPRINT_BITS - 1):
+        return fingerprint - (1 << FINGERPRINT_BITS)
+    return fingerprint
+
+
+def from_db_value(value: int) -> int:
+    if value < 0:
+        return value + (1 << FINGERPRINT_BITS)
+    return value
+
+
+def _bands(fingerprint):
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+class NearDuplicateIndex(object):
+    """
+    In-memory index of the fingerprints of recent articles.
+
+    Bounded to max_size fingerprints; when full, the oldest
+    fingerprint that was added is evicted.
+    """
+
+    def __init__(self, max_size=MAX_INDEXED_FINGERPRINTS):
+        self.max_size = max_size
+        self.entries = deque()
+        self.buckets = [dict() for _ in range(BANDS)]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, fingerprint: int, article_id: int):
+        if len(self.entries) >= self.max_size:
+            self._evict_oldest()
+
+        entry = (fingerprint, article_id)
+        self.entries.append(entry)
+        for band, bucket in zip(_bands(fingerprint), self.buckets):
+            bucket.setdefault(band, []).append(entry)
+
+    def find_near_duplicate(self, fingerprint: int):
+        """
+        :return: the id of an indexed article whose fingerprint is
+        within MAX_HAMMING_DISTANCE of the given one, or None
+        """
+        for band, bucket in zip(_bands(fingerprint), self.buckets):
+            for candidate, article_id in bucket.get(band, []):
+                if hamming_distance(candidate, fingerprint) <= MAX_HAMMING_DISTANCE:
+                    return article_id
+        return None
+
+    def _evict_oldest(self):
+        entry = self.entries.popleft()
+        for band, bucket in zip(_bands(entry[0]), self.buckets):
+            bucket[band].remove(entry)
+            if not bucket[band]:
+                del bucket[band]
+
+    @classmethod
+    def from_recent_articles(cls, days=RECENT_DAYS):
+        """
+        Loads the fingerprints of the articles published in
+        the last days; articles without a fingerprint (e.g.
+        not yet backfilled) are ignored
+        """
+        from zeeguu.core.model import Article
+
+        index = cls()
+
+        some_time_ago = datetime.now() - timedelta(days=days)
+        rows = (
+            Article.query.with_entities(Article.id, Article.content_fingerprint)
+            .filter(Article.published_time > some_time_ago)
+            .filter(Article.content_fingerprint != None)
+            .order_by(Article.id.desc())
+            .limit(index.max_size)
+            .all()
+        )
+        # oldest first, such that they're also the first to be evicted
+        for article_id, fingerprint in reversed(rows):
+            index.add(from_db_value(fingerprint), article_id)
+
+        return index
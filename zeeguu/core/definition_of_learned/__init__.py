@@ -1,2 +1,3 @@
 from .is_learned import is_learned_based_on_exercise_outcomes
-from .is_learned import CORRECTS_IN_DISTINCT_DAYS_FOR_LEARNED
\ No newline at end of file
+from .is_learned import is_learned_based_on_exercise_summary
+from .is_learned import CORRECTS_IN_DISTINCT_DAYS_FOR_LEARNED
@@ -8,8 +8,25 @@ def is_learned_based_on_exercise_outcomes(exercise_log):
     if exercise_log.is_empty():
         return False
 
+    return _is_learned(
+        exercise_log.latest_exercise_outcome(),
+        len(exercise_log.most_recent_correct_dates()),
+    )
+
+
+def is_learned_based_on_exercise_summary(bookmark):
+    """
+    Same as is_learned_based_on_exercise_outcomes, but based on the
+    exercise summary of the bookmark, instead of its exercise log
+    """
+    if bookmark.last_outcome is None:
+        return False
+
+    return _is_learned(bookmark.last_outcome, bookmark.correct_days_in_streak)
+
+
+def _is_learned(last_outcome, correct_days_in_streak):
     return (
-        exercise_log.last_exercise().is_too_easy()
-        or len(exercise_log.most_recent_correct_dates())
-        >= CORRECTS_IN_DISTINCT_DAYS_FOR_LEARNED
+        last_outcome.too_easy()
+        or correct_days_in_streak >= CORRECTS_IN_DISTINCT_DAYS_FOR_LEARNED
     )
@@ -0,0 +1,72 @@
+"""
+
+    What happens after an exercise, but does not have to happen
+    before the answer to /report_exercise_outcome: the fit for study
+    and learned status of the bookmark (which go through its whole
+    exercise log) and the accounting of the exercise sessions (which
+    locks the open sessions of the user).
+
+    These run in a background thread, shortly after the exercise and
+    its schedule are committed. There is only one worker, such that
+    the exercises of a user are accounted in the order they came.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import zeeguu.core
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="after_exercise")
+
+
+def update_after_exercise_later(bookmark_id, exercise_id):
+    """
+    :return: a future that is done once the updates are saved
+    """
+    return update_after_exercises_later([(bookmark_id, exercise_id)])
+
+
+def update_after_exercises_later(bookmark_and_exercise_ids):
+    """
+    :param bookmark_and_exercise_ids: (bookmark_id, exercise_id) pairs,
+    in the order of the exercises
+    :return: a future that is done once the updates are saved
+    """
+    return _executor.submit(_update_after_exercises, list(bookmark_and_exercise_ids))
+
+
+def wait_for_pending_updates():
+    # the worker takes the updates in order
+    _executor.submit(lambda: None).result()
+
+
+def _update_after_exercises(bookmark_and_exercise_ids):
+    # the scoped session of this thread; not the one of the request
+    session = zeeguu.core.db.session
+    try:
+        for bookmark_id, exercise_id in bookmark_and_exercise_ids:
+            _update_after_exercise(session, bookmark_id, exercise_id)
+    finally:
+        session.remove()
+
+
+def _update_after_exercise(session, bookmark_id, exercise_id):
+    from zeeguu.core.model import Bookmark, Exercise, UserExerciseSession
+
+    try:
+        bookmark = Bookmark.query.get(bookmark_id)
+        exercise = Exercise.query.get(exercise_id)
+        if bookmark is None or exercise is None:
+            return
+
+        bookmark.update_fit_for_study(session)
+        bookmark.update_learned_status(session)
+        session.commit()
+
+        UserExerciseSession.update_exercise_session(exercise, session)
+
+    except Exception as e:
+        session.rollback()
+        zeeguu.core.warning(
+            f"could not update bookmark {bookmark_id} after exercise {exercise_id}: {e}"
+        )
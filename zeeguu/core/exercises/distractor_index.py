@@ -0,0 +1,116 @@
+"""
+
+    The words of a language grouped such that, for a given word, other
+    words that look like plausible alternatives in an exercise can be
+    drawn in constant time: similarly frequent, of a similar length,
+    and with the same ending (which in many languages hints at the
+    part of speech, e.g. -en, -ly, -ing).
+
+    Every word is in three buckets, from the most to the least
+    specific: (frequency band, length band, ending), (frequency band,
+    length band), and (frequency band). A bucket is an array of the
+    positions of its words in the frequency list.
+
+"""
+
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from threading import Lock
+
+from zeeguu.core.word_stats import lang_info
+
+# the rarer words are mostly noise
+MAX_INDEXED_WORDS = 50000
+
+# upper bounds (exclusive) of the frequency bands, by rank
+FREQUENCY_BANDS = [500, 1000, 2000, 5000, 10000, 20000]
+
+# upper bounds (inclusive) of the length bands
+LENGTH_BANDS = [3, 5, 7, 9, 12]
+
+ENDING_LENGTH = 2
+
+# a bucket with fewer words than this is not used; the next,
+# less specific one is
+MIN_BUCKET_SIZE = 10
+
+# random draws from a bucket before giving up on it
+MAX_DRAWS = 20
+
+_indices = {}
+_indices_lock = Lock()
+
+
+def frequency_band(rank):
+    return bisect_right(FREQUENCY_BANDS, rank)
+
+
+def length_band(word):
+    return bisect_left(LENGTH_BANDS, len(word))
+
+
+def ending(word):
+    if not word.isalpha() or len(word) <= ENDING_LENGTH:
+        return ""
+    return word[-ENDING_LENGTH:]
+
+
+def bucket_keys(word, rank):
+    """
+    :return: the keys of the buckets of the word, the most specific first
+    """
+    band = frequency_band(rank)
+    length = length_band(word)
+    return [(band, length, ending(word)), (band, length), (band,)]
+
+
+class DistractorIndex(object):
+    def __init__(self, words):
+        """
+        :param words: the words of the language, the most frequent first
+        """
+        self.words = words[:MAX_INDEXED_WORDS]
+
+        self.buckets = {}
+        for position, word in enumerate(self.words):
+            for key in bucket_keys(word, position + 1):
+                bucket = self.buckets.get(key)
+                if bucket is None:
+                    bucket = self.buckets[key] = array("I")
+                bucket.append(position)
+
+    @classmethod
+    def for_language(cls, language_code):
+        with _indices_lock:
+            if language_code not in _indices:
+                _indices[language_code] = cls(lang_info(language_code).all_words())
+            return _indices[language_code]
+
+    def distractors(self, word, rank, count=2):
+        """
+        :param rank: the rank of the word in the frequency list; the
+        word itself does not have to be in the index
+        :return: count words, different from the word and each other
+        """
+        for key in bucket_keys(word, rank):
+            bucket = self.buckets.get(key)
+            if bucket is None or len(bucket) < MIN_BUCKET_SIZE:
+                continue
+
+            chosen = self._draw(bucket, word, count)
+            if len(chosen) == count:
+                return chosen
+
+        candidates = [each for each in self.words[: 10 * count + 1] if each != word]
+        return random.sample(candidates, min(count, len(candidates)))
+
+    def _draw(self, bucket, word, count):
+        chosen = []
+        for _ in range(MAX_DRAWS):
+            candidate = self.words[bucket[random.randrange(len(bucket))]]
+            if candidate != word and candidate not in chosen:
+                chosen.append(candidate)
+                if len(chosen) == count:
+                    break
+        return chosen
@@ -1,19 +1,24 @@
-import random
-
+from zeeguu.core.exercises.distractor_index import DistractorIndex
 from zeeguu.core.word_stats import lang_info
 
 
-def similar_words(word, language, user):
-
-    words_the_user_must_study = user.bookmarks_to_study(10)
+def similar_words(word, language, count=2):
+    """
+    :return: count words of the language that could be mistaken
+    for the given word; see DistractorIndex
+    """
+    return similar_words_for_each([word], language, count)[0]
 
-    if len(words_the_user_must_study) == 10:
-        candidates = [each.origin.word for each in words_the_user_must_study]
-    else:
-        candidates = lang_info(language.code).all_words()
 
-    random_sample = random.sample(candidates, 2)
-    while word in random_sample:
-        random_sample = random.sample(candidates, 2)
+def similar_words_for_each(words, language, count=2):
+    """
+    Same as similar_words, for several words of the same language
+    """
+    index = DistractorIndex.for_language(language.code)
+    stats = lang_info(language.code)
 
-    return random_sample
+    result = []
+    for word in words:
+        word = word.lower()
+        result.append(index.distractors(word, stats[word].rank, count))
+    return result
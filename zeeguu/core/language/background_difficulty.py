@@ -0,0 +1,65 @@
+"""
+
+    Estimating the difficulty of a long uploaded text (e.g. a book
+    chapter) takes too long for the upload request. Such articles
+    are saved without a difficulty, and a background thread fills
+    it in shortly after; see Article.estimate_difficulty_inline.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Lock
+
+import zeeguu.core
+
+WORKERS = 2
+
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="difficulty")
+
+_pending = set()
+_pending_lock = Lock()
+
+
+def estimate_difficulty_later(article_id):
+    """
+    :return: a future that is done once the difficulty is saved
+    """
+    future = _executor.submit(_estimate_difficulty, article_id)
+    with _pending_lock:
+        _pending.add(future)
+    future.add_done_callback(_forget)
+    return future
+
+
+def wait_for_pending_estimates():
+    with _pending_lock:
+        pending = list(_pending)
+    wait(pending)
+
+
+def _forget(future):
+    with _pending_lock:
+        _pending.discard(future)
+
+
+def _estimate_difficulty(article_id):
+    from zeeguu.core.model import Article
+
+    # the scoped session of this thread; not the one of the request
+    session = zeeguu.core.db.session
+    try:
+        article = Article.find_by_id(article_id)
+        if article is None:
+            return
+
+        article.estimate_difficulty()
+        session.add(article)
+        session.commit()
+        zeeguu.core.log(f"estimated difficulty of article {article_id} in the background")
+
+    except Exception as e:
+        session.rollback()
+        zeeguu.core.warning(f"could not estimate the difficulty of article {article_id}: {e}")
+
+    finally:
+        session.remove()
@@ -1,9 +1,17 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from typing import Type
 
+import numpy
+
 from zeeguu.core.language.difficulty_estimator_strategy import DifficultyEstimatorStrategy
 from zeeguu.core.language.strategies.default_difficulty_estimator import DefaultDifficultyEstimator
 from zeeguu.core.language.strategies.flesch_kincaid_difficulty_estimator import FleschKincaidDifficultyEstimator
 
+# how many texts are sent together to a worker process
+BATCH_CHUNK_SIZE = 64
+
 
 class DifficultyEstimatorFactory:
 
@@ -29,3 +37,84 @@ class DifficultyEstimatorFactory:
                 return estimator
 
         return cls._default_estimator
+
+    @classmethod
+    def estimate_difficulties(
+        cls,
+        estimator_name: str,
+        texts,
+        score: str = "normalized",
+        processes: int = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        pool: ProcessPoolExecutor = None,
+    ):
+        """
+        Estimates the difficulty of many texts, e.g. when recomputing the
+        difficulties of the articles. The texts are split in chunks which are
+        estimated in parallel by a pool of worker processes; every worker keeps
+        its own caches (e.g. hyphenators) for all the chunks it estimates.
+
+        :param estimator_name: see get_difficulty_estimator
+        :param texts: iterable of (id, text, language) tuples; the language
+        can be a Language or a language code
+        :param score: which of the values returned by the estimator to keep
+        :param processes: number of worker processes; by default one per core;
+        with 1 everything is estimated in this process
+        :param pool: a pool of worker processes to use instead of starting
+        one; when estimating in batches, such that the workers and their
+        caches are kept from one batch to the next
+        :return: two numpy arrays of the same length: the ids and the scores
+        """
+        jobs = _chunks(estimator_name, score, texts, chunk_size)
+
+        if pool:
+            return _as_arrays(pool.map(_estimate_chunk, jobs))
+
+        processes = processes or os.cpu_count()
+
+        if processes == 1:
+            results = map(_estimate_chunk, jobs)
+            return _as_arrays(results)
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            return _as_arrays(pool.map(_estimate_chunk, jobs))
+
+
+def _chunks(estimator_name, score, texts, chunk_size):
+    texts = iter(texts)
+    while True:
+        chunk = [
+            (id, text, getattr(language, "code", language))
+            for id, text, language in islice(texts, chunk_size)
+        ]
+        if not chunk:
+            return
+        yield estimator_name, score, chunk
+
+
+def _estimate_chunk(job):
+    from zeeguu.core.model import Language
+
+    estimator_name, score, chunk = job
+    estimator = DifficultyEstimatorFactory.get_difficulty_estimator(estimator_name)
+
+    ids = numpy.empty(len(chunk), dtype=numpy.int64)
+    scores = numpy.empty(len(chunk), dtype=numpy.float64)
+    for i, (id, text, language_code) in enumerate(chunk):
+        # the worker has no DB; the estimators only need the language code
+        language = Language(language_code, Language.LANGUAGE_NAMES.get(language_code))
+        ids[i] = id
+        scores[i] = estimator.estimate_difficulty(text, language, None)[score]
+
+    return ids, scores
+
+
+def _as_arrays(results):
+    results = list(results)
+    if not results:
+        return numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.float64)
+
+    return (
+        numpy.concatenate([ids for ids, _ in results]),
+        numpy.concatenate([scores for _, scores in results]),
+    )
@@ -37,3 +37,17 @@ class DifficultyEstimatorStrategy:
         """
 
         pass
+
+    def score_vector(self):
+        """
+        For the estimators that score the stems of a text with a score_map:
+        the score_map as a ScoreVector, to estimate from token profiles.
+        Built the first time it's needed.
+        """
+        from zeeguu.core.language.token_profile import ScoreVector
+
+        if getattr(self, "_score_vector_of", None) is not self.score_map:
+            self._score_vector = ScoreVector.from_score_map(self.score_map)
+            self._score_vector_of = self.score_map
+
+        return self._score_vector
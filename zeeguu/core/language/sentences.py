@@ -0,0 +1,136 @@
+"""
+
+    Sentence boundaries, shared by the difficulty estimators, the
+    token profiles and the text metrics.
+
+    nltk.sent_tokenize looks up the punkt model at every call, and
+    always uses the English one; here there is one punkt tokenizer
+    per language, loaded once. The sentence spans of the recently
+    segmented texts are memoised by their text_hash, since the same
+    text is often segmented more than once (e.g. by the FK estimator
+    and by the text metrics).
+
+    Where only the number of sentences matters and an estimate is
+    good enough, count_sentences_fast is a regex heuristic that is
+    much faster than punkt; tools/benchmark_sentence_counting.py
+    compares the two.
+
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+import nltk
+import regex
+
+from zeeguu.core.util.hash import text_hash
+
+# the languages for which nltk has a punkt model
+PUNKT_LANGUAGES = {
+    "cs": "czech",
+    "da": "danish",
+    "nl": "dutch",
+    "en": "english",
+    "et": "estonian",
+    "fi": "finnish",
+    "fr": "french",
+    "de": "german",
+    "el": "greek",
+    "it": "italian",
+    "no": "norwegian",
+    "pl": "polish",
+    "pt": "portuguese",
+    "ru": "russian",
+    "sl": "slovene",
+    "es": "spanish",
+    "sv": "swedish",
+    "tr": "turkish",
+}
+DEFAULT_PUNKT_LANGUAGE = "english"
+
+MAX_CACHED_TEXTS = 500
+
+# followed by a period, these rarely end a sentence
+ABBREVIATIONS = ["Dr", "Mr", "Mrs", "Ms", "Prof", "St", "Nr", "vs", "ca", "bzw", "Hr", "Fr", "Mme"]
+
+# a sentence end: the punctuation, maybe closing quotes or brackets,
+# whitespace, and the start of the next sentence; not after an initial,
+# an abbreviation, or a one or two digit number (e.g. "am 3. Oktober")
+SENTENCE_END = regex.compile(
+    r"(?<!(?:^|\s)(?:\p{L}|\d{1,2}|"
+    + "|".join(ABBREVIATIONS)
+    + r"))[.!?…]+[\"'»«”“)\]]*\s+(?=[\"'«»„“(\[]?[\p{Lu}\d])"
+)
+
+_tokenizers = {}
+
+# (language code, text hash) -> sentence spans
+_spans = OrderedDict()
+_spans_lock = Lock()
+
+
+def punkt_resource():
+    """
+    :return: the nltk data that punkt_tokenizer needs: the PunktTokenizer
+    of nltk >= 3.8.2 loads the models from punkt_tab, not from punkt
+    """
+    try:
+        from nltk.tokenize import PunktTokenizer
+
+        return "punkt_tab"
+    except ImportError:
+        return "punkt"
+
+
+def punkt_tokenizer(language_code: str):
+    language = PUNKT_LANGUAGES.get(language_code, DEFAULT_PUNKT_LANGUAGE)
+
+    if language not in _tokenizers:
+        try:
+            # nltk >= 3.8.2
+            from nltk.tokenize import PunktTokenizer
+
+            _tokenizers[language] = PunktTokenizer(language)
+        except ImportError:
+            _tokenizers[language] = nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+
+    return _tokenizers[language]
+
+
+def sentence_spans(text: str, language_code: str = "en"):
+    """
+    :return: the (start, end) of every sentence of the text
+    """
+    key = (language_code, text_hash(text))
+
+    with _spans_lock:
+        spans = _spans.get(key)
+        if spans is not None:
+            _spans.move_to_end(key)
+            return spans
+
+    spans = list(punkt_tokenizer(language_code).span_tokenize(text))
+
+    with _spans_lock:
+        _spans[key] = spans
+        if len(_spans) > MAX_CACHED_TEXTS:
+            _spans.popitem(last=False)
+
+    return spans
+
+
+def sentences(text: str, language_code: str = "en"):
+    return [text[start:end] for start, end in sentence_spans(text, language_code)]
+
+
+def count_sentences(text: str, language_code: str = "en"):
+    return len(sentence_spans(text, language_code))
+
+
+def count_sentences_fast(text: str):
+    """
+    :return: an estimate of the number of sentences of the text
+    """
+    if not text.strip():
+        return 0
+    return len(SENTENCE_END.findall(text.strip())) + 1
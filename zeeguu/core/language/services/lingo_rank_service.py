@@ -1,11 +1,19 @@
+import os
+
 import requests
 
+LINGO_RANK_URL = os.environ.get(
+    "ZEEGUU_LINGO_RANK_URL",
+    "https://www.wolframcloud.com/obj/929a0113-278c-479d-912a-54ef21b5e0bb",
+)
+
+# seconds; the service is sometimes very slow
+LINGO_RANK_TIMEOUT = 30
+
 
-def retrieve_lingo_rank(text):
-    res = requests.get(
-        "https://www.wolframcloud.com/obj/929a0113-278c-479d-912a-54ef21b5e0bb",
-        params={"x": text},
-    )
+def retrieve_lingo_rank(text, url=LINGO_RANK_URL, timeout=LINGO_RANK_TIMEOUT):
+    res = requests.get(url, params={"x": text}, timeout=timeout)
+    res.raise_for_status()
     # The damn thing returns a ton of digits
     # truncating all but one
     return int(float(res.text) * 10) / 10
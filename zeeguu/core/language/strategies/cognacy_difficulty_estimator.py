@@ -2,12 +2,13 @@ from numpy import mean
 from wordstats import Word, WordInfo
 from zeeguu.core import model
 from zeeguu.core.language.difficulty_estimator_strategy import DifficultyEstimatorStrategy
-from zeeguu.core.util.text import split_words_from_text
+from zeeguu.core.language.text_processing import stemmed_words, stemmer
 from zeeguu.core.model import UserWord, Language
-from nltk.stem import SnowballStemmer
 from wordstats.cognate_evaluation import CognateEvaluation
 from wordstats.edit_distance import EditDistance
+from zeeguu.core.language.token_profile import median_difficulties
 from collections import defaultdict, Counter
+from zeeguu.core.language.word_score_tables import load_or_build
 
 from zeeguu.core.constants import WIH_READ_CLICKED, WIH_READ_NOT_CLICKED_IN_SENTENCE, WIH_READ_NOT_CLICKED_OUT_SENTENCE
 
@@ -34,19 +35,31 @@ class CognacyDifficultyEstimator(DifficultyEstimatorStrategy):
 
         estimator = cls(language, user)
 
-        # fetch cognates
-        cognate_info = CognateEvaluation.load_cached(language.code, user.native_language.code, EditDistance)
+        estimator.score_map = cls.cognates_table(language, user.native_language)
 
-        # stem cognates, assign difficulty of 0
-        cognates = cognate_info.whitelist.keys()
-        stemmer = SnowballStemmer(language.name.lower())
+        return estimator
+
+    @classmethod
+    def cognates_table(cls, language: 'model.Language', native_language: 'model.Language'):
+        """
+                :return: the stem => score map of the cognates of the language in the native language;
+                slow to compute, so it's saved in a word score table the first time it's needed
+        """
+        return load_or_build(
+            f"cognates-{language.code}-{native_language.code}",
+            lambda: cls.cognate_scores(language, native_language),
+        )
 
-        cognates = list(set([stemmer.stem(c.lower()) for c in cognates]))
-        words_score = [0 for e in cognates]
+    @classmethod
+    def cognate_scores(cls, language: 'model.Language', native_language: 'model.Language'):
+        # fetch cognates
+        cognate_info = CognateEvaluation.load_cached(language.code, native_language.code, EditDistance)
 
-        estimator.score_map = dict(zip(cognates, words_score))
+        # stem cognates, assign difficulty of 0
+        stem = stemmer(language.code)
 
-        return estimator
+        cognates = set([stem(c.lower()) for c in cognate_info.whitelist.keys()])
+        return {c: 0 for c in cognates}
 
     def estimate_difficulty(self, text: str):
         """
@@ -59,9 +72,7 @@ class CognacyDifficultyEstimator(DifficultyEstimatorStrategy):
         """
 
         # split and stem words
-        words = split_words_from_text(text)
-        stemmer = SnowballStemmer(self.language.name.lower())
-        words = [stemmer.stem(w.lower()) for w in words]
+        words = stemmed_words(text, self.language.code)
 
         # frequency and length
         word_frequency = Counter(words)
@@ -97,6 +108,13 @@ class CognacyDifficultyEstimator(DifficultyEstimatorStrategy):
 
         return difficulty_scores
 
+    def estimate_difficulty_from_profile(self, profile: 'TokenProfile'):
+        """
+        Same as estimate_difficulty, but from the TokenProfile of the text,
+        e.g. the ArticleTokenProfile of an article
+        """
+        return median_difficulties(profile, self.score_vector())
+
     @classmethod
     def discrete_text_difficulty(cls, median_difficulty: float):
         """
@@ -2,12 +2,13 @@ from numpy import mean
 from wordstats import Word, WordInfo
 from zeeguu.core import model
 from zeeguu.core.language.difficulty_estimator_strategy import DifficultyEstimatorStrategy
-from zeeguu.core.util.text import split_words_from_text
+from zeeguu.core.language.text_processing import stemmed_words
 from zeeguu.core.model import UserWord, Language, WordInteractionHistory
-from nltk.stem import SnowballStemmer
 from wordstats.cognate_evaluation import CognateEvaluation
 from wordstats.edit_distance import EditDistance
-from collections import defaultdict, Counter
+from zeeguu.core.language.token_profile import median_difficulties
+from collections import defaultdict, Counter, ChainMap
+from zeeguu.core.language.strategies.cognacy_difficulty_estimator import CognacyDifficultyEstimator
 
 from zeeguu.core.constants import WIH_READ_CLICKED, WIH_READ_NOT_CLICKED_IN_SENTENCE, WIH_READ_NOT_CLICKED_OUT_SENTENCE, \
     WIH_WRONG_EX_TRANSLATE, WIH_WRONG_EX_CHOICE, WIH_WRONG_EX_MATCH
@@ -48,15 +49,10 @@ class CognacyWordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
         # determine cognates first
 
         # fetch cognates
-        cognate_info = CognateEvaluation.load_cached(language.code, user.native_language.code, EditDistance)
+        cognates = CognacyDifficultyEstimator.cognates_table(language, user.native_language)
 
-        cognates = cognate_info.whitelist.keys()
-        stemmer = SnowballStemmer(language.name.lower())
-
-        cognates = list(set([stemmer.stem(c.lower()) for c in cognates]))
-        words_score = [0 for e in cognates]
-
-        estimator.score_map = dict(zip(cognates, words_score))
+        # the scores of the user's words are added on top of the shared table
+        estimator.score_map = ChainMap(dict(), cognates)
 
 
 
@@ -70,7 +66,7 @@ class CognacyWordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
             if wh.word.word in cognates:
                 continue
 
-            history = [event for event in wh.interaction_history if event.seconds_since_epoch <= max_timestamp]
+            history = wh.interaction_history.until(max_timestamp)
 
             if history:
                 words_found.append(wh.word.word)
@@ -119,9 +115,7 @@ class CognacyWordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
         """
 
         # split and stem words
-        words = split_words_from_text(text)
-        stemmer = SnowballStemmer(self.language.name.lower())
-        words = [stemmer.stem(w.lower()) for w in words]
+        words = stemmed_words(text, self.language.code)
 
         # frequency and length
         word_frequency = Counter(words)
@@ -160,6 +154,13 @@ class CognacyWordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
 
 
 
+    def estimate_difficulty_from_profile(self, profile: 'TokenProfile'):
+        """
+        Same as estimate_difficulty, but from the TokenProfile of the text,
+        e.g. the ArticleTokenProfile of an article
+        """
+        return median_difficulties(profile, self.score_vector())
+
     @classmethod
     def discrete_text_difficulty(cls, median_difficulty: float):
         """
@@ -1,13 +1,12 @@
-import nltk
-import pyphen
 from numpy import math
 
 from zeeguu.core.language.difficulty_estimator_strategy import (
     DifficultyEstimatorStrategy,
 )
-from zeeguu.core.util.text import split_words_from_text
+from zeeguu.core.language.sentences import count_sentences
+from zeeguu.core.language.text_processing import tokenize
 from zeeguu.core.model import Language
-from collections import Counter
+from zeeguu.core.language.syllables import syllables_in_word, syllables_in_text
 
 
 class FleschKincaidDifficultyEstimator(DifficultyEstimatorStrategy):
@@ -33,6 +32,27 @@ class FleschKincaidDifficultyEstimator(DifficultyEstimatorStrategy):
         """
         flesch_kincaid_index = cls.flesch_kincaid_readability_index(text, language)
 
+        return cls.difficulty_scores(flesch_kincaid_index)
+
+    @classmethod
+    def estimate_difficulty_from_profile(
+        cls, profile: "TokenProfile", language: "Language", user: "User"
+    ):
+        """
+        Same as estimate_difficulty, but from the counts of a TokenProfile
+        of the text, e.g. the ArticleTokenProfile of an article
+        """
+        flesch_kincaid_index = cls.index_from_counts(
+            profile.token_count,
+            profile.sentence_count,
+            profile.syllable_count,
+            language,
+        )
+
+        return cls.difficulty_scores(flesch_kincaid_index)
+
+    @classmethod
+    def difficulty_scores(cls, flesch_kincaid_index):
         difficulty_scores = dict(
             normalized=cls.normalize_difficulty(flesch_kincaid_index),
             discrete=cls.discrete_difficulty(flesch_kincaid_index),
@@ -43,18 +63,21 @@ class FleschKincaidDifficultyEstimator(DifficultyEstimatorStrategy):
 
     @classmethod
     def flesch_kincaid_readability_index(cls, text: str, language: "Language"):
-        words = [w.lower() for w in split_words_from_text(text)]
+        words = [w.lower() for w in tokenize(text)]
 
-        number_of_syllables = 0
         number_of_words = len(words)
-        for word, freq in Counter(words).items():
-            syllables_in_word = cls.estimate_number_of_syllables_in_word_pyphen(
-                word, language
-            )
-            number_of_syllables += syllables_in_word * freq
+        number_of_syllables = syllables_in_text(words, language.code)
 
-        number_of_sentences = len(nltk.sent_tokenize(text))
+        number_of_sentences = count_sentences(text, language.code)
+
+        return cls.index_from_counts(
+            number_of_words, number_of_sentences, number_of_syllables, language
+        )
 
+    @classmethod
+    def index_from_counts(
+        cls, number_of_words, number_of_sentences, number_of_syllables, language
+    ):
         constants = cls.get_constants_for_language(language)
 
         try:
@@ -87,19 +110,7 @@ class FleschKincaidDifficultyEstimator(DifficultyEstimatorStrategy):
     def estimate_number_of_syllables_in_word_pyphen(
         cls, word: str, language: "Language"
     ):
-
-        if language.code == "zh-CN":
-            if len(word) < cls.AVERAGE_SYLLABLE_LENGTH:
-                syllables = 1  # Always at least 1 syllable
-            else:
-                syllables = len(word) / cls.AVERAGE_SYLLABLE_LENGTH
-            return int(math.floor(syllables))  # Truncate the number of syllables
-        else:
-            # pyphen can't hyphenate on 'no' - so we use 'nb' instead
-            code = 'nb' if language.code == 'no' else language.code
-            dic = pyphen.Pyphen(lang=code)
-            syllables = len(dic.positions(word)) + 1
-            return syllables
+        return syllables_in_word(word, language.code)
 
     @classmethod
     def normalize_difficulty(cls, score: int):
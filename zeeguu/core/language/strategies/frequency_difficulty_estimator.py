@@ -1,10 +1,12 @@
-from nltk import SnowballStemmer
 from wordstats import Word, WordInfo
 from zeeguu.core import model
 from zeeguu.core.language.difficulty_estimator_strategy import DifficultyEstimatorStrategy
-from zeeguu.core.util.text import split_words_from_text
+from zeeguu.core.language.text_processing import stemmed_words, stemmer
+from zeeguu.core.language.word_score_tables import load_or_build
+from zeeguu.core.language.token_profile import weighted_word_scores
 from wordstats.file_handling.loading_from_hermit import *
 from collections import defaultdict
+import numpy
 
 class FrequencyDifficultyEstimator(DifficultyEstimatorStrategy):
 
@@ -35,27 +37,38 @@ class FrequencyDifficultyEstimator(DifficultyEstimatorStrategy):
 
         estimator = cls(language)
 
+        estimator.score_map = load_or_build(
+            f"frequency-{language.code}", lambda: cls.frequency_scores(language)
+        )
+
+        return estimator
+
+    @classmethod
+    def frequency_scores(cls, language: 'model.Language'):
+        """
+                Computes the stem => score map from the frequency list of the language;
+                slow, so it's saved in a word score table the first time it's needed
+        """
+
         freq_list = load_language_from_hermit(language.code)
 
         word_dict = dict()
         for k,v in freq_list.word_info_dict.items():
             word_dict[k] = v.frequency
 
-        stemmer = SnowballStemmer(language.name.lower())
+        stem = stemmer(language.code)
 
         score_map = defaultdict(int)
 
         for k, v in word_dict.items():
-            score_map[stemmer.stem(k.lower())] += v
+            score_map[stem(k.lower())] += v
 
         max_freq = max(score_map.values())
 
         for k in score_map.keys():
             score_map[k] = (1 - score_map[k] / max_freq)**0.5
 
-        estimator.score_map = score_map
-
-        return estimator
+        return score_map
 
     def estimate_difficulty(self, text: str):
         """
@@ -69,10 +82,7 @@ class FrequencyDifficultyEstimator(DifficultyEstimatorStrategy):
                     discrete: string [EASY, MEDIUM, HARD]
         """
         # Calculate difficulty for each word
-        words = split_words_from_text(text)
-
-        stemmer = SnowballStemmer(self.language.name.lower())
-        words = [stemmer.stem(w.lower()) for w in words]
+        words = stemmed_words(text, self.language.code)
 
         words_freq = defaultdict(int)
         total_words = 0
@@ -104,6 +114,25 @@ class FrequencyDifficultyEstimator(DifficultyEstimatorStrategy):
 
         return difficulty_scores
 
+    def estimate_difficulty_from_profile(self, profile: 'TokenProfile'):
+        """
+        Same as estimate_difficulty, but from the TokenProfile of the text,
+        e.g. the ArticleTokenProfile of an article
+        """
+        if len(profile.stem_ids) == 0:
+            return dict(normalized=1.00, discrete="HARD")
+
+        scores, counts = weighted_word_scores(profile, self.score_vector())
+        word_scores = numpy.sort(scores * counts / counts.sum())
+
+        center = int(round(len(word_scores) / 2, 0))
+        difficulty_median = word_scores[center]
+
+        return dict(
+            normalized=float(word_scores.sum()),
+            discrete=self.discrete_text_difficulty(difficulty_median)
+        )
+
     @classmethod
     def discrete_text_difficulty(cls, median_difficulty: float):
         """
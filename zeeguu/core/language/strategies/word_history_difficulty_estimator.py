@@ -2,10 +2,10 @@ from numpy import mean
 from wordstats import Word, WordInfo
 from zeeguu.core import model
 from zeeguu.core.language.difficulty_estimator_strategy import DifficultyEstimatorStrategy
-from zeeguu.core.util.text import split_words_from_text
+from zeeguu.core.language.text_processing import stemmed_words
 from zeeguu.core.model.word_knowledge.word_interaction_history import WordInteractionHistory
 from zeeguu.core.model import UserWord, Language
-from nltk.stem import SnowballStemmer
+from zeeguu.core.language.token_profile import median_difficulties
 from collections import defaultdict, Counter
 
 from zeeguu.core.constants import WIH_READ_CLICKED, WIH_READ_NOT_CLICKED_IN_SENTENCE, WIH_READ_NOT_CLICKED_OUT_SENTENCE, WIH_WRONG_EX_RECOGNIZE,\
@@ -43,15 +43,8 @@ class WordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
         estimator = cls(language, user)
 
         # determine word scores
-        words_history = WordInteractionHistory.find_all_word_histories_for_user_language(user, language)
-        words_found = [w.word.word for w in words_history]
-        event_history = [w.interaction_history for w in words_history]
-
-
-
-        words_score = [0 for e in event_history]
-
-        estimator.score_map = dict(zip(words_found, words_score))
+        knowledge = WordInteractionHistory.knowledge_map(user, language)
+        estimator.score_map = {word: 0 for word in knowledge}
 
         return estimator
 
@@ -74,7 +67,7 @@ class WordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
         words_found = []
         event_history = []
         for wh in words_history:
-            history = [event for event in wh.interaction_history if event.seconds_since_epoch <= max_timestamp]
+            history = wh.interaction_history.until(max_timestamp)
 
             if len(history) > 0:
                 words_found.append(wh.word.word)
@@ -99,6 +92,23 @@ class WordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
 
         estimator = cls(language, user)
 
+        if mode in (1, 2):
+            # the summary of the histories is enough for these
+            knowledge = WordInteractionHistory.knowledge_map(user, language)
+            if mode == 1:
+                # the seen counts used to be computed over the list of histories
+                # instead of the events of the word, and were thus always 0
+                estimator.score_map = {
+                    word: 0 if k.event_count > 10 else 1
+                    for word, k in knowledge.items()
+                }
+            else:
+                estimator.score_map = {
+                    word: max(1 - k.event_count / 10, 0)
+                    for word, k in knowledge.items()
+                }
+            return estimator
+
         # determine word scores
         words_history = WordInteractionHistory.find_all_word_histories_for_user_language(user, language)
 
@@ -107,25 +117,7 @@ class WordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
 
         words_score = []
 
-        if mode == 1:
-
-            for e in event_history:
-                if len(e) > 10:
-                    words_score.append(0)
-                else:
-                    N_seen_context = sum([event == WIH_READ_NOT_CLICKED_IN_SENTENCE for event in event_history])
-                    N_seen = sum([event == WIH_READ_NOT_CLICKED_OUT_SENTENCE for event in event_history])
-                    # N_clicked = sum([event == WIH_READ_CLICKED for event in event_history])
-
-                    if N_seen_context > 3 or N_seen > 6:
-                        words_score.append(0)
-                    else:
-                        words_score.append(min(1 - N_seen_context / 4, 1 - N_seen / 7))
-        elif mode == 2:
-            for e in event_history:
-                words_score.append(max(1 - len(e)/10,0))
-
-        elif mode == 3:
+        if mode == 3:
             length = 0
             for e in event_history[::-1]:
                 if e is not WIH_READ_CLICKED or e is not WIH_WRONG_EX_CHOICE or e is not WIH_WRONG_EX_MATCH or e is not WIH_WRONG_EX_RECOGNIZE or\
@@ -156,7 +148,7 @@ class WordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
         words_found = []
         event_history = []
         for wh in words_history:
-            history = [event for event in wh.interaction_history if event.seconds_since_epoch <= max_timestamp]
+            history = wh.interaction_history.until(max_timestamp)
 
             if history:
                 words_found.append(wh.word.word)
@@ -203,9 +195,7 @@ class WordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
         """
 
         # Calculate difficulty for each word
-        words = split_words_from_text(text)
-        stemmer = SnowballStemmer(self.language.name.lower())
-        words = [stemmer.stem(w.lower()) for w in words]
+        words = stemmed_words(text, self.language.code)
 
         # frequency and length
         word_frequency = Counter(words)
@@ -245,6 +235,13 @@ class WordHistoryDifficultyEstimator(DifficultyEstimatorStrategy):
 
         return difficulty_scores
 
+    def estimate_difficulty_from_profile(self, profile: 'TokenProfile'):
+        """
+        Same as estimate_difficulty, but from the TokenProfile of the text,
+        e.g. the ArticleTokenProfile of an article
+        """
+        return median_difficulties(profile, self.score_vector())
+
     @classmethod
     def discrete_text_difficulty(cls, median_difficulty: float):
         """
@@ -2,6 +2,7 @@ import string
 
 from zeeguu.core import model
 from zeeguu.core.language.difficulty_estimator_strategy import DifficultyEstimatorStrategy
+from zeeguu.core.language.sentences import count_sentences_fast, sentences as split_sentences
 import nltk
 import math
 import re
@@ -48,7 +49,7 @@ class WordRankDifficultyEstimator(DifficultyEstimatorStrategy):
         #detect and remove proper nouns
         if 1 == 0:
             words = []
-            sentences = nltk.sent_tokenize(text)
+            sentences = split_sentences(text, language.code)
             for s in sentences:
                 # print(s)
                 tokens = nltk.word_tokenize(s)
@@ -79,7 +80,7 @@ class WordRankDifficultyEstimator(DifficultyEstimatorStrategy):
 
         number_of_words = len(words)
 
-        number_of_sentences = len(nltk.sent_tokenize(text))
+        number_of_sentences = count_sentences_fast(text)
 
         constants = cls.get_constants_for_language(language);
 
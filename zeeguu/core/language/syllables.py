@@ -0,0 +1,81 @@
+"""
+
+    Counting the syllables of words with the pyphen hyphenation
+    dictionaries. Both creating a Pyphen object and hyphenating
+    a word are expensive, so there is only one Pyphen object per
+    language and the syllable counts of the most recently seen
+    words are cached.
+
+"""
+
+import math
+from collections import Counter
+from functools import lru_cache
+
+import pyphen
+
+# languages for which we don't have a hyphenation dictionary
+# use the average length of a syllable instead
+AVERAGE_SYLLABLE_LENGTH = 2.5
+LANGUAGES_WITHOUT_HYPHENATION = ["zh-CN"]
+
+# pyphen can't hyphenate on 'no' - so we use 'nb' instead
+PYPHEN_LANGUAGE_CODES = {"no": "nb"}
+
+CACHED_SYLLABLE_COUNTS = 200000
+
+_hyphenators = {}
+
+
+def hyphenator(language_code):
+    if language_code not in _hyphenators:
+        _hyphenators[language_code] = pyphen.Pyphen(
+            lang=PYPHEN_LANGUAGE_CODES.get(language_code, language_code)
+        )
+    return _hyphenators[language_code]
+
+
+def _estimated_syllables(word):
+    # always at least one syllable
+    return int(math.floor(max(len(word) / AVERAGE_SYLLABLE_LENGTH, 1)))
+
+
+@lru_cache(maxsize=CACHED_SYLLABLE_COUNTS)
+def syllables_in_word(word, language_code):
+    if language_code in LANGUAGES_WITHOUT_HYPHENATION:
+        return _estimated_syllables(word)
+
+    return len(hyphenator(language_code).positions(word)) + 1
+
+
+def syllables_in_text(words, language_code):
+    """
+    :param words: the lowercase words of a text
+    :return: the total number of syllables in the words
+    """
+    return sum(
+        syllables_in_word(word, language_code) * freq
+        for word, freq in Counter(words).items()
+    )
+
+
+def preload_frequent_words(language_code, how_many=10000):
+    """
+    Fills the cache with the syllable counts of the most frequent
+    words of the language, e.g. before estimating the difficulty of
+    many texts; has no effect if there's no frequency list
+    """
+    try:
+        from wordstats.file_handling.loading_from_hermit import (
+            load_language_from_hermit,
+        )
+
+        word_infos = load_language_from_hermit(language_code).word_info_dict
+    except Exception:
+        return
+
+    most_frequent = sorted(
+        word_infos.items(), key=lambda item: -item[1].frequency
+    )[:how_many]
+    for word, _ in most_frequent:
+        syllables_in_word(word.lower(), language_code)
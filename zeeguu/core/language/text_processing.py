@@ -0,0 +1,78 @@
+"""
+
+    Tokenizing and stemming, shared by the difficulty estimators,
+    the token profiles and the tools that go through many texts.
+
+    There is one stemmer per language (creating a SnowballStemmer
+    is not cheap) and the stems of the most recently seen words
+    are cached, since the same words come again and again.
+
+    Where many stems are kept (token profiles, word score tables)
+    they are identified by a 64 bit hash, their stem id.
+
+"""
+
+from functools import lru_cache
+from hashlib import blake2b
+
+import numpy
+import regex
+from nltk import SnowballStemmer
+
+WORD_PATTERN = regex.compile(r"(\b\p{L}+\b)")
+
+CACHED_STEMS = 200000
+
+# to increase whenever the stems change; the word score tables that
+# were built with other stems are then rebuilt
+STEMMING_VERSION = 2
+
+_stemmers = {}
+
+
+def tokenize(text: str):
+    """
+    :return: the list of the words of the text
+    """
+    return WORD_PATTERN.findall(text)
+
+
+def stemmer(language_code: str):
+    """
+    :return: a function that stems the words of the language;
+    for the languages without a stemmer the words are their own stems
+    """
+    if language_code not in _stemmers:
+        from zeeguu.core.model.language import Language
+
+        try:
+            name = Language.LANGUAGE_NAMES[language_code].lower()
+            _stemmers[language_code] = SnowballStemmer(name).stem
+        except (KeyError, ValueError):
+            _stemmers[language_code] = lambda word: word
+
+    return _stemmers[language_code]
+
+
+@lru_cache(maxsize=CACHED_STEMS)
+def stem(word: str, language_code: str):
+    return stemmer(language_code)(word)
+
+
+def stems(words, language_code: str):
+    """
+    :return: the stems of the lowercased words
+    """
+    return [stem(w.lower(), language_code) for w in words]
+
+
+def stemmed_words(text: str, language_code: str):
+    return stems(tokenize(text), language_code)
+
+
+def stem_id(stem: str) -> int:
+    return int.from_bytes(blake2b(stem.encode("utf8"), digest_size=8).digest(), "big")
+
+
+def stem_ids(stems):
+    return numpy.array([stem_id(stem) for stem in stems], dtype=numpy.uint64)
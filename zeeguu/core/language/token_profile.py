@@ -0,0 +1,195 @@
+"""
+
+    The counts that the difficulty estimators need about a text:
+    sentences, tokens, syllables, and how often every stem occurs.
+    Computed once per article (see ArticleTokenProfile) such that
+    estimating the difficulty of an article for a user does not
+    need to tokenize, stem or hyphenate the text again.
+
+    The stems are identified by a 64 bit hash; the stem ids of a
+    profile are sorted, so the scores of a user or language for
+    them can be looked up with numpy.searchsorted.
+
+    Long texts (e.g. uploaded books) are profiled chunk by chunk;
+    only the counts are kept, never the words of the whole text.
+
+"""
+
+from collections import Counter, ChainMap
+
+import numpy
+
+from zeeguu.core.language.sentences import count_sentences
+from zeeguu.core.language.syllables import syllables_in_text
+from zeeguu.core.language.text_processing import tokenize, stem, stem_ids
+from zeeguu.core.language.word_score_tables import WordScoreTable
+
+# the score of a stem which is not in the score map
+UNKNOWN_STEM_SCORE = 1.0
+
+# characters per chunk when profiling a text
+CHUNK_SIZE = 20000
+
+PARAGRAPH_ENDS = ["\n\n"]
+SENTENCE_ENDS = [". ", "! ", "? ", ".\n", "!\n", "?\n"]
+WORD_ENDS = [" ", "\n"]
+
+
+class TokenProfile(object):
+    def __init__(
+        self, sentence_count, token_count, syllable_count, stem_ids, stem_counts
+    ):
+        self.sentence_count = sentence_count
+        self.token_count = token_count
+        self.syllable_count = syllable_count
+        self.stem_ids = stem_ids
+        self.stem_counts = stem_counts
+
+    @classmethod
+    def from_text(cls, text: str, language_code: str):
+        return cls.from_chunks(text_chunks(text), language_code)
+
+    @classmethod
+    def from_chunks(cls, chunks, language_code: str):
+        """
+        :param chunks: consecutive pieces of a text, cut between words
+        and preferably between sentences; see text_chunks
+        """
+        sentence_count = 0
+        token_count = 0
+        syllable_count = 0
+        stem_counts = Counter()
+
+        for chunk in chunks:
+            words = [w.lower() for w in tokenize(chunk)]
+            if not words:
+                continue
+
+            sentence_count += count_sentences(chunk, language_code)
+            token_count += len(words)
+            syllable_count += syllables_in_text(words, language_code)
+            for word, count in Counter(words).items():
+                stem_counts[stem(word, language_code)] += count
+
+        ids = stem_ids(stem_counts.keys())
+        counts = numpy.array(list(stem_counts.values()), dtype=numpy.uint32)
+        order = numpy.argsort(ids)
+
+        return cls(sentence_count, token_count, syllable_count, ids[order], counts[order])
+
+
+def text_chunks(text: str, chunk_size=CHUNK_SIZE):
+    """
+    Yields consecutive pieces of about chunk_size characters of the
+    text; cut at the end of a paragraph, or else of a sentence, or
+    else of a word, such that the counts of the pieces add up to
+    those of the whole text
+    """
+    start = 0
+    while len(text) - start > chunk_size:
+        end = _cut(text, start, start + chunk_size)
+        yield text[start:end]
+        start = end
+
+    if start < len(text):
+        yield text[start:]
+
+
+def _cut(text, start, end):
+    for separators in [PARAGRAPH_ENDS, SENTENCE_ENDS, WORD_ENDS]:
+        cut = max(text.rfind(each, start, end) + len(each) for each in separators)
+        if cut > start + len(separators[0]):
+            return cut
+
+    # one very long word
+    return end
+
+
+class ScoreVector(object):
+    """
+    A stem -> score map as two sorted arrays; built once per
+    estimator and then used for the profiles of many texts
+    """
+
+    def __init__(self, ids, scores, ids_are_sorted=False):
+        if not ids_are_sorted:
+            order = numpy.argsort(ids, kind="stable")
+            ids = ids[order]
+            scores = scores[order]
+        self.ids = ids
+        self.scores = scores
+
+    @classmethod
+    def from_score_map(cls, score_map):
+        if isinstance(score_map, ChainMap):
+            # the first map has priority; the later ones are the defaults
+            vectors = [cls.from_score_map(each) for each in reversed(score_map.maps)]
+            ids = numpy.concatenate([v.ids for v in vectors])
+            scores = numpy.concatenate([v.scores for v in vectors])
+            # keep the last occurrence of every id
+            reversed_ids = ids[::-1]
+            _, first = numpy.unique(reversed_ids, return_index=True)
+            keep = len(ids) - 1 - first
+            return cls(ids[keep], scores[keep])
+
+        if isinstance(score_map, WordScoreTable):
+            # the mapped arrays of the table; nothing is copied or hashed
+            return cls(score_map.ids, score_map.scores, ids_are_sorted=True)
+
+        return cls(
+            stem_ids(score_map.keys()),
+            numpy.array(list(score_map.values()), dtype=numpy.float64),
+        )
+
+    def scores_for(self, ids):
+        """
+        :return: the score of every id; UNKNOWN_STEM_SCORE for the missing ones
+        """
+        if len(self.ids) == 0:
+            return numpy.full(len(ids), UNKNOWN_STEM_SCORE)
+
+        positions = numpy.searchsorted(self.ids, ids)
+        positions[positions == len(self.ids)] = 0
+        found = self.ids[positions] == ids
+        return numpy.where(found, self.scores[positions], UNKNOWN_STEM_SCORE)
+
+
+def weighted_word_scores(profile, score_vector):
+    """
+    :return: the score of every stem of the profile, and how often it occurs
+    """
+    return score_vector.scores_for(profile.stem_ids), profile.stem_counts.astype(
+        numpy.float64
+    )
+
+
+def median_difficulties(profile, score_vector):
+    """
+    The difficulties that the score map estimators (word history, cognacy)
+    compute from the scores of the stems of a text
+    """
+    if len(profile.stem_ids) == 0:
+        return dict(
+            median=1.0,
+            median_unique=1.0,
+            normalized=1.0,
+            discrete="HARD",
+            unique_ratio=1.0,
+        )
+
+    scores, counts = weighted_word_scores(profile, score_vector)
+
+    # stems above the median score
+    order = numpy.argsort(scores, kind="stable")
+    center = int(round(len(scores) / 2, 0))
+    above_median = order[center:]
+
+    return dict(
+        median=float(
+            (scores[above_median] * counts[above_median]).sum()
+            / counts[above_median].sum()
+        ),
+        median_unique=float(scores[above_median].mean()),
+        normalized=float((scores * counts).sum() / counts.sum()),
+        unique_ratio=float(scores.mean()),
+    )
@@ -0,0 +1,177 @@
+"""
+
+    Some estimators need a score for every stem of a language (e.g.
+    how frequent it is, or whether it's a cognate in the native
+    language of the learner). Computing these maps takes seconds, so
+    they are computed once (see tools/build_word_score_tables.py) and
+    saved in a compact binary file that is memory-mapped on load:
+    loading is instant and all the processes share the same pages.
+
+    The tables are saved in ZEEGUU_WORD_SCORE_TABLES_FOLDER, or in the
+    word_score_tables folder of ZEEGUU_DATA_FOLDER. When neither is
+    configured, the maps are computed by every process and kept in
+    memory. The name of a table file includes the version of the file
+    format and of the stemming, such that a table that was built with
+    other stems is not used, but rebuilt.
+
+    The stems are looked up by their stem id (see text_processing):
+    a binary search in the sorted ids, on the mapped pages, such that
+    a process does not keep a copy of the table; the token profiles
+    use the same ids, so the table is also their score vector as is.
+
+    File layout (little endian, like the machines we run on):
+        magic, count (uint64), blob size (uint64)
+        stem ids (uint64 * count), sorted
+        scores (float32 * count), in the order of the ids
+        offsets (uint32 * (count + 1)) of every stem in the blob
+        blob: the utf-8 encoded stems, in the order of the ids
+
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy
+
+from zeeguu.core import warning
+from zeeguu.core.language import text_processing
+from zeeguu.core.language.text_processing import stem_id, stem_ids
+
+FORMAT_VERSION = 2
+MAGIC = b"ZWSCORE" + str(FORMAT_VERSION).encode()
+HEADER_SIZE = len(MAGIC) + 16
+
+
+def _configured_folder():
+    if os.environ.get("ZEEGUU_WORD_SCORE_TABLES_FOLDER"):
+        return os.environ["ZEEGUU_WORD_SCORE_TABLES_FOLDER"]
+    if os.environ.get("ZEEGUU_DATA_FOLDER"):
+        return os.path.join(os.environ["ZEEGUU_DATA_FOLDER"], "word_score_tables")
+    return None
+
+
+# None when not configured
+WORD_SCORE_TABLES_FOLDER = _configured_folder()
+
+# tables that are already mapped in this process
+_loaded_tables = {}
+
+
+class WordScoreTable(Mapping):
+    """
+    A read-only stem -> score dictionary backed by a memory-mapped file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.data[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a word score table: {path}")
+
+        count, _blob_size = struct.unpack_from("<QQ", self.data, len(MAGIC))
+        self.count = count
+
+        ids_start = HEADER_SIZE
+        scores_start = ids_start + 8 * count
+        offsets_start = scores_start + 4 * count
+        self.blob_start = offsets_start + 4 * (count + 1)
+
+        # views on the mapped pages; nothing is copied
+        self.ids = numpy.frombuffer(self.data, "<u8", count, ids_start)
+        self.scores = numpy.frombuffer(self.data, "<f4", count, scores_start)
+        self.offsets = numpy.frombuffer(self.data, "<u4", count + 1, offsets_start)
+
+    def _stem(self, i):
+        return self.data[
+            self.blob_start + self.offsets[i] : self.blob_start + self.offsets[i + 1]
+        ]
+
+    def _index(self, stem):
+        key = numpy.uint64(stem_id(stem))
+        i = int(numpy.searchsorted(self.ids, key))
+        if i < self.count and self.ids[i] == key:
+            return i
+        return None
+
+    def __getitem__(self, stem):
+        i = self._index(stem)
+        if i is None:
+            raise KeyError(stem)
+        return float(self.scores[i])
+
+    def __contains__(self, stem):
+        return self._index(stem) is not None
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self._stem(i).decode("utf8")
+
+    @classmethod
+    def write(cls, path, score_map):
+        """
+        Saves the stem -> score map; the file is written next to the
+        target and then renamed, such that readers never see half of it
+        """
+        stems = list(score_map.keys())
+        ids = stem_ids(stems)
+        order = numpy.argsort(ids, kind="stable")
+
+        encoded = [stems[i].encode("utf8") for i in order]
+        offsets = numpy.zeros(len(stems) + 1, dtype="<u4")
+        offsets[1:] = numpy.cumsum([len(stem) for stem in encoded])
+        scores = numpy.array([score_map[stems[i]] for i in order], dtype="<f4")
+        blob = b"".join(encoded)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(numpy.array([len(stems), len(blob)], dtype="<u8").tobytes())
+            f.write(ids[order].astype("<u8").tobytes())
+            f.write(scores.tobytes())
+            f.write(offsets.tobytes())
+            f.write(blob)
+        os.replace(temporary_path, path)
+
+
+def table_path(name):
+    """
+    :return: the path of the table, or None if there is no folder
+    configured for the tables
+    """
+    if not WORD_SCORE_TABLES_FOLDER:
+        return None
+
+    version = f"v{FORMAT_VERSION}-s{text_processing.STEMMING_VERSION}"
+    return os.path.join(WORD_SCORE_TABLES_FOLDER, f"{name}.{version}.scores")
+
+
+def load_or_build(name, build):
+    """
+    :param name: e.g. frequency-de, or cognates-de-en
+    :param build: function that computes the stem -> score map
+    if the table was not built yet
+    :return: the table; or the map itself, when there is no folder
+    configured for the tables
+    """
+    if name not in _loaded_tables:
+        path = table_path(name)
+        if not path:
+            warning(
+                f"No folder configured for the word score tables; computing {name}"
+            )
+            # a plain dict, that does not change when it's read, like the tables
+            _loaded_tables[name] = dict(build())
+        else:
+            if not os.path.exists(path):
+                WordScoreTable.write(path, build())
+            _loaded_tables[name] = WordScoreTable(path)
+
+    return _loaded_tables[name]
@@ -33,6 +33,7 @@ from .language import Language
 from .url import Url
 from .domain_name import DomainName
 from .article import Article
+from .article_token_profile import ArticleTokenProfile
 from .bookmark import Bookmark
 from .text import Text
 from .user import User
@@ -41,6 +42,7 @@ from .user_preference import UserPreference
 from .session import Session
 from .unique_code import UniqueCode
 from .word_knowledge.word_interaction_history import WordInteractionHistory
+from .word_knowledge.word_history_watermark import WordHistoryWatermark
 
 from .user_language import UserLanguage
 
@@ -51,6 +53,7 @@ from .articles_cache import ArticlesCache
 from .article_difficulty_feedback import ArticleDifficultyFeedback
 
 from .feed import RSSFeed
+from .feed_crawl_run import FeedCrawlRun
 
 from .topic import Topic
 from .topic_subscription import TopicSubscription
@@ -107,10 +110,13 @@ zeeguu.core.warning("*** ==== ZEEGUU CORE: Linked model with: " + anon_conn_stri
 # and when that is detected, the configuration of the system is set to
 # testing... and it does not configure the model with the right db
 import nltk
+from zeeguu.core.language.sentences import punkt_resource
 
 try:
     nltk.data.path.append("/var/www/nltk_data")
-    nltk.sent_tokenize("I am a berliner.")
+    # only check that punkt is installed; the models of the
+    # languages are loaded when needed, see language/sentences.py
+    nltk.data.find(f"tokenizers/{punkt_resource()}")
 except LookupError as e:
-    nltk.download("punkt")
+    nltk.download(punkt_resource())
     nltk.download("averaged_perceptron_tagger")
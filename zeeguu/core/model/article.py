@@ -5,7 +5,16 @@ import time
 
 import sqlalchemy
 from langdetect import detect
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UnicodeText, Table
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    ForeignKey,
+    DateTime,
+    UnicodeText,
+    Table,
+)
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.orm.exc import NoResultFound
 
@@ -64,6 +73,10 @@ class Article(db.Model):
     deleted = Column(Integer)
     video = Column(Integer)
 
+    # SimHash of the content; used to detect the near duplicates
+    # (e.g. the same wire story published by multiple feeds)
+    content_fingerprint = Column(BigInteger)
+
     from zeeguu.core.model.url import Url
 
     from zeeguu.core.model.feed import RSSFeed
@@ -96,6 +109,10 @@ class Article(db.Model):
     # has only the first paragraph available
     MINIMUM_WORD_COUNT = 90
 
+    # The difficulty of longer uploaded texts is estimated in the
+    # background, such that the upload request returns right away
+    MAX_CHARS_FOR_INLINE_DIFFICULTY = 100000
+
     def __init__(
         self,
         url,
@@ -112,6 +129,9 @@ class Article(db.Model):
         broken=0,
         deleted=0,
         video=0,
+        fk_difficulty=None,  # when already estimated, e.g. by the crawler's parse workers
+        token_profile=None,  # idem
+        estimate_difficulty=True,  # False when done later by estimate_difficulty_later
     ):
 
         if not summary:
@@ -134,14 +154,9 @@ class Article(db.Model):
 
         self.convertHTML2TextIfNeeded()
 
-        fk_estimator = DifficultyEstimatorFactory.get_difficulty_estimator("fk")
-        fk_difficulty = fk_estimator.estimate_difficulty(
-            self.content, self.language, None
-        )["grade"]
+        if estimate_difficulty:
+            self.estimate_difficulty(token_profile, fk_difficulty)
 
-        # easier to store integer in the DB
-        # otherwise we have to use Decimal, and it's not supported on all dbs
-        self.fk_difficulty = fk_difficulty
         self.word_count = len(self.content.split())
 
     def __repr__(self):
@@ -180,13 +195,49 @@ class Article(db.Model):
 
         self.summary = content[:MAX_CHAR_COUNT_IN_SUMMARY]
 
-        fk_estimator = DifficultyEstimatorFactory.get_difficulty_estimator("fk")
-        fk_difficulty = fk_estimator.estimate_difficulty(
-            self.content, self.language, None
-        )["grade"]
+        self.estimate_difficulty()
+        self.word_count = len(self.content.split())
+
+    def estimate_difficulty(self, token_profile=None, fk_difficulty=None):
+        self.update_token_profile(token_profile)
+
+        if fk_difficulty is None:
+            fk_difficulty = self.fk_difficulty_from_token_profile()
 
+        # easier to store integer in the DB
+        # otherwise we have to use Decimal, and it's not supported on all dbs
         self.fk_difficulty = fk_difficulty
-        self.word_count = len(self.content.split())
+
+    @classmethod
+    def estimate_difficulty_inline(cls, content, htmlContent=None):
+        """
+        :return: False if the text is so long that its difficulty
+        should rather be estimated in the background
+        """
+        return len(content or htmlContent or "") <= cls.MAX_CHARS_FOR_INLINE_DIFFICULTY
+
+    def update_token_profile(self, token_profile=None):
+        """
+        The counts of tokens, syllables, and stems that the difficulty
+        estimators need; see ArticleTokenProfile
+        """
+        from zeeguu.core.language.token_profile import TokenProfile
+        from zeeguu.core.model.article_token_profile import ArticleTokenProfile
+
+        token_profile = token_profile or TokenProfile.from_text(
+            self.content, self.language.code
+        )
+
+        if self.token_profile:
+            self.token_profile.update(token_profile)
+        else:
+            ArticleTokenProfile(self, token_profile)
+
+    def fk_difficulty_from_token_profile(self):
+        fk_estimator = DifficultyEstimatorFactory.get_difficulty_estimator("fk")
+        return fk_estimator.estimate_difficulty_from_profile(
+            self.token_profile, self.language, None
+        )["grade"]
 
     def article_info(self, with_content=False):
         """
@@ -208,7 +259,11 @@ class Article(db.Model):
             topics=self.topics_as_string(),
             video=self.video,
             metrics=dict(
-                difficulty=self.fk_difficulty / 100, word_count=self.word_count
+                # None while estimated in the background
+                difficulty=self.fk_difficulty / 100
+                if self.fk_difficulty is not None
+                else None,
+                word_count=self.word_count,
             ),
         )
 
@@ -285,6 +340,14 @@ class Article(db.Model):
 
     @classmethod
     def create_clone(cls, session, source, uploader):
+        from zeeguu.core.language.background_difficulty import (
+            estimate_difficulty_later,
+        )
+
+        # the same text; no need to estimate it again
+        estimated = source.token_profile is not None and source.fk_difficulty is not None
+        inline = estimated or cls.estimate_difficulty_inline(source.content, source.htmlContent)
+
         # TODO: Why does this NOP the url?
         current_time = datetime.now()
         new_article = Article(
@@ -298,16 +361,27 @@ class Article(db.Model):
             source.language,
             source.htmlContent,
             uploader,
+            fk_difficulty=source.fk_difficulty if estimated else None,
+            token_profile=source.token_profile if estimated else None,
+            estimate_difficulty=inline,
         )
         session.add(new_article)
 
         session.commit()
+
+        if not inline:
+            estimate_difficulty_later(new_article.id)
         return new_article.id
 
     @classmethod
     def create_from_upload(
         cls, session, title, content, htmlContent, uploader, language
     ):
+        from zeeguu.core.language.background_difficulty import (
+            estimate_difficulty_later,
+        )
+
+        inline = cls.estimate_difficulty_inline(content, htmlContent)
 
         current_time = datetime.now()
         new_article = Article(
@@ -321,10 +395,14 @@ class Article(db.Model):
             language,
             htmlContent,
             uploader,
+            estimate_difficulty=inline,
         )
         session.add(new_article)
 
         session.commit()
+
+        if not inline:
+            estimate_difficulty_later(new_article.id)
         return new_article.id
 
     @classmethod
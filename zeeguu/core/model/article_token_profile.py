@@ -0,0 +1,76 @@
+import numpy
+from sqlalchemy import Column, Integer, ForeignKey, LargeBinary
+from sqlalchemy.orm import relationship, backref
+
+import zeeguu.core
+from zeeguu.core.language.token_profile import TokenProfile
+from zeeguu.core.model.article import Article
+
+db = zeeguu.core.db
+
+# MEDIUMBLOB in MySQL; a BLOB is too small for the stems of long articles
+MAX_STEMS_SIZE = 2 ** 24 - 1
+
+
+class ArticleTokenProfile(db.Model):
+    """
+
+    The TokenProfile of the content of an article; computed when
+    the article is created or updated, such that the difficulty
+    estimators don't need to go through the text again.
+
+    The stem ids (uint64) and their counts (uint32) are stored
+    as the bytes of their numpy arrays.
+
+    """
+
+    __table_args__ = {"mysql_collate": "utf8_bin"}
+    __tablename__ = "article_token_profile"
+
+    article_id = Column(Integer, ForeignKey(Article.id), primary_key=True)
+    article = relationship(
+        Article,
+        backref=backref(
+            "token_profile", uselist=False, cascade="all, delete-orphan"
+        ),
+    )
+
+    sentence_count = Column(Integer)
+    token_count = Column(Integer)
+    syllable_count = Column(Integer)
+
+    stem_ids_data = Column(LargeBinary(MAX_STEMS_SIZE))
+    stem_counts_data = Column(LargeBinary(MAX_STEMS_SIZE))
+
+    def __init__(self, article, profile: TokenProfile):
+        self.article = article
+        self.update(profile)
+
+    def update(self, profile: TokenProfile):
+        self.sentence_count = profile.sentence_count
+        self.token_count = profile.token_count
+        self.syllable_count = profile.syllable_count
+        self.stem_ids_data = profile.stem_ids.astype("<u8").tobytes()
+        self.stem_counts_data = profile.stem_counts.astype("<u4").tobytes()
+
+    @property
+    def stem_ids(self):
+        return numpy.frombuffer(self.stem_ids_data, dtype="<u8")
+
+    @property
+    def stem_counts(self):
+        return numpy.frombuffer(self.stem_counts_data, dtype="<u4")
+
+    @classmethod
+    def for_article(cls, article, session=None):
+        """
+        :return: the profile of the article; computed and added to the
+        session if the article does not have one yet (e.g. older articles)
+        """
+        if article.token_profile is None:
+            profile = TokenProfile.from_text(article.content, article.language.code)
+            cls(article, profile)
+            if session:
+                session.add(article.token_profile)
+
+        return article.token_profile
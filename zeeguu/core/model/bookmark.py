@@ -2,13 +2,15 @@ from datetime import datetime
 
 import sqlalchemy
 from sqlalchemy import Column, ForeignKey, Integer, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, joinedload
 from sqlalchemy.orm.exc import NoResultFound
 from wordstats import Word
 
 import zeeguu.core
+from zeeguu.core.constants import JSON_TIME_FORMAT
 from zeeguu.core.bookmark_quality.fit_for_study import fit_for_study
-from zeeguu.core.definition_of_learned import is_learned_based_on_exercise_outcomes
+from zeeguu.core.bookmark_quality.positive_qualities import quality_top_candidate
+from zeeguu.core.definition_of_learned import is_learned_based_on_exercise_summary
 from zeeguu.core.model import Article
 from zeeguu.core.model.sorted_exercise_log import SortedExerciseLog
 from zeeguu.core.model.exercise import Exercise
@@ -24,6 +26,8 @@ db = zeeguu.core.db
 
 CORRECTS_IN_A_ROW_FOR_LEARNED = 4
 
+SERIALIZATION_BATCH_SIZE = 1000
+
 bookmark_exercise_mapping = Table(
     "bookmark_exercise_mapping",
     db.Model.metadata,
@@ -63,8 +67,22 @@ class Bookmark(db.Model):
 
     fit_for_study = db.Column(db.Boolean)
 
+    # see quality_top_candidate; depends only on the word and the context
+    quality_top_candidate = db.Column(db.Boolean)
+
     learned_time = db.Column(db.DateTime)
 
+    # a summary of the exercise_log, updated with every exercise, such
+    # that deciding on learned / fit for study does not need the log;
+    # correct_days_in_streak is NULL until tools/migrations/
+    # backfill_bookmark_exercise_summary.py ran for the bookmark
+    last_outcome_id = db.Column(db.Integer, db.ForeignKey(ExerciseOutcome.id))
+    last_outcome = db.relationship(ExerciseOutcome)
+    last_exercise_time = db.Column(db.DateTime)
+    # the distinct days of the most recent correct exercises in a row
+    correct_days_in_streak = db.Column(db.Integer)
+    first_exercise_correct = db.Column(db.Boolean)
+
     bookmark = db.relationship('WordToStudy', backref='bookmark', passive_deletes=True)
 
 
@@ -83,7 +101,9 @@ class Bookmark(db.Model):
         self.time = time
         self.text = text
         self.stared = False
+        self.correct_days_in_streak = 0
         self.fit_for_study = fit_for_study(self)
+        self.update_quality_flags()
 
     def __repr__(self):
         return "Bookmark[{3} of {4}: {0}->{1} in '{2}...']\n".format(
@@ -103,6 +123,51 @@ class Bookmark(db.Model):
 
     def add_new_exercise(self, exercise):
         self.exercise_log.append(exercise)
+        self.update_exercise_summary(exercise)
+
+    def update_exercise_summary(self, exercise):
+        """
+            To call with every new exercise of the bookmark, once it is
+            in the exercise_log. O(1), unless the exercise is not newer than
+            the last one, in which case the summary is computed again from the log.
+        """
+        if self.correct_days_in_streak is None or (
+            self.last_exercise_time and exercise.time <= self.last_exercise_time
+        ):
+            self.update_exercise_summary_from_log()
+            return
+
+        if self.last_exercise_time is None:
+            self.first_exercise_correct = exercise.is_correct()
+
+        if not exercise.is_correct():
+            self.correct_days_in_streak = 0
+        elif (
+            self.correct_days_in_streak == 0
+            or self.last_exercise_time.date() != exercise.time.date()
+        ):
+            self.correct_days_in_streak += 1
+
+        self.last_outcome = exercise.outcome
+        self.last_exercise_time = exercise.time
+
+    def update_exercise_summary_from_log(self):
+        log = SortedExerciseLog(self)
+        if log.is_empty():
+            self.last_outcome = None
+            self.last_exercise_time = None
+            self.correct_days_in_streak = 0
+            self.first_exercise_correct = None
+            return
+
+        self.last_outcome = log.latest_exercise_outcome()
+        self.last_exercise_time = log.last_exercise_time()
+        self.correct_days_in_streak = len(log.most_recent_correct_dates())
+        self.first_exercise_correct = log.exercises[-1].is_correct()
+
+    def ensure_exercise_summary(self):
+        if self.correct_days_in_streak is None:
+            self.update_exercise_summary_from_log()
 
     def translations_rendered_as_text(self):
         return self.translation.word
@@ -113,6 +178,12 @@ class Bookmark(db.Model):
     def content_is_not_too_long(self):
         return len(self.text.content) < 60
 
+    def update_quality_flags(self):
+        """
+            To call when the origin or the text of the bookmark change
+        """
+        self.quality_top_candidate = quality_top_candidate(self)
+
     def update_fit_for_study(self, session=None):
         """
             Called when something happened to the bookmark,
@@ -152,30 +223,142 @@ class Bookmark(db.Model):
         exercise_solving_speed,
         db_session,
     ):
+        """
+            Records the exercise and reschedules the bookmark, in one
+            transaction. The fit for study and learned status and the
+            exercise session are updated in the background afterwards.
 
-        from zeeguu.core.model import UserExerciseSession
+        :return: a future that is done once those are updated
+        """
+        from zeeguu.core.exercises.after_exercise import update_after_exercise_later
 
         new_source = ExerciseSource.find_or_create(db_session, exercise_source)
         new_outcome = ExerciseOutcome.find_or_create(db_session, exercise_outcome)
 
-        exercise = self.add_new_exercise_result(
-            new_source, new_outcome, exercise_solving_speed
+        exercise = self._record_exercise(
+            new_source, new_outcome, exercise_solving_speed, db_session
         )
-        db_session.add(exercise)
         db_session.commit()
 
-        # plugging in the new scheduler
-        from zeeguu.core.word_scheduling.basicSR.basicSR import BasicSRSchedule
-        BasicSRSchedule.update(
-            db_session, self, exercise_outcome == ExerciseOutcome.CORRECT
+        return update_after_exercise_later(self.id, exercise.id)
+
+    @classmethod
+    def report_exercise_outcomes(cls, db_session, user, reported_outcomes):
+        """
+            Like report_exercise_outcome, but for many exercises of the
+            user at once (e.g. a whole exercise session, or the ones of
+            a client that was offline), in one transaction.
+
+        :param reported_outcomes: dicts with bookmark_id, outcome, source,
+        solving_speed, and optionally the time when the exercise was done
+        (in JSON_TIME_FORMAT; by default, now); in the order in which
+        they were done
+        :return: "OK", or "FAIL" when the bookmark is not one of the user
+        or the outcome is malformed or in the future; one for each of
+        the reported_outcomes
+        """
+        from zeeguu.core.exercises.after_exercise import update_after_exercises_later
+
+        def bookmark_id_of(reported):
+            try:
+                return int(reported["bookmark_id"])
+            except (KeyError, TypeError, ValueError):
+                return None
+
+        bookmark_ids = {bookmark_id_of(each) for each in reported_outcomes} - {None}
+        bookmarks = {
+            bookmark.id: bookmark
+            for bookmark in cls.query.filter(cls.id.in_(bookmark_ids))
+            .filter(cls.user_id == user.id)
+            .all()
+        }
+
+        now = datetime.now()
+
+        def time_of(reported):
+            try:
+                time = datetime.strptime(reported["time"], JSON_TIME_FORMAT)
+            except (TypeError, ValueError):
+                return None
+            if time > now:
+                return None
+            return time
+
+        def name_of(reported, field):
+            value = reported.get(field)
+            return value if isinstance(value, str) and value else None
+
+        # the same few sources and outcomes come again and again; they are
+        # found or created (which commits) before any of the exercises
+        of_the_user = [
+            each for each in reported_outcomes if bookmark_id_of(each) in bookmarks
+        ]
+        sources = {
+            source: ExerciseSource.find_or_create(db_session, source)
+            for source in {name_of(each, "source") for each in of_the_user} - {None}
+        }
+        outcomes = {
+            outcome: ExerciseOutcome.find_or_create(db_session, outcome)
+            for outcome in {name_of(each, "outcome") for each in of_the_user} - {None}
+        }
+
+        results = []
+        recorded = []
+        for reported in reported_outcomes:
+            bookmark = bookmarks.get(bookmark_id_of(reported))
+            source = name_of(reported, "source")
+            outcome = name_of(reported, "outcome")
+            time = time_of(reported) if "time" in reported else now
+            if bookmark is None or not source or not outcome or not time:
+                results.append("FAIL")
+                continue
+
+            solving_speed = str(reported.get("solving_speed", 0))
+            if not solving_speed.isdigit():
+                solving_speed = 0
+
+            exercise = bookmark._record_exercise(
+                sources[source], outcomes[outcome], solving_speed, db_session, time
+            )
+            recorded.append((bookmark.id, exercise.id))
+            results.append("OK")
+
+        db_session.commit()
+
+        if recorded:
+            update_after_exercises_later(recorded)
+
+        return results
+
+    def _record_exercise(self, source, outcome, solving_speed, db_session, time=None):
+        """
+            Adds the exercise to the log of the bookmark and reschedules
+            the bookmark; does not commit
+
+            :param time: when the exercise was done; by default, now
+        """
+        time = time or datetime.now()
+        exercise = Exercise(outcome, source, solving_speed, time)
+        db_session.add(exercise)
+        db_session.flush()
+
+        # appending to the exercise_log would load all of it
+        db_session.execute(
+            bookmark_exercise_mapping.insert().values(
+                bookmark_id=self.id, exercise_id=exercise.id
+            )
         )
+        db_session.expire(self, ["exercise_log"])
+        self.update_exercise_summary(exercise)
+        db_session.add(self)
 
-        self.update_fit_for_study(db_session)
-        self.update_learned_status(db_session)
+        from zeeguu.core.word_scheduling.scheduler_factory import SchedulerFactory
 
-        UserExerciseSession.update_exercise_session(exercise, db_session)
-        # BookmarkPriorityUpdater.update_bookmark_priority(db, self.user)
+        SchedulerFactory.scheduler_for(self.user).update(
+            db_session, self, outcome.outcome == ExerciseOutcome.CORRECT, time
+        )
 
+        return exercise
 
     def json_serializable_dict(self, with_context=True, with_title=False):
         try:
@@ -189,7 +372,9 @@ class Bookmark(db.Model):
             )
             print(str(e))
 
-        word_info = Word.stats(self.origin.word, self.origin.language.code)
+        # the rank is stored with the word; the importance is not
+        importance = Word.stats(self.origin.word, self.origin.language.code).importance
+        rank = self.origin.rank
 
         learned_datetime = str(self.learned_time.date()) if self.learned else ""
 
@@ -212,9 +397,9 @@ class Bookmark(db.Model):
             to_lang=translation_language,
             title=bookmark_title,
             url=self.text.url(),
-            origin_importance=word_info.importance,
+            origin_importance=importance,
             learned_datetime=learned_datetime,
-            origin_rank=word_info.rank if word_info.rank != 100000 else "",
+            origin_rank=rank if rank is not None and rank != 100000 else "",
             starred=self.starred if self.starred is not None else False,
             article_id=self.text.article_id if self.text.article_id else "",
             created_day=created_day,  # human readable stuff...
@@ -230,6 +415,69 @@ class Bookmark(db.Model):
             result["context"] = self.text.content
         return result
 
+    @classmethod
+    def json_serializable_dicts(cls, bookmarks, with_context=True, with_title=False):
+        """
+            json_serializable_dict of each of the bookmarks, with what
+            they refer to loaded for SERIALIZATION_BATCH_SIZE of them at once
+
+        :return: a generator, such that long lists can be streamed; the
+        bookmarks of a batch are loaded when the batch is reached
+        """
+        if isinstance(bookmarks, sqlalchemy.orm.Query):
+            bookmarks = bookmarks.options(*cls._serialization_loads()).yield_per(
+                SERIALIZATION_BATCH_SIZE
+            )
+            for bookmark in bookmarks:
+                yield bookmark.json_serializable_dict(with_context, with_title)
+            return
+
+        bookmarks = list(bookmarks)
+        for start in range(0, len(bookmarks), SERIALIZATION_BATCH_SIZE):
+            batch = cls.load_for_serialization(
+                bookmarks[start : start + SERIALIZATION_BATCH_SIZE]
+            )
+            for bookmark in batch:
+                yield bookmark.json_serializable_dict(with_context, with_title)
+
+    @classmethod
+    def load_for_serialization(cls, bookmarks):
+        """
+            Loads the words, languages, texts, articles, and urls of the
+            bookmarks, in one query per SERIALIZATION_BATCH_SIZE bookmarks,
+            instead of lazily, one by one, in json_serializable_dict
+
+        :param bookmarks: a query, or a list of bookmarks
+        :return: the list of bookmarks
+        """
+        if isinstance(bookmarks, sqlalchemy.orm.Query):
+            return bookmarks.options(*cls._serialization_loads()).all()
+
+        bookmarks = list(bookmarks)
+        ids = [bookmark.id for bookmark in bookmarks]
+        for start in range(0, len(ids), SERIALIZATION_BATCH_SIZE):
+            # the loaded objects end up in the identity map
+            # of the session, where the bookmarks find them
+            (
+                cls.query.options(*cls._serialization_loads())
+                .filter(cls.id.in_(ids[start : start + SERIALIZATION_BATCH_SIZE]))
+                .all()
+            )
+        return bookmarks
+
+    @classmethod
+    def _serialization_loads(cls):
+        from zeeguu.core.model.url import Url
+
+        return [
+            joinedload(cls.origin).joinedload(UserWord.language),
+            joinedload(cls.translation).joinedload(UserWord.language),
+            joinedload(cls.text)
+            .joinedload(Text.article)
+            .joinedload(Article.url)
+            .joinedload(Url.domain),
+        ]
+
     @classmethod
     def find_or_create(
         cls,
@@ -315,6 +563,28 @@ class Bookmark(db.Model):
     def find(cls, b_id):
         return cls.query.filter_by(id=b_id).one()
 
+    @classmethod
+    def find_many_with_context(cls, ids):
+        """
+        :return: the bookmarks with the given ids, in the same order,
+        loaded in one query together with their words and context
+        """
+        if not ids:
+            return []
+
+        bookmarks = (
+            cls.query.options(
+                joinedload(cls.origin).joinedload(UserWord.language),
+                joinedload(cls.translation).joinedload(UserWord.language),
+                joinedload(cls.text),
+            )
+            .filter(cls.id.in_(ids))
+            .all()
+        )
+
+        by_id = {bookmark.id: bookmark for bookmark in bookmarks}
+        return [by_id[id] for id in ids if id in by_id]
+
     @classmethod
     def find_all_by_user_and_word(cls, user, word):
         return cls.query.filter_by(user=user, origin=word).all()
@@ -339,14 +609,13 @@ class Bookmark(db.Model):
         :return:
         """
 
-        log = SortedExerciseLog(self)
-        is_learned = is_learned_based_on_exercise_outcomes(log)
-        if is_learned:
-            zeeguu.core.log(f"Log: {log.summary()}: bookmark {self.id} learned!")
-            self.learned_time = log.last_exercise_time()
+        self.ensure_exercise_summary()
+        if is_learned_based_on_exercise_summary(self):
+            zeeguu.core.log(
+                f"Last: {self.last_outcome.outcome}, correct days: {self.correct_days_in_streak}: bookmark {self.id} learned!"
+            )
+            self.learned_time = self.last_exercise_time
             self.learned = True
             session.add(self)
         else:
-            zeeguu.core.log(
-                f"Log: {log.summary()}: bookmark {self.id} not learned yet."
-            )
+            zeeguu.core.log(f"Correct days: {self.correct_days_in_streak}: bookmark {self.id} not learned yet.")
@@ -67,10 +67,9 @@ class ExerciseOutcome(db.Model):
 
         except sqlalchemy.orm.exc.NoResultFound as e:
             outcome = cls(_outcome)
+            session.add(outcome)
+            session.commit()
         except Exception as e:
             raise e
 
-        session.add(outcome)
-        session.commit()
-
         return outcome
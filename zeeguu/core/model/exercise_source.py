@@ -31,10 +31,9 @@ class ExerciseSource(db.Model):
 
         except NoResultFound as e:
             source = cls(_source)
+            session.add(source)
+            session.commit()
         except Exception as e:
             raise e
 
-        session.add(source)
-        session.commit()
-
         return source
@@ -38,6 +38,10 @@ class RSSFeed(db.Model):
 
     last_crawled_time = db.Column(db.DateTime)
 
+    # see: content_retriever/crawl_scheduler.py
+    publish_interval_estimate = db.Column(db.Integer)  # seconds
+    next_crawl_time = db.Column(db.DateTime)
+
     deactivated = db.Column(db.Integer)
 
     def __init__(
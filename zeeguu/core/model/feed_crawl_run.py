@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import zeeguu.core
+from zeeguu.core.model.feed import RSSFeed
+
+db = zeeguu.core.db
+
+
+class FeedCrawlRun(db.Model):
+    """
+
+    One crawl of one feed: how long each of the stages of
+    download_from_feed took (in seconds) and what happened
+    with the items of the feed.
+
+    """
+
+    __table_args__ = {"mysql_collate": "utf8_bin"}
+    __tablename__ = "feed_crawl_run"
+
+    STAGES = [
+        "feed_items",
+        "redirects",
+        "download",
+        "parse",
+        "topics",
+        "keywords",
+        "commit",
+        "elastic",
+        "enrichment",
+    ]
+
+    OUTCOMES = [
+        "downloaded",
+        "low_quality",
+        "already_in_db",
+        "near_duplicates",
+        "failed",
+    ]
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    feed_id = db.Column(db.Integer, db.ForeignKey(RSSFeed.id))
+    feed = db.relationship(RSSFeed)
+
+    start_time = db.Column(db.DateTime)
+    duration = db.Column(db.Float)
+
+    feed_items_time = db.Column(db.Float)
+    redirects_time = db.Column(db.Float)
+    download_time = db.Column(db.Float)
+    parse_time = db.Column(db.Float)
+    topics_time = db.Column(db.Float)
+    keywords_time = db.Column(db.Float)
+    commit_time = db.Column(db.Float)
+    elastic_time = db.Column(db.Float)
+    enrichment_time = db.Column(db.Float)
+
+    downloaded = db.Column(db.Integer)
+    low_quality = db.Column(db.Integer)
+    already_in_db = db.Column(db.Integer)
+    near_duplicates = db.Column(db.Integer)
+    failed = db.Column(db.Integer)
+
+    def __init__(self, feed, start_time, duration, stage_times, outcomes):
+        self.feed = feed
+        self.start_time = start_time
+        self.duration = duration
+        for stage in self.STAGES:
+            setattr(self, f"{stage}_time", stage_times.get(stage, 0))
+        for outcome in self.OUTCOMES:
+            setattr(self, outcome, outcomes.get(outcome, 0))
+
+    def __repr__(self):
+        return f"<FeedCrawlRun {self.feed_id} at {self.start_time} ({self.duration:.1f}s)>"
+
+    @classmethod
+    def since(cls, days):
+        some_time_ago = datetime.now() - timedelta(days=days)
+        return cls.query.filter(cls.start_time > some_time_ago).all()
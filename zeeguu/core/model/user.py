@@ -201,18 +201,11 @@ class User(db.Model):
         :param bookmark_count: by default we recommend 10 words
         :return:
         """
-        db_session = zeeguu.core.db.session
-        from zeeguu.core.word_scheduling.basicSR.basicSR import BasicSRSchedule
+        from zeeguu.core.word_scheduling.scheduler_factory import SchedulerFactory
 
-        to_study = BasicSRSchedule.bookmarks_to_study(self, bookmark_count)
-
-        if len(to_study) < bookmark_count:
-            BasicSRSchedule.schedule_some_more_bookmarks(
-                db_session, self, bookmark_count - len(to_study)
-            )
-            to_study = BasicSRSchedule.bookmarks_to_study(self, bookmark_count)
-
-        return to_study
+        return SchedulerFactory.scheduler_for(self).bookmarks_to_study(
+            self, bookmark_count
+        )
 
     def date_of_last_bookmark(self):
         """
@@ -494,6 +487,12 @@ class User(db.Model):
         if len(sorted_date_bookmarks) > max:
             sorted_date_bookmarks = sorted_date_bookmarks[:max]
 
+        from zeeguu.core.model import Bookmark
+
+        Bookmark.load_for_serialization(
+            [bookmark for _, bookmarks in sorted_date_bookmarks for bookmark in bookmarks]
+        )
+
         result = self._to_serializable(
             sorted_date_bookmarks, "bookmarks", with_context, with_title
         )
@@ -510,8 +509,6 @@ class User(db.Model):
 
         from zeeguu.core.model import Bookmark, Text
 
-        json_bookmarks = []
-
         query = zeeguu.core.db.session.query(Bookmark)
         bookmarks = (
             query.join(Text)
@@ -527,10 +524,7 @@ class User(db.Model):
         if not json:
             return bookmarks
 
-        for each in bookmarks:
-            json_bookmarks.append(each.json_serializable_dict(with_context, with_title))
-
-        return json_bookmarks
+        return list(Bookmark.json_serializable_dicts(bookmarks, with_context, with_title))
 
     def bookmarks_by_url_by_date(self, n_days=365):
         bookmarks_list, dates = self.bookmarks_by_date()
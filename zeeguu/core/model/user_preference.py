@@ -35,6 +35,7 @@ class UserPreference(db.Model):
 
     # Key Names Below
     DIFFICULTY_ESTIMATOR = "difficulty_estimator"
+    WORD_SCHEDULER = "word_scheduler"
 
     def __init__(self, user: User, key=None, value=None):
         self.user = user
@@ -61,6 +62,17 @@ class UserPreference(db.Model):
     def set_difficulty_estimator(cls, session, user: User, key: value):
         return cls.set(session, user, cls.DIFFICULTY_ESTIMATOR, key)
 
+    @classmethod
+    def get_word_scheduler(cls, user: User):
+        return cls.get(user, cls.WORD_SCHEDULER)
+
+    @classmethod
+    def set_word_scheduler(cls, session, user: User, key: value):
+        from zeeguu.core.word_scheduling.scheduler_factory import SchedulerFactory
+
+        cls.set(session, user, cls.WORD_SCHEDULER, key)
+        SchedulerFactory.forget(user.id)
+
     # Generic preference handling
     # ---------------------------
 
@@ -0,0 +1,119 @@
+"""
+
+    The events of a WordInteractionHistory packed in two arrays
+    (the event types as int8 and the seconds since epoch as uint32)
+    sorted by time, instead of a list of one object per event.
+
+    In the DB the events are stored as a blob with the types of all
+    the events followed by all their timestamps, little endian; five
+    bytes per event.
+
+"""
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# read only view of one event
+InteractionEvent = namedtuple("InteractionEvent", ["event_type", "seconds_since_epoch"])
+
+TYPE_CODE = "b"
+TIMESTAMP_CODE = "I"
+assert array(TIMESTAMP_CODE).itemsize == 4
+
+BYTES_PER_EVENT = 1 + 4
+
+
+class PackedInteractionHistory(object):
+    """
+    At most capacity events; when full, adding a newer event
+    overwrites the oldest one, as in a ring buffer.
+    """
+
+    __slots__ = ("capacity", "event_types", "timestamps")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.event_types = array(TYPE_CODE)
+        self.timestamps = array(TIMESTAMP_CODE)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes, capacity):
+        history = cls(capacity)
+        if not blob:
+            return history
+
+        if len(blob) % BYTES_PER_EVENT:
+            raise ValueError(f"Not a packed interaction history: {len(blob)} bytes")
+
+        count = len(blob) // BYTES_PER_EVENT
+        history.event_types.frombytes(blob[:count])
+        history.timestamps.frombytes(blob[count:])
+        if sys.byteorder == "big":
+            history.timestamps.byteswap()
+        return history
+
+    @classmethod
+    def from_pairs(cls, pairs, capacity):
+        """
+        :param pairs: (event_type, seconds_since_epoch) pairs, e.g.
+        from the interaction_history_json of the older histories
+        """
+        history = cls(capacity)
+        for event_type, seconds_since_epoch in pairs:
+            history.insert(event_type, seconds_since_epoch)
+        return history
+
+    def to_bytes(self):
+        timestamps = array(TIMESTAMP_CODE, self.timestamps)
+        if sys.byteorder == "big":
+            timestamps.byteswap()
+        return self.event_types.tobytes() + timestamps.tobytes()
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        return InteractionEvent(self.event_types[index], self.timestamps[index])
+
+    def __iter__(self):
+        return map(InteractionEvent, self.event_types, self.timestamps)
+
+    def __repr__(self):
+        return f"(PackedInteractionHistory: {list(self)})"
+
+    def insert(self, event_type, seconds_since_epoch):
+        """
+        Inserts the event keeping the events sorted by time. If the
+        history is full, the oldest event is evicted; unless the new
+        event is itself the oldest, in which case it is dropped.
+        """
+        if len(self) >= self.capacity:
+            if seconds_since_epoch <= self.timestamps[0]:
+                return
+            del self.event_types[0]
+            del self.timestamps[0]
+
+        position = bisect_right(self.timestamps, seconds_since_epoch)
+        self.event_types.insert(position, event_type)
+        self.timestamps.insert(position, seconds_since_epoch)
+
+    def replace(self, index, event_type, seconds_since_epoch):
+        del self.event_types[index]
+        del self.timestamps[index]
+        self.insert(event_type, seconds_since_epoch)
+
+    def contains_time(self, seconds_since_epoch):
+        position = bisect_left(self.timestamps, seconds_since_epoch)
+        return position < len(self) and self.timestamps[position] == seconds_since_epoch
+
+    def count(self, event_type):
+        return self.event_types.count(event_type)
+
+    def until(self, seconds_since_epoch):
+        """
+        :return: the events that happened at or before the given time
+        """
+        end = bisect_right(self.timestamps, seconds_since_epoch)
+        return [self[i] for i in range(end)]
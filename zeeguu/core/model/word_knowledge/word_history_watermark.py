@@ -0,0 +1,39 @@
+import zeeguu.core
+from sqlalchemy import Column, ForeignKey, Integer
+
+from zeeguu.core.model import User
+
+db = zeeguu.core.db
+
+
+class WordHistoryWatermark(db.Model):
+    """
+
+        How far the saturation of the word interaction histories of a
+        user got: the ids of the last processed bookmark, fully read
+        activity, and exercise. See tools/saturate_word_interaction_history.py
+
+    """
+
+    __table_args__ = dict(mysql_collate="utf8_bin")
+    __tablename__ = "word_history_watermark"
+
+    user_id = Column(Integer, ForeignKey(User.id), primary_key=True)
+
+    last_bookmark_id = Column(Integer, nullable=False, default=0)
+    last_activity_id = Column(Integer, nullable=False, default=0)
+    last_exercise_id = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.last_bookmark_id = 0
+        self.last_activity_id = 0
+        self.last_exercise_id = 0
+
+    @classmethod
+    def find_or_create(cls, session, user_id):
+        watermark = cls.query.filter_by(user_id=user_id).first()
+        if watermark is None:
+            watermark = cls(user_id)
+            session.add(watermark)
+        return watermark
@@ -1,4 +1,6 @@
 import json
+import time
+from collections import namedtuple, OrderedDict
 
 from sqlalchemy.orm.exc import NoResultFound
 
@@ -6,6 +8,9 @@ import zeeguu.core
 from sqlalchemy import Column, Integer, UnicodeText
 
 from zeeguu.core.model import User, UserWord, Language
+from zeeguu.core.model.word_knowledge.packed_interaction_history import (
+    PackedInteractionHistory,
+)
 from sys import platform
 
 
@@ -24,9 +29,23 @@ from zeeguu.core.constants import (
                         WIH_WRONG_EX_MATCH,
                         WIH_READ_CLICKED,
                         WIH_READ_NOT_CLICKED_IN_SENTENCE,
+                        WIH_READ_NOT_CLICKED_OUT_SENTENCE,
                         TIMEDELTA
 )
 
+# What the estimators need to know about the history of a word;
+# see WordInteractionHistory.knowledge_map
+WordKnowledge = namedtuple(
+    "WordKnowledge", ["event_count", "seen_in_context_count", "seen_out_of_context_count"]
+)
+
+# (user_id, language_id) -> (time loaded, knowledge map)
+_knowledge_maps = OrderedDict()
+KNOWLEDGE_MAPS_CACHE_SIZE = 1000
+# the other processes don't update our cache, so we
+# reload from the DB every now and then
+KNOWLEDGE_MAP_MAX_AGE = 300  # seconds
+
 
 class WordInteractionEvent(object):
 
@@ -85,11 +104,23 @@ class WordInteractionHistory(db.Model):
     # should be between 0 and 100
     known_probability = db.Column(db.Integer, db.ForeignKey(User.id))
 
-    interaction_history = []
+    # the decoded interaction_history_data; see interaction_history
+    _interaction_history = None
+
+    # the interaction history packed by PackedInteractionHistory
+    interaction_history_data = db.Column(db.LargeBinary)
 
-    # the interaction history stored as string
+    # the interaction history stored as string; only in the rows
+    # saved before the packed interaction_history_data was introduced
     interaction_history_json = db.Column(UnicodeText())
 
+    # summary of the interaction history; updated together with it
+    # such that the knowledge of a user can be loaded without
+    # decoding all the histories
+    event_count = db.Column(db.Integer)
+    seen_in_context_count = db.Column(db.Integer)
+    seen_out_of_context_count = db.Column(db.Integer)
+
     db.UniqueConstraint(user_id, word_id)
 
     def __init__(self, user:User, word: UserWord):
@@ -97,7 +128,21 @@ class WordInteractionHistory(db.Model):
         # always, work with the method interaction_history()
         self.user = user
         self.word = word
-        self.interaction_history = []
+        self._interaction_history = PackedInteractionHistory(MAX_EVENT_HISTORY_LENGTH)
+
+    @property
+    def interaction_history(self):
+        """
+            the events sorted by time; decoded only when first needed
+        """
+        if self._interaction_history is None:
+            if self.interaction_history_data is not None:
+                self._interaction_history = PackedInteractionHistory.from_bytes(
+                    self.interaction_history_data, MAX_EVENT_HISTORY_LENGTH)
+            else:
+                self._interaction_history = PackedInteractionHistory.from_pairs(
+                    json.loads(self.interaction_history_json or "[]"), MAX_EVENT_HISTORY_LENGTH)
+        return self._interaction_history
 
     def insert_event(self, event_type, timestamp, timedelta = TIMEDELTA):
         """
@@ -117,29 +162,25 @@ class WordInteractionHistory(db.Model):
         else:
             seconds_since_epoch = int(timestamp.strftime("%s"))
 
+        history = self.interaction_history
+
         # Don't add event if it already occurs
-        if self.time_exists(timestamp):
+        if history.contains_time(seconds_since_epoch):
             return
 
-        if len(self.interaction_history) == 0:
-            self.interaction_history.append(WordInteractionEvent(event_type, seconds_since_epoch))
-
         # change event if latest event was already recorded within the timedelta
-        elif self.interaction_history[-1].seconds_since_epoch + timedelta >= seconds_since_epoch and\
+        if history and history[-1].seconds_since_epoch + timedelta >= seconds_since_epoch and\
                 (event_type == WIH_READ_CLICKED or event_type == WIH_READ_NOT_CLICKED_IN_SENTENCE):
-            self.interaction_history[-1].seconds_since_epoch = seconds_since_epoch
-            if event_type == WIH_READ_CLICKED:
-                self.interaction_history[-1].event_type = event_type
+            if event_type != WIH_READ_CLICKED:
+                event_type = history[-1].event_type
+            history.replace(-1, event_type, seconds_since_epoch)
 
-        # append if less than 50 events recorded
-        elif len(self.interaction_history) < MAX_EVENT_HISTORY_LENGTH:
-            self.interaction_history.append(WordInteractionEvent(event_type, seconds_since_epoch))
-            self.interaction_history.sort(key=lambda x: x.seconds_since_epoch)
+        # otherwise insert it in order; when the history is full the
+        # oldest event is evicted, unless the new event is older
+        else:
+            history.insert(event_type, seconds_since_epoch)
 
-        # otherwise only insert if oldest event is older than new event
-        elif seconds_since_epoch > self.interaction_history[0].seconds_since_epoch:
-            self.interaction_history[0] = WordInteractionEvent(event_type, seconds_since_epoch)
-            self.interaction_history.sort(key=lambda x: x.seconds_since_epoch)
+        self.update_summary()
 
 
     def add_event(self, event_type, timestamp, timedelta = TIMEDELTA):
@@ -155,23 +196,27 @@ class WordInteractionHistory(db.Model):
         # json can't serialize timestamps, so we simply
         seconds_since_epoch = int(timestamp.strftime("%s"))
 
-        self.interaction_history.insert(0, WordInteractionEvent(event_type, seconds_since_epoch))
-        self.interaction_history = self.interaction_history[0:MAX_EVENT_HISTORY_LENGTH]
+        history = self.interaction_history
 
         # change event if an event was already recorded within the timedelta
-        if self.interaction_history[-1].seconds_since_epoch + timedelta >= seconds_since_epoch:
-            self.interaction_history[-1].seconds_since_epoch = seconds_since_epoch
-            if event_type == WIH_READ_CLICKED:
-                self.interaction_history[-1].event_type = event_type
-
-        # append if less than 50 events recorded
-        elif len(self.interaction_history) < MAX_EVENT_HISTORY_LENGTH:
-            self.interaction_history.append(WordInteractionEvent(event_type, seconds_since_epoch))
+        if history and history[-1].seconds_since_epoch + timedelta >= seconds_since_epoch:
+            if event_type != WIH_READ_CLICKED:
+                event_type = history[-1].event_type
+            history.replace(-1, event_type, seconds_since_epoch)
 
-        # append new event and pop oldest event
+        # append; when the history is full the oldest event is evicted
         else:
-            self.interaction_history.append(WordInteractionEvent(event_type, seconds_since_epoch))
-            self.interaction_history.pop(0)
+            history.insert(event_type, seconds_since_epoch)
+
+        self.update_summary()
+
+    def update_summary(self):
+        self.event_count = len(self.interaction_history)
+        self.seen_in_context_count = self.interaction_history.count(WIH_READ_NOT_CLICKED_IN_SENTENCE)
+        self.seen_out_of_context_count = self.interaction_history.count(WIH_READ_NOT_CLICKED_OUT_SENTENCE)
+
+    def knowledge(self):
+        return WordKnowledge(self.event_count, self.seen_in_context_count, self.seen_out_of_context_count)
 
 
 
@@ -182,30 +227,56 @@ class WordInteractionHistory(db.Model):
             return: True or False
         """
         if platform == "win32":
-            return int(timestamp.timestamp()) in [ih.seconds_since_epoch for ih in self.interaction_history]
+            return self.interaction_history.contains_time(int(timestamp.timestamp()))
         else:
-            return int(timestamp.strftime("%s")) in [ih.seconds_since_epoch for ih in self.interaction_history]
+            return self.interaction_history.contains_time(int(timestamp.strftime("%s")))
 
     def reify_interaction_history(self):
         """
 
-            after this the interaction_history object is synced from the interaction_history_json
+            after this the interaction_history object is synced from the interaction_history_data
+            (or the interaction_history_json of the older rows); the decoding happens lazily
 
         :return:
         """
-        list_of_tuples = json.loads(self.interaction_history_json)
-        self.interaction_history = [WordInteractionEvent(pair[0], pair[1]) for pair in list_of_tuples]
+        self._interaction_history = None
 
     def save_to_db(self, db_session):
         """
 
-            after this the interaction_history_json will be the result of converting  interaction_history to json
+            after this the interaction_history_data will be the result of packing interaction_history
         :return:
         """
-        #self.interaction_history_json = "None"
-        self.interaction_history_json = json.dumps([e.to_json() for e in self.interaction_history])
+        self._pack()
         db_session.add(self)
         db_session.commit()
+        self._update_cached_knowledge_map()
+
+    @classmethod
+    def save_all(cls, db_session, histories):
+        """
+
+            same as save_to_db, but for many histories in a single transaction
+
+        """
+        for history in histories:
+            history._pack()
+            db_session.add(history)
+        db_session.commit()
+
+        for history in histories:
+            history._update_cached_knowledge_map()
+
+    def _pack(self):
+        self.interaction_history_data = self.interaction_history.to_bytes()
+        self.interaction_history_json = None
+        if self.event_count is None:
+            self.update_summary()
+
+    def _update_cached_knowledge_map(self):
+        cached = _knowledge_maps.get((self.user_id, self.word.language_id))
+        if cached:
+            cached[1][self.word.word] = self.knowledge()
 
     @classmethod
     def find(cls, user: User, word: UserWord):
@@ -278,3 +349,61 @@ class WordInteractionHistory(db.Model):
         for history in histories:
             history.reify_interaction_history()
         return histories
+
+    @classmethod
+    def knowledge_map(cls, user: User, language: Language):
+        """
+
+            the WordKnowledge of every word of the user in the language;
+            loaded from the DB in one query and cached
+
+        :return: dictionary word -> WordKnowledge
+        """
+        key = (user.id, language.id)
+
+        cached = _knowledge_maps.get(key)
+        if cached and time.time() - cached[0] < KNOWLEDGE_MAP_MAX_AGE:
+            _knowledge_maps.move_to_end(key)
+            return cached[1]
+
+        rows = (
+            db.session.query(
+                UserWord.word,
+                cls.event_count,
+                cls.seen_in_context_count,
+                cls.seen_out_of_context_count,
+            )
+            .join(UserWord, cls.word_id == UserWord.id)
+            .filter(cls.user_id == user.id)
+            .filter(UserWord.language_id == language.id)
+            .all()
+        )
+
+        knowledge = {}
+        for word, event_count, in_context, out_of_context in rows:
+            if event_count is None:
+                # saved before the summaries were introduced
+                continue
+            knowledge[word] = WordKnowledge(event_count, in_context, out_of_context)
+
+        if len(knowledge) < len(rows):
+            # the summaries are computed once, and saved
+            without_summary = (
+                cls.query.join(UserWord, cls.word_id == UserWord.id)
+                .filter(cls.user_id == user.id)
+                .filter(UserWord.language_id == language.id)
+                .filter(cls.event_count == None)
+                .all()
+            )
+            for history in without_summary:
+                history.reify_interaction_history()
+                history.update_summary()
+                db.session.add(history)
+                knowledge[history.word.word] = history.knowledge()
+            db.session.commit()
+
+        _knowledge_maps[key] = (time.time(), knowledge)
+        if len(_knowledge_maps) > KNOWLEDGE_MAPS_CACHE_SIZE:
+            _knowledge_maps.popitem(last=False)
+
+        return knowledge
@@ -0,0 +1,15 @@
+select b.id bookmark_id, b.starred, uw.rank
+from bookmark b
+join user_word uw on b.origin_id = uw.id
+left join basic_sr_schedule bss on b.id = bss.bookmark_id
+where
+b.learned = 0 and b.fit_for_study
+and bss.id is null
+
+-- parameters
+and b.user_id = :user_id
+and uw.language_id = :language_id
+
+order by b.starred desc, uw.rank is null, uw.rank asc
+
+limit :required_count
@@ -29,6 +29,13 @@ class ModelTestMixIn(TestCase):
 
         self.db.drop_all()
 
+        # the ids of the next test's users are the same
+        from zeeguu.core.word_scheduling.basicSR.due_queue import DueQueue
+        from zeeguu.core.word_scheduling.scheduler_factory import SchedulerFactory
+
+        DueQueue.forget_all()
+        SchedulerFactory.forget_all()
+
     def run(self, result=None):
 
         # For the unit tests we use several HTML documents
@@ -0,0 +1,106 @@
+from unittest import TestCase
+
+from zeeguu.core.test.model_test_mixin import ModelTestMixIn
+from zeeguu.core.test.rules.article_rule import ArticleRule
+from zeeguu.core.test.rules.language_rule import LanguageRule
+from zeeguu.core.test.rules.user_rule import UserRule
+
+from zeeguu.core.language.token_profile import TokenProfile, text_chunks
+from zeeguu.core.language.strategies.flesch_kincaid_difficulty_estimator import (
+    FleschKincaidDifficultyEstimator,
+)
+from zeeguu.core.language.strategies.word_history_difficulty_estimator import (
+    WordHistoryDifficultyEstimator,
+)
+from zeeguu.core.util.text import split_words_from_text
+
+TEXT = (
+    "Alle hatten in sein Lachen eingestimmt, hauptsächlich aus Ehrerbietung "
+    "gegen das Familienoberhaupt. Das Haus war still. Die Häuser waren laut."
+)
+
+
+class ArticleTokenProfileTest(ModelTestMixIn, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.article = ArticleRule().article
+        self.german = LanguageRule().de
+
+    def test_profile_computed_with_the_article(self):
+        profile = self.article.token_profile
+
+        assert profile.token_count == len(split_words_from_text(self.article.content))
+        assert profile.stem_counts.sum() == profile.token_count
+        assert list(profile.stem_ids) == sorted(profile.stem_ids)
+
+    def test_profile_updated_with_the_article(self):
+        self.article.update(self.german, TEXT, "", "Ein Titel")
+
+        assert self.article.token_profile.token_count == 20
+        assert self.article.token_profile.sentence_count == 3
+
+    def test_same_fk_as_from_text(self):
+        profile = TokenProfile.from_text(TEXT, "de")
+
+        from_text = FleschKincaidDifficultyEstimator.estimate_difficulty(
+            TEXT, self.german, None
+        )
+        from_profile = FleschKincaidDifficultyEstimator.estimate_difficulty_from_profile(
+            profile, self.german, None
+        )
+        assert from_text == from_profile
+
+    def test_long_text_profiled_in_chunks(self):
+        long_text = "\n\n".join([TEXT] * 50)
+        chunks = list(text_chunks(long_text, chunk_size=1000))
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == long_text
+
+        in_chunks = TokenProfile.from_chunks(chunks, "de")
+        assert in_chunks.sentence_count == 150
+        assert in_chunks.token_count == 50 * 20
+
+    def test_difficulty_of_long_upload_is_estimated_later(self):
+        from threading import Event
+
+        from zeeguu.core.language import background_difficulty
+        from zeeguu.core.model import Article
+
+        long_text = "\n\n".join(
+            [TEXT] * (Article.MAX_CHARS_FOR_INLINE_DIFFICULTY // len(TEXT) + 1)
+        )
+        assert not Article.estimate_difficulty_inline(long_text)
+
+        # keep the background workers busy till the upload is checked
+        upload_checked = Event()
+        for _ in range(background_difficulty.WORKERS):
+            background_difficulty._executor.submit(upload_checked.wait)
+
+        try:
+            article_id = Article.create_from_upload(
+                self.db.session, "Ein Titel", long_text, None, UserRule().user, self.german
+            )
+            article = Article.find_by_id(article_id)
+            assert article.fk_difficulty is None
+            assert article.article_info()["metrics"]["difficulty"] is None
+        finally:
+            upload_checked.set()
+        background_difficulty.wait_for_pending_estimates()
+
+        self.db.session.expire_all()
+        article = Article.find_by_id(article_id)
+        assert article.fk_difficulty is not None
+        assert article.token_profile.sentence_count > 0
+
+    def test_same_word_scores_as_from_text(self):
+        estimator = WordHistoryDifficultyEstimator(self.german, UserRule().user)
+        estimator.score_map = {"haus": 0.0, "lach": 0.5, "still": 0.2}
+
+        from_text = estimator.estimate_difficulty(TEXT)
+        from_profile = estimator.estimate_difficulty_from_profile(
+            TokenProfile.from_text(TEXT, "de")
+        )
+
+        for key in ["normalized", "unique_ratio", "median_unique"]:
+            self.assertAlmostEqual(from_text[key], from_profile[key])
@@ -0,0 +1,101 @@
+from sqlalchemy import event
+
+from zeeguu.core.test.model_test_mixin import ModelTestMixIn
+from zeeguu.core.test.rules.user_rule import UserRule
+from zeeguu.core.word_scheduling.basicSR.basicSR import BasicSRSchedule, ONE_DAY
+from zeeguu.core.word_scheduling.basicSR.due_queue import DueQueue
+
+
+class BasicSRScheduleTest(ModelTestMixIn):
+    def setUp(self):
+        super().setUp()
+
+        self.user_rule = UserRule()
+        self.user_rule.add_bookmarks(5)
+        self.user = self.user_rule.user
+        for bookmark in self.user.all_bookmarks():
+            bookmark.fit_for_study = True
+            self.db.session.add(bookmark)
+        self.db.session.commit()
+
+    def _count_queries(self, function):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.db.engine, "before_cursor_execute", count)
+        try:
+            result = function()
+        finally:
+            event.remove(self.db.engine, "before_cursor_execute", count)
+        return result, statements
+
+    def test_new_bookmarks_are_scheduled(self):
+        to_study = self.user.bookmarks_to_study(3)
+
+        assert len(to_study) == 3
+        assert BasicSRSchedule.query.count() == 3
+
+        # the scheduled ones are now due, and more get scheduled
+        to_study_again = self.user.bookmarks_to_study(5)
+        assert len(to_study_again) == 5
+        assert set(to_study) < set(to_study_again)
+        assert BasicSRSchedule.query.count() == 5
+
+    def test_fixed_number_of_queries(self):
+        # loaded, as it would be in the request
+        self.user.learned_language_id
+
+        to_study, statements = self._count_queries(
+            lambda: self.user.bookmarks_to_study(5)
+        )
+        # the scheduler of the user, the schedules of the user,
+        # the bookmarks to schedule, the new schedules, the bookmarks
+        assert len(statements) == 5
+
+        # the words and the context come with the bookmarks
+        _, statements = self._count_queries(
+            lambda: [
+                (b.origin.word, b.origin.language.code, b.translation.word, b.text.content)
+                for b in to_study
+            ]
+        )
+        assert len(statements) == 0
+
+        # the due ones are now in memory
+        self.user.learned_language_id
+        _, statements = self._count_queries(lambda: self.user.bookmarks_to_study(5))
+        assert len(statements) == 1
+
+    def test_outcomes_are_written_with_the_exercise(self):
+        bookmark = self.user.bookmarks_to_study(1)[0]
+        queue = DueQueue.for_user(self.user)
+
+        BasicSRSchedule.update(self.db.session, bookmark, False)
+        BasicSRSchedule.update(self.db.session, bookmark, True)
+        self.db.session.commit()
+        assert bookmark.id not in queue.due_bookmark_ids(5)
+
+        schedule = BasicSRSchedule.query.filter_by(bookmark_id=bookmark.id).one()
+        self.db.session.refresh(schedule)
+        assert schedule.consecutive_correct_answers == 1
+
+    def test_outcome_is_applied_to_the_schedule_in_the_table(self):
+        bookmark = self.user.bookmarks_to_study(1)[0]
+        queue = DueQueue.for_user(self.user)
+
+        # e.g. another process of the API practiced the bookmark
+        schedule = BasicSRSchedule.query.filter_by(bookmark_id=bookmark.id).one()
+        schedule.consecutive_correct_answers = 2
+        schedule.cooling_interval = 2 * ONE_DAY
+        self.db.session.add(schedule)
+        self.db.session.commit()
+
+        BasicSRSchedule.update(self.db.session, bookmark, False)
+        self.db.session.commit()
+
+        self.db.session.refresh(schedule)
+        assert schedule.consecutive_correct_answers == 0
+        assert schedule.cooling_interval == 0
+        assert bookmark.id in queue.due_bookmark_ids(5)
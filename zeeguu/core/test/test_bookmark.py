@@ -72,12 +72,49 @@ class BookmarkTest(ModelTestMixIn):
         assert latest_exercise.outcome == random_exercise.outcome
         assert latest_exercise.solving_speed == random_exercise.solving_speed
 
+    def test_report_exercise_outcome(self):
+        from zeeguu.core.model import UserExerciseSession
+        from zeeguu.core.model.exercise_outcome import ExerciseOutcome
+
+        random_bookmark = BookmarkRule(self.user).bookmark
+        length_original_exercise_log = len(random_bookmark.exercise_log)
+
+        updated_later = random_bookmark.report_exercise_outcome(
+            "Recognize", ExerciseOutcome.CORRECT, 1000, self.db.session
+        )
+        updated_later.result()
+
+        assert len(random_bookmark.exercise_log) == length_original_exercise_log + 1
+        assert random_bookmark.exercise_log[-1].outcome.outcome == ExerciseOutcome.CORRECT
+        assert UserExerciseSession.find_by_user(self.user.id)
+
     def test_user_bookmark_count(self):
         assert len(self.user.all_bookmarks()) > 0
 
     def test_bookmark_is_serializable(self):
         assert self.user.all_bookmarks()[0].json_serializable_dict()
 
+    def test_bookmarks_are_serializable_in_one_query(self):
+        from sqlalchemy import event
+
+        self.db.session.expire_all()
+        bookmarks = self.user.all_bookmarks()
+
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.db.engine, "before_cursor_execute", count)
+        try:
+            serialized = list(Bookmark.json_serializable_dicts(bookmarks))
+        finally:
+            event.remove(self.db.engine, "before_cursor_execute", count)
+
+        assert len(statements) == 1
+        assert [each["id"] for each in serialized] == [b.id for b in bookmarks]
+        assert serialized[0] == bookmarks[0].json_serializable_dict()
+
     def test_bad_quality_bookmark(self):
         random_bookmarks = [BookmarkRule(self.user).bookmark for _ in range(0, 3)]
 
@@ -234,5 +271,68 @@ class BookmarkTest(ModelTestMixIn):
         learned = is_learned_based_on_exercise_outcomes(log)
         assert not learned
 
+    def test_exercise_summary_matches_log(self):
+        random_bookmark = BookmarkRule(self.user).bookmark
+        outcome_rule = OutcomeRule()
+
+        for outcome in [outcome_rule.correct, outcome_rule.wrong, outcome_rule.correct, outcome_rule.correct]:
+            exercise = ExerciseRule().exercise
+            exercise.outcome = outcome
+            random_bookmark.add_new_exercise(exercise)
+
+        log = SortedExerciseLog(random_bookmark)
+        assert random_bookmark.last_outcome == log.latest_exercise_outcome()
+        assert random_bookmark.last_exercise_time == log.last_exercise_time()
+        assert random_bookmark.correct_days_in_streak == len(log.most_recent_correct_dates())
+        assert random_bookmark.first_exercise_correct == log.exercises[-1].is_correct()
+
+    def test_recompute_status(self):
+        from zeeguu.core.bookmark_quality.recompute_status import (
+            recompute_status_for_user,
+        )
+
+        random_bookmark = BookmarkRule(self.user).bookmark
+        exercise = ExerciseRule().exercise
+        exercise.outcome = OutcomeRule().wrong
+        random_bookmark.add_new_exercise(exercise)
+        random_bookmark.learned = True
+        random_bookmark.fit_for_study = False
+        self.db.session.add(random_bookmark)
+        self.db.session.commit()
+
+        checked, _ = recompute_status_for_user(self.db.session, self.user.id)
+
+        random_bookmark = Bookmark.find(random_bookmark.id)
+        assert checked == len(self.user.all_bookmarks())
+        assert not random_bookmark.learned
+        assert random_bookmark.fit_for_study
+
+        # nothing left to change
+        assert recompute_status_for_user(self.db.session, self.user.id)[1] == 0
+
     def test_top_bookmarks(self):
         assert top_bookmarks(self.user)
+
+    def test_top_bookmarks_are_the_quality_ones_by_rank(self):
+        from zeeguu.core.bookmark_quality import quality_top_bookmark
+
+        # with three bookmarks in it, a context is not good enough
+        first, second, third = [BookmarkRule(self.user).bookmark for _ in range(3)]
+        second.text = third.text = first.text
+        second.update_quality_flags()
+        third.update_quality_flags()
+        self.db.session.add_all([first, second, third])
+        self.db.session.commit()
+
+        expected = sorted(
+            [
+                b
+                for b in self.user.all_bookmarks()
+                if not b.learned and quality_top_bookmark(b)
+            ],
+            key=lambda b: (b.origin.rank or 100000, -b.time.timestamp()),
+        )
+        result = top_bookmarks(self.user, 3)
+
+        assert first not in result
+        assert result == expected[:3]
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from zeeguu.core.content_retriever.crawl_scheduler import (
+    update_crawl_schedule,
+    feeds_due_for_crawling,
+    MIN_CRAWL_INTERVAL,
+    MAX_CRAWL_INTERVAL,
+)
+
+
+class _Feed(object):
+    def __init__(self, id, last_crawled_time=None, next_crawl_time=None):
+        self.id = id
+        self.deactivated = 0
+        self.last_crawled_time = last_crawled_time
+        self.publish_interval_estimate = None
+        self.next_crawl_time = next_crawl_time
+
+
+class CrawlSchedulerTest(TestCase):
+    def setUp(self):
+        self.now = datetime(2020, 1, 10, 12, 0)
+
+    def test_hourly_feed_is_crawled_often(self):
+        feed = _Feed(1, last_crawled_time=self.now - timedelta(hours=4))
+        items = [self.now - timedelta(hours=h) for h in [3, 2, 1]]
+
+        update_crawl_schedule(feed, items, self.now)
+
+        assert feed.publish_interval_estimate == 3600
+        assert feed.next_crawl_time == self.now + MIN_CRAWL_INTERVAL
+
+    def test_silent_feed_backs_off(self):
+        feed = _Feed(1, last_crawled_time=self.now - timedelta(days=2))
+        feed.publish_interval_estimate = 3600 * 24
+
+        update_crawl_schedule(feed, [], self.now)
+
+        assert feed.publish_interval_estimate > 3600 * 24
+        assert feed.next_crawl_time > self.now + timedelta(hours=12)
+        assert feed.next_crawl_time <= self.now + MAX_CRAWL_INTERVAL
+
+    def test_due_feeds_most_overdue_first(self):
+        never_crawled = _Feed(1)
+        overdue = _Feed(2, next_crawl_time=self.now - timedelta(hours=5))
+        just_due = _Feed(3, next_crawl_time=self.now - timedelta(minutes=1))
+        not_due = _Feed(4, next_crawl_time=self.now + timedelta(hours=1))
+        deactivated = _Feed(5)
+        deactivated.deactivated = 1
+
+        due = list(
+            feeds_due_for_crawling(
+                [just_due, not_due, overdue, deactivated, never_crawled], self.now
+            )
+        )
+
+        assert due == [never_crawled, overdue, just_due]
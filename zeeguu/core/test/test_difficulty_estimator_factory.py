@@ -29,3 +29,38 @@ class DifficultyEstimatorFactoryTest(ModelTestMixIn, TestCase):
         for name in custom_names:
             returned_estimator = DifficultyEstimatorFactory.get_difficulty_estimator(name)
             self.assertEqual(returned_estimator, FleschKincaidDifficultyEstimator)
+
+    def test_estimate_difficulties_in_batch(self):
+        from zeeguu.core.test.rules.language_rule import LanguageRule
+
+        english = LanguageRule().en
+        texts = [
+            (1, "The cat sat on the mat.", english),
+            (2, "The Australian platypus mesmerized conservationists.", english),
+            (3, "Ich bin ein Berliner.", "de"),
+        ]
+
+        for processes in [1, 2]:
+            ids, scores = DifficultyEstimatorFactory.estimate_difficulties(
+                "fk", texts, score="grade", processes=processes, chunk_size=2
+            )
+            self.assertEqual(list(ids), [1, 2, 3])
+            self.assertEqual(
+                scores[0],
+                FleschKincaidDifficultyEstimator.estimate_difficulty(
+                    texts[0][1], english, None
+                )["grade"],
+            )
+            assert scores[0] < scores[1]
+
+    def test_estimate_difficulties_with_a_given_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        texts = [(1, "The cat sat on the mat.", "en"), (2, "Ich bin ein Berliner.", "de")]
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            for batch in [texts[:1], texts[1:]]:
+                ids, scores = DifficultyEstimatorFactory.estimate_difficulties(
+                    "fk", batch, score="grade", pool=pool
+                )
+                self.assertEqual(list(ids), [batch[0][0]])
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from zeeguu.core.exercises.distractor_index import (
+    DistractorIndex,
+    bucket_keys,
+    MIN_BUCKET_SIZE,
+)
+
+
+class DistractorIndexTest(TestCase):
+    def setUp(self):
+        # frequent, short words ending in -en; and rarer, longer ones ending in -ung
+        letters = "abcdefghijklmnopqrstuvwxyz"[:MIN_BUCKET_SIZE]
+        self.short = [f"w{letter}en" for letter in letters]
+        self.long = [f"wortbild{letter}ung" for letter in letters]
+        self.index = DistractorIndex(self.short + self.long)
+
+    def test_distractors_are_similar(self):
+        for _ in range(20):
+            distractors = self.index.distractors("gehen", 3)
+            assert len(distractors) == 2
+            assert len(set(distractors)) == 2
+            assert set(distractors) <= set(self.short)
+
+    def test_word_is_not_its_own_distractor(self):
+        for _ in range(20):
+            assert self.short[0] not in self.index.distractors(self.short[0], 1, count=3)
+
+    def test_buckets_go_from_specific_to_general(self):
+        keys = bucket_keys("gehen", 3)
+        assert [len(key) for key in keys] == [3, 2, 1]
+        assert bucket_keys("gehen", 100000)[-1] != keys[-1]
@@ -0,0 +1,84 @@
+import threading
+import time
+from functools import partial
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from unittest import TestCase
+
+from zeeguu.core.content_retriever.enrichment_queue import EnrichmentQueue
+from zeeguu.core.language.services.lingo_rank_service import retrieve_lingo_rank
+
+
+class _StubLingoRankHandler(BaseHTTPRequestHandler):
+    # the server counts the requests and fails the first failures of them
+    def do_GET(self):
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+
+        if self.server.requests <= self.server.failures:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"2.1347")
+
+    def log_message(self, *args):
+        pass
+
+
+class _Article(object):
+    def __init__(self, id, content):
+        self.id = id
+        self.content = content
+
+
+class EnrichmentQueueTest(TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), _StubLingoRankHandler)
+        self.server.requests = 0
+        self.server.failures = 0
+        self.server.delay = 0
+        # the client hangs up on the slow responses
+        self.server.handle_error = lambda *args: None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.retrieve = partial(retrieve_lingo_rank, url=url, timeout=0.5)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _queue(self):
+        return EnrichmentQueue(self.retrieve, max_workers=1, retry_delay=0.01)
+
+    def test_results(self):
+        queue = self._queue()
+        queue.submit(_Article(1, "Le chat est sur la table."))
+
+        assert queue.completed(wait=True) == [(1, 2.1)]
+        assert not queue.pending
+
+    def test_failures_are_retried(self):
+        self.server.failures = 2
+        queue = self._queue()
+        queue.submit(_Article(1, "Le chat est sur la table."))
+
+        assert queue.completed(wait=True) == [(1, 2.1)]
+        assert self.server.requests == 3
+
+    def test_slow_service_times_out(self):
+        self.server.delay = 1
+        queue = EnrichmentQueue(self.retrieve, retries=0)
+        queue.submit(_Article(1, "Le chat est sur la table."))
+
+        assert queue.completed(wait=True) == [(1, None)]
+
+    def test_same_text_is_retrieved_once(self):
+        queue = self._queue()
+        queue.submit(_Article(1, "Le chat est sur la table."))
+        queue.submit(_Article(2, "Le chat est sur la table."))
+
+        assert queue.completed(wait=True) == [(1, 2.1), (2, 2.1)]
+        assert self.server.requests == 1
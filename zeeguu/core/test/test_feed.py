@@ -30,3 +30,11 @@ class FeedTest(ModelTestMixIn, TestCase):
         assert ordered_by_time [0] . published_time >= ordered_by_time [1] . published_time
 
 
+
+    def test_crawl_is_reported(self):
+        from zeeguu.core.model import FeedCrawlRun
+
+        run = FeedCrawlRun.query.filter_by(feed=self.spiegel).one()
+        assert run.downloaded == 3
+        assert run.parse_time > 0
+        assert run.duration >= run.parse_time
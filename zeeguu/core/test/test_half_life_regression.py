@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+import numpy as np
+
+from zeeguu.core.word_scheduling.adaptive.half_life_regression import (
+    half_lives,
+    recall_probabilities,
+    counts_before_each_event,
+    due_times,
+    BASE_HALF_LIFE,
+    TARGET_RECALL,
+)
+
+
+class HalfLifeRegressionTest(TestCase):
+    def test_new_word_has_the_base_half_life(self):
+        assert np.isclose(half_lives([0], [0])[0], BASE_HALF_LIFE)
+
+    def test_half_life_grows_with_corrects_and_shrinks_with_wrongs(self):
+        assert np.all(np.diff(half_lives(np.arange(10), np.zeros(10))) > 0)
+        assert np.all(np.diff(half_lives(np.full(10, 5), np.arange(10))) < 0)
+
+    def test_recall_after_one_half_life(self):
+        half_life = half_lives([3], [1])
+        assert np.isclose(recall_probabilities(half_life, half_life)[0], TARGET_RECALL)
+
+    def test_due_after_one_half_life(self):
+        last_times = np.array(["2021-03-01T10:00:00"], dtype="datetime64[s]")
+
+        due = due_times(last_times, np.array([2.0]), TARGET_RECALL)
+
+        assert due[0] == np.datetime64("2021-03-03T10:00:00")
+
+    def test_counts_before_each_event(self):
+        words = [7, 7, 7, 3, 3, 9]
+        correct = [True, False, True, False, True, True]
+
+        corrects, wrongs, first = counts_before_each_event(words, correct)
+
+        assert list(corrects) == [0, 1, 1, 0, 0, 0]
+        assert list(wrongs) == [0, 0, 1, 0, 1, 0]
+        assert list(first) == [True, False, False, True, False, True]
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from zeeguu.core.content_retriever.near_duplicates import (
+    NearDuplicateIndex,
+    simhash,
+    hamming_distance,
+    to_db_value,
+    from_db_value,
+    MAX_HAMMING_DISTANCE,
+)
+from zeeguu.core.test.test_data.mocking_the_web import TESTDATA_FOLDER
+
+import os
+
+
+def _fixture_text(file_name):
+    from bs4 import BeautifulSoup
+
+    with open(os.path.join(TESTDATA_FOLDER, file_name), encoding="UTF-8") as f:
+        return BeautifulSoup(f.read(), "lxml").get_text()
+
+
+class NearDuplicatesTest(TestCase):
+    def setUp(self):
+        self.text = _fixture_text("investing_in_index_funds.html")
+        self.other_text = _fixture_text("plane_crashes.html")
+
+    def test_syndicated_copy_is_near_duplicate(self):
+        syndicated_copy = self.text + "\nThis story was republished with permission."
+
+        distance = hamming_distance(simhash(self.text), simhash(syndicated_copy))
+
+        assert distance <= MAX_HAMMING_DISTANCE
+
+    def test_different_texts_are_not_near_duplicates(self):
+        distance = hamming_distance(simhash(self.text), simhash(self.other_text))
+
+        assert distance > MAX_HAMMING_DISTANCE
+
+    def test_index_finds_near_duplicate(self):
+        index = NearDuplicateIndex()
+        index.add(simhash(self.text), 1)
+
+        syndicated_copy = self.text + "\nThis story was republished with permission."
+
+        assert index.find_near_duplicate(simhash(syndicated_copy)) == 1
+        assert index.find_near_duplicate(simhash(self.other_text)) is None
+
+    def test_index_evicts_oldest(self):
+        index = NearDuplicateIndex(max_size=1)
+        index.add(simhash(self.text), 1)
+        index.add(simhash(self.other_text), 2)
+
+        assert len(index) == 1
+        assert index.find_near_duplicate(simhash(self.text)) is None
+
+    def test_db_value_roundtrip(self):
+        fingerprint = simhash(self.text)
+
+        assert from_db_value(to_db_value(fingerprint)) == fingerprint
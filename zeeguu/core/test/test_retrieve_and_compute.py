@@ -1,4 +1,5 @@
 import newspaper
+from concurrent.futures import ProcessPoolExecutor
 
 import zeeguu.core
 from zeeguu.core.test.model_test_mixin import ModelTestMixIn
@@ -29,6 +30,29 @@ class TestRetrieveAndCompute(ModelTestMixIn):
         assert len(articles) == 2
         assert articles[0].fk_difficulty
 
+    def testDifficultyOfFeedItemsParsedInWorkerProcesses(self):
+        feed = RSSFeedRule().feed1
+        with ProcessPoolExecutor(max_workers=2) as parse_pool:
+            download_from_feed(
+                feed, zeeguu.core.db.session, 3, False, parse_pool=parse_pool
+            )
+
+        articles = feed.get_articles(limit=3)
+
+        assert len(articles) == 3
+        assert articles[0].fk_difficulty
+
+    def test_last_crawled_time_only_goes_past_the_crawled_items(self):
+        feed = RSSFeedRule().feed1
+        times = sorted(each["published_datetime"] for each in feed.feed_items())
+
+        download_from_feed(feed, zeeguu.core.db.session, 1, False)
+        assert feed.last_crawled_time == times[0]
+
+        download_from_feed(feed, zeeguu.core.db.session, 3, False)
+        assert feed.last_crawled_time == times[-1]
+        assert len(feed.get_articles(limit=3)) == 3
+
     def testDownloadWithTopic(self):
         feed = RSSFeedRule().feed1
         topic = Topic("Spiegel")
@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from zeeguu.core.model import UserPreference
+from zeeguu.core.test.model_test_mixin import ModelTestMixIn
+from zeeguu.core.test.rules.user_rule import UserRule
+from zeeguu.core.word_scheduling.adaptive.adaptive_scheduler import AdaptiveScheduler
+from zeeguu.core.word_scheduling.basicSR.basic_sr_scheduler import BasicSRScheduler
+from zeeguu.core.word_scheduling.scheduler_factory import SchedulerFactory
+
+
+class SchedulerFactoryTest(ModelTestMixIn, TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.user_rule = UserRule()
+        self.user_rule.add_bookmarks(5)
+        self.user = self.user_rule.user
+        for bookmark in self.user.all_bookmarks():
+            bookmark.fit_for_study = True
+            self.db.session.add(bookmark)
+        self.db.session.commit()
+
+    def test_custom_names(self):
+        assert SchedulerFactory.get_scheduler("hlr") == AdaptiveScheduler
+        assert SchedulerFactory.get_scheduler("BASIC") == BasicSRScheduler
+
+    def test_unknown_name_returns_basic(self):
+        assert SchedulerFactory.get_scheduler("unknown") == BasicSRScheduler
+        assert SchedulerFactory.get_scheduler(None) == BasicSRScheduler
+
+    def test_scheduler_is_chosen_per_user(self):
+        assert SchedulerFactory.scheduler_for(self.user) == BasicSRScheduler
+
+        UserPreference.set_word_scheduler(self.db.session, self.user, "adaptive")
+        assert SchedulerFactory.scheduler_for(self.user) == AdaptiveScheduler
+
+    def test_adaptive_scheduler_studies_new_bookmarks(self):
+        UserPreference.set_word_scheduler(self.db.session, self.user, "adaptive")
+
+        to_study = self.user.bookmarks_to_study(3)
+
+        assert len(to_study) == 3
+        assert set(to_study) <= set(self.user.all_bookmarks())
@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from zeeguu.core.language.text_processing import (
+    tokenize,
+    stem,
+    stems,
+    stemmer,
+)
+
+TEXT = "Die Häuser waren laut, aber das Haus war still. Familienoberhaupt!"
+
+
+class TextProcessingTest(TestCase):
+    def test_tokenize(self):
+        assert tokenize(TEXT)[:3] == ["Die", "Häuser", "waren"]
+        assert len(tokenize(TEXT)) == 10
+
+    def test_one_stemmer_per_language(self):
+        assert stemmer("de") is stemmer("de")
+        assert stems(["Häuser", "Haus"], "de") == ["haus", "haus"]
+
+    def test_stems_are_cached(self):
+        stem.cache_clear()
+        stems(tokenize(TEXT), "de")
+        stems(tokenize(TEXT), "de")
+
+        assert stem.cache_info().hits == 10
+
+    def test_languages_without_stemmer(self):
+        assert stems(["Dzień", "dobry"], "pl") == ["dzień", "dobry"]
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from zeeguu.core.constants import (
+    WIH_READ_NOT_CLICKED_IN_SENTENCE,
+    WIH_READ_NOT_CLICKED_OUT_SENTENCE,
+)
+from zeeguu.core.model import WordInteractionHistory
+from zeeguu.core.model.word_knowledge import word_interaction_history
+from zeeguu.core.model.word_knowledge.packed_interaction_history import (
+    PackedInteractionHistory,
+)
+from zeeguu.core.test.model_test_mixin import ModelTestMixIn
+from zeeguu.core.test.rules.language_rule import LanguageRule
+from zeeguu.core.test.rules.user_rule import UserRule
+from zeeguu.core.test.rules.user_word_rule import UserWordRule
+
+
+class WordInteractionHistoryTest(ModelTestMixIn):
+    def setUp(self):
+        super().setUp()
+        # the ids are reused by the fresh DB of every test
+        word_interaction_history._knowledge_maps.clear()
+
+        self.user = UserRule().user
+        self.language = LanguageRule().de
+        self.word = UserWordRule(language=self.language).user_word
+
+    def _save_history(self, *event_types, start_hour=0):
+        """
+        :param start_hour: of the first event, after the start of the
+        events; events at the same time as an earlier one are dropped
+        """
+        history = WordInteractionHistory.find_or_create(self.user, self.word)
+        start = datetime.now() - timedelta(days=1, hours=-start_hour)
+        for i, event_type in enumerate(event_types):
+            history.insert_event(event_type, start + timedelta(hours=i))
+        history.save_to_db(self.db.session)
+        return history
+
+    def test_summary_is_updated_with_the_events(self):
+        history = self._save_history(
+            WIH_READ_NOT_CLICKED_IN_SENTENCE,
+            WIH_READ_NOT_CLICKED_OUT_SENTENCE,
+            WIH_READ_NOT_CLICKED_OUT_SENTENCE,
+        )
+
+        assert history.event_count == 3
+        assert history.seen_in_context_count == 1
+        assert history.seen_out_of_context_count == 2
+
+    def test_json_histories_are_still_read(self):
+        history = WordInteractionHistory(self.user, self.word)
+        history.interaction_history_json = "[[1, 1600000000], [2, 1600000500]]"
+        history.reify_interaction_history()
+
+        assert [e.event_type for e in history.interaction_history] == [1, 2]
+
+        history.save_to_db(self.db.session)
+        assert history.interaction_history_json is None
+        assert len(history.interaction_history_data) == 10
+
+    def test_knowledge_map_is_kept_in_sync(self):
+        self._save_history(WIH_READ_NOT_CLICKED_IN_SENTENCE)
+        knowledge = WordInteractionHistory.knowledge_map(self.user, self.language)
+        assert knowledge[self.word.word].event_count == 1
+
+        self._save_history(WIH_READ_NOT_CLICKED_OUT_SENTENCE, start_hour=1)
+        knowledge = WordInteractionHistory.knowledge_map(self.user, self.language)
+        assert knowledge[self.word.word].event_count == 2
+        assert knowledge[self.word.word].seen_out_of_context_count == 1
+
+    def test_missing_summaries_are_saved(self):
+        history = WordInteractionHistory(self.user, self.word)
+        history.interaction_history_json = "[[1, 1600000000], [2, 1600000500]]"
+        self.db.session.add(history)
+        self.db.session.commit()
+        assert history.event_count is None
+
+        knowledge = WordInteractionHistory.knowledge_map(self.user, self.language)
+
+        assert knowledge[self.word.word].event_count == 2
+        self.db.session.expire(history)
+        assert history.event_count == 2
+
+
+class PackedInteractionHistoryTest(TestCase):
+    def test_events_are_kept_sorted(self):
+        history = PackedInteractionHistory(10)
+        for event_type, seconds in [(1, 30), (2, 10), (3, 20)]:
+            history.insert(event_type, seconds)
+
+        assert [e.seconds_since_epoch for e in history] == [10, 20, 30]
+        assert [e.event_type for e in history.until(20)] == [2, 3]
+        assert history.contains_time(20)
+        assert not history.contains_time(25)
+
+    def test_oldest_events_are_evicted(self):
+        history = PackedInteractionHistory(2)
+        for seconds in [10, 20, 30]:
+            history.insert(1, seconds)
+        # older than all the events of a full history
+        history.insert(1, 5)
+
+        assert [e.seconds_since_epoch for e in history] == [20, 30]
+
+    def test_round_trip(self):
+        history = PackedInteractionHistory.from_pairs([(0, 1600000000), (10, 1600000100)], 50)
+        packed = history.to_bytes()
+
+        assert len(packed) == 10
+        assert list(PackedInteractionHistory.from_bytes(packed, 50)) == list(history)
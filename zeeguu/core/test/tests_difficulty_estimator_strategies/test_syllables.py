@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from zeeguu.core.language import syllables
+from zeeguu.core.language.syllables import (
+    hyphenator,
+    syllables_in_word,
+    syllables_in_text,
+)
+
+
+class SyllablesTest(TestCase):
+    def test_one_hyphenator_per_language(self):
+        assert hyphenator("de") is hyphenator("de")
+        assert hyphenator("de") is not hyphenator("fr")
+
+    def test_norwegian_uses_bokmal_dictionary(self):
+        assert hyphenator("no") is not None
+
+    def test_syllables(self):
+        assert syllables_in_word("cat", "en") == 1
+        assert syllables_in_word("frühstücksfernsehen", "de") > 3
+        assert syllables_in_text(["cat", "cat", "sat"], "en") == 3
+
+    def test_counts_are_cached(self):
+        syllables_in_word.cache_clear()
+        syllables_in_text(["the", "cat", "sat", "on", "the", "mat"], "en")
+        syllables_in_text(["the", "cat"], "en")
+
+        info = syllables_in_word.cache_info()
+        assert info.misses == 5
+        assert info.hits == 2
+
+    def test_languages_without_hyphenation(self):
+        assert syllables_in_word("你好", "zh-CN") == 1
+        assert "zh-CN" not in syllables._hyphenators
@@ -0,0 +1,96 @@
+import os
+import tempfile
+from collections import ChainMap
+from unittest import TestCase
+
+from zeeguu.core.language import text_processing, word_score_tables
+from zeeguu.core.language.text_processing import stem_ids
+from zeeguu.core.language.token_profile import ScoreVector, UNKNOWN_STEM_SCORE
+from zeeguu.core.language.word_score_tables import WordScoreTable, load_or_build
+
+SCORES = {"haus": 0.25, "katz": 0.5, "übung": 1.0, "a": 0.0}
+
+
+class WordScoreTableTest(TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "frequency-de.scores")
+        WordScoreTable.write(self.path, SCORES)
+        self.table = WordScoreTable(self.path)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_same_scores_as_the_map(self):
+        assert len(self.table) == len(SCORES)
+        for stem, score in SCORES.items():
+            assert self.table[stem] == score
+
+        assert sorted(self.table) == sorted(SCORES)
+
+    def test_missing_stems(self):
+        assert "hund" not in self.table
+        assert self.table.get("hund") is None
+        with self.assertRaises(KeyError):
+            self.table["zzz"]
+
+    def test_user_scores_on_top(self):
+        score_map = ChainMap(dict(), self.table)
+        score_map["haus"] = 0.75
+
+        assert score_map["haus"] == 0.75
+        assert score_map["katz"] == 0.5
+        assert self.table["haus"] == 0.25
+
+    def test_score_vector_of_the_table(self):
+        vector = ScoreVector.from_score_map(self.table)
+
+        scores = vector.scores_for(stem_ids(["katz", "hund", "übung"]))
+
+        assert list(scores) == [0.5, UNKNOWN_STEM_SCORE, 1.0]
+
+    def test_empty_table(self):
+        WordScoreTable.write(self.path, {})
+        assert len(WordScoreTable(self.path)) == 0
+
+
+class LoadOrBuildTest(TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.configured_folder = word_score_tables.WORD_SCORE_TABLES_FOLDER
+        word_score_tables.WORD_SCORE_TABLES_FOLDER = self.folder.name
+        word_score_tables._loaded_tables.clear()
+
+    def tearDown(self):
+        word_score_tables.WORD_SCORE_TABLES_FOLDER = self.configured_folder
+        word_score_tables._loaded_tables.clear()
+        self.folder.cleanup()
+
+    def test_table_is_rebuilt_when_the_stems_change(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return SCORES
+
+        assert load_or_build("frequency-de", build)["haus"] == 0.25
+        word_score_tables._loaded_tables.clear()
+        load_or_build("frequency-de", build)
+        assert len(builds) == 1
+
+        stemming_version = text_processing.STEMMING_VERSION
+        try:
+            text_processing.STEMMING_VERSION += 1
+            word_score_tables._loaded_tables.clear()
+            load_or_build("frequency-de", build)
+        finally:
+            text_processing.STEMMING_VERSION = stemming_version
+        assert len(builds) == 2
+
+    def test_without_a_folder_the_map_is_kept_in_memory(self):
+        word_score_tables.WORD_SCORE_TABLES_FOLDER = None
+
+        score_map = load_or_build("frequency-de", lambda: SCORES)
+
+        assert score_map == SCORES
+        assert not os.listdir(self.folder.name)
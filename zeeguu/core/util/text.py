@@ -1,13 +1,7 @@
-import math
-
-import nltk
-import pyphen
-import regex
-from collections import Counter
-from nltk import SnowballStemmer
 from zeeguu.core.model import Language
-
-AVERAGE_SYLLABLE_LENGTH = 2.5
+from zeeguu.core.language.sentences import count_sentences_fast, sentences
+from zeeguu.core.language.syllables import syllables_in_text
+from zeeguu.core.language.text_processing import tokenize, stems
 
 """
     Collection of simple text processing functions
@@ -15,13 +9,11 @@ AVERAGE_SYLLABLE_LENGTH = 2.5
 
 
 def split_words_from_text(text):
-    words = regex.findall(r'(\b\p{L}+\b)', text)
-    return words
+    return tokenize(text)
 
 def split_unique_words_from_text(text, language:Language):
     words = split_words_from_text(text)
-    stemmer = SnowballStemmer(language.name.lower())
-    return set([stemmer.stem(w.lower()) for w in words])
+    return set(stems(words, language.code))
 
 def length(text):
     return len(split_words_from_text(text))
@@ -31,31 +23,20 @@ def unique_length(text, language: Language):
     return len(words_unique)
 
 def number_of_sentences(text):
-    return len(nltk.sent_tokenize(text))
+    return count_sentences_fast(text)
 
 def average_sentence_length(text):
     return length(text)/number_of_sentences(text)
 
 def median_sentence_length(text):
-    sentence_lengths = [length(s) for s in nltk.sent_tokenize(text)]
+    sentence_lengths = [length(s) for s in sentences(text)]
     sentence_lengths = sorted(sentence_lengths)
 
     return sentence_lengths[int(len(sentence_lengths)/2)]
 
 def number_of_syllables(text, language:Language):
     words = [w.lower() for w in split_words_from_text(text)]
-
-    number_of_syllables = 0
-    for word, freq in Counter(words).items():
-        if language.code == "zh-CN":
-            syllables = int(math.floor(max(len(word) / AVERAGE_SYLLABLE_LENGTH,1)))
-        else:
-            dic = pyphen.Pyphen(lang=language.code)
-            syllables = len(dic.positions(word)) + 1
-
-        number_of_syllables += syllables * freq
-
-    return number_of_syllables
+    return syllables_in_text(words, language.code)
 
 def average_word_length(text, language:Language):
     return number_of_syllables(text, language)/length(text)
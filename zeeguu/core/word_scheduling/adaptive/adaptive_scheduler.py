@@ -0,0 +1,113 @@
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import case, func
+
+import zeeguu.core
+from zeeguu.core.model import Bookmark, Exercise, ExerciseOutcome, UserWord
+from zeeguu.core.model.bookmark import bookmark_exercise_mapping
+from zeeguu.core.word_scheduling.adaptive.half_life_regression import (
+    half_lives,
+    due_times,
+)
+from zeeguu.core.word_scheduling.scheduler_strategy import SchedulerStrategy
+
+UNKNOWN_RANK = 100000
+
+
+class AdaptiveScheduler(SchedulerStrategy):
+    """
+    Schedules by a half-life regression model of forgetting (see
+    half_life_regression). Nothing is stored: the corrects, wrongs,
+    and last exercise time of all the bookmarks of the user come from
+    one grouped query over their exercises, and the time at which each
+    of them is due is computed in one NumPy pass.
+
+    The due bookmarks are those whose recall probability fell to
+    TARGET_RECALL, the ones that are due since the longest first; after them
+    come the bookmarks that were never practiced, the starred and
+    the more frequent words first.
+    """
+
+    CUSTOM_NAMES = ["adaptive", "hlr"]
+
+    @classmethod
+    def bookmarks_to_study(cls, user, required_count):
+        ids, starred, ranks, corrects, wrongs, last_times = cls._exercise_history(user)
+        if not len(ids):
+            return []
+
+        practiced = (corrects + wrongs) > 0
+        now = np.datetime64(datetime.now(), "s")
+
+        # the never practiced ones have no last time, and are never due
+        due_time = np.full(len(ids), np.datetime64("NaT"), dtype="datetime64[s]")
+        due_time[practiced] = due_times(
+            last_times[practiced], half_lives(corrects[practiced], wrongs[practiced])
+        )
+
+        due = np.flatnonzero(practiced & (due_time <= now))
+        due = due[np.argsort(due_time[due], kind="stable")]
+
+        new = np.flatnonzero(~practiced)
+        # lexsort sorts by the last key first
+        new = new[np.lexsort((ranks[new], ~starred[new]))]
+
+        chosen = np.concatenate([due, new])[:required_count]
+        return Bookmark.find_many_with_context([int(id) for id in ids[chosen]])
+
+    @classmethod
+    def update(cls, db_session, bookmark, correctness, time=None):
+        # the exercise itself is all the history there is
+        pass
+
+    @classmethod
+    def _exercise_history(cls, user):
+        """
+        :return: arrays with the id, starred, rank, number of correct and
+        wrong exercises, and time of the last exercise of each of the
+        bookmarks the user could study
+        """
+        is_correct = case(
+            [(ExerciseOutcome.outcome.in_(ExerciseOutcome.correct_outcomes), 1)],
+            else_=0,
+        )
+
+        rows = (
+            zeeguu.core.db.session.query(
+                Bookmark.id,
+                Bookmark.starred,
+                UserWord.rank,
+                func.count(Exercise.id),
+                func.sum(is_correct),
+                func.max(Exercise.time),
+            )
+            .join(UserWord, Bookmark.origin_id == UserWord.id)
+            .outerjoin(
+                bookmark_exercise_mapping,
+                bookmark_exercise_mapping.c.bookmark_id == Bookmark.id,
+            )
+            .outerjoin(Exercise, bookmark_exercise_mapping.c.exercise_id == Exercise.id)
+            .outerjoin(ExerciseOutcome, Exercise.outcome_id == ExerciseOutcome.id)
+            .filter(Bookmark.user_id == user.id)
+            .filter(UserWord.language_id == user.learned_language_id)
+            .filter(Bookmark.learned == False)
+            .filter((Bookmark.fit_for_study == True) | (Bookmark.starred == True))
+            .group_by(Bookmark.id, Bookmark.starred, UserWord.rank)
+            .all()
+        )
+
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        starred = np.array([bool(row[1]) for row in rows], dtype=bool)
+        ranks = np.array(
+            [row[2] if row[2] is not None else UNKNOWN_RANK for row in rows],
+            dtype=np.int64,
+        )
+        exercises = np.array([row[3] for row in rows], dtype=np.int64)
+        corrects = np.array([row[4] or 0 for row in rows], dtype=np.int64)
+        last_times = np.array(
+            [row[5] if row[5] is not None else "NaT" for row in rows],
+            dtype="datetime64[s]",
+        )
+
+        return ids, starred, ranks, corrects, exercises - corrects, last_times
@@ -0,0 +1,97 @@
+"""
+
+    A half-life regression model of forgetting (Settles & Meeder, 2016),
+    computed with NumPy for many words at once.
+
+    The probability that a word is recalled, elapsed days after the
+    last exercise, is 2 ** (-elapsed / half_life). The half-life grows
+    with the number of correct exercises and shrinks with the number
+    of wrong ones:
+
+        half_life = BASE_HALF_LIFE * 2 ** (THETA . [sqrt(1 + corrects), sqrt(1 + wrongs), 1])
+
+    A word is due once its recall probability falls to TARGET_RECALL.
+    With the default THETA a new word has a half-life of one day, and
+    about 3, 8, and 22 days after 3, 8, and 15 correct exercises.
+
+    Only NumPy is needed here, such that tools/simulate_schedulers.py
+    can replay exercise logs without the rest of the scheduler.
+
+"""
+
+import numpy as np
+
+BASE_HALF_LIFE = 1.0  # days
+
+# weights of sqrt(1 + corrects), sqrt(1 + wrongs), and the bias
+THETA = np.array([1.5, -0.75, -0.75])
+
+MIN_HALF_LIFE = 15 / (24 * 60)  # 15 minutes
+MAX_HALF_LIFE = 365.0
+
+TARGET_RECALL = 0.5
+
+ONE_DAY = np.timedelta64(1, "D")
+
+
+def half_lives(corrects, wrongs, theta=THETA):
+    """
+    :param corrects, wrongs: arrays with the number of correct and
+    wrong exercises of each word
+    :return: the half-life of each word, in days
+    """
+    corrects = np.asarray(corrects, dtype=float)
+    wrongs = np.asarray(wrongs, dtype=float)
+
+    exponents = (
+        theta[0] * np.sqrt(1 + corrects) + theta[1] * np.sqrt(1 + wrongs) + theta[2]
+    )
+    return np.clip(BASE_HALF_LIFE * np.exp2(exponents), MIN_HALF_LIFE, MAX_HALF_LIFE)
+
+
+def recall_probabilities(elapsed_days, half_life):
+    return np.exp2(-np.asarray(elapsed_days, dtype=float) / half_life)
+
+
+def due_times(last_times, half_life, target_recall=TARGET_RECALL):
+    """
+    :param last_times: datetime64 array with the time of the last exercise
+    :return: datetime64 array with the time at which each of the words
+    is recalled with probability target_recall
+    """
+    interval_days = -half_life * np.log2(target_recall)
+    return last_times + (interval_days * 24 * 60 * 60).astype("timedelta64[s]")
+
+
+def elapsed_days(since, now):
+    return (now - since) / ONE_DAY
+
+
+def counts_before_each_event(word_indices, correct):
+    """
+    For exercise logs: the corrects and wrongs of the word of each
+    exercise, before that exercise.
+
+    :param word_indices: the word of each exercise; the exercises of
+    a word are consecutive, in chronological order
+    :param correct: boolean array, whether each exercise was correct
+    :return: corrects, wrongs, and whether it is the first exercise
+    of its word
+    """
+    word_indices = np.asarray(word_indices)
+    correct = np.asarray(correct, dtype=np.int64)
+    n = len(word_indices)
+
+    first = np.ones(n, dtype=bool)
+    first[1:] = word_indices[1:] != word_indices[:-1]
+
+    # the position of the first exercise of the word of each exercise
+    starts = np.maximum.accumulate(np.where(first, np.arange(n), 0))
+
+    positions = np.arange(n) - starts
+    corrects_including = np.cumsum(correct)
+    corrects_before = corrects_including - correct
+    corrects = corrects_before - (corrects_before[starts] if n else 0)
+    wrongs = positions - corrects
+
+    return corrects, wrongs, first
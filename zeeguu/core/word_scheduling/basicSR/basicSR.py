@@ -2,7 +2,6 @@ from zeeguu.core.model import Bookmark, UserWord
 
 import zeeguu.core
 from zeeguu.core.model.bookmark import CORRECTS_IN_A_ROW_FOR_LEARNED
-from zeeguu.core.sql.query_building import list_of_dicts_from_query
 
 db = zeeguu.core.db
 
@@ -17,6 +16,56 @@ NEXT_COOLING_INTERVAL_ON_SUCCESS = {
     4 * ONE_DAY: 8 * ONE_DAY,
 }
 
+# the results of apply_outcome
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+LEARNED = "learned"
+
+
+def apply_outcome(schedule, correctness, now=None):
+    """
+    Updates the next_practice_time, consecutive_correct_answers, and
+    cooling_interval of a schedule (a BasicSRSchedule or a ScheduleState
+    of the DueQueue) after an exercise
+
+    :param now: the time of the exercise; given when replaying
+    exercise logs, see tools/simulate_schedulers.py
+
+    :return: UPDATED, UNCHANGED, or LEARNED; the schedule of a learned
+    bookmark is not needed anymore
+    """
+    now = now or datetime.now()
+
+    if correctness:
+
+        if schedule.consecutive_correct_answers == CORRECTS_IN_A_ROW_FOR_LEARNED - 1:
+            return LEARNED
+
+        if now < schedule.next_practice_time:
+            # a user might have arrived here by doing the
+            # bookmarks in a text for a second time...
+            # in general, as long as they didn't wait for the
+            # cooldown perio, they might have arrived to do
+            # the exercise again; but it should not count
+            return UNCHANGED
+
+        new_cooling_interval = NEXT_COOLING_INTERVAL_ON_SUCCESS[
+            schedule.cooling_interval
+        ]
+        next_practice_date = now + timedelta(
+            minutes=new_cooling_interval
+        )
+        schedule.cooling_interval = new_cooling_interval
+        schedule.next_practice_time = next_practice_date
+        schedule.consecutive_correct_answers += 1
+
+    else:
+        schedule.next_practice_time = now
+        schedule.cooling_interval = 0
+        schedule.consecutive_correct_answers = 0
+
+    return UPDATED
+
 
 class BasicSRSchedule(db.Model):
     __table_args__ = {"mysql_collate": "utf8_bin"}
@@ -40,106 +89,28 @@ class BasicSRSchedule(db.Model):
         self.consecutive_correct_answers = 0
         self.cooling_interval = 0
 
-    def update_schedule(self, db_session, correctness):
-        if correctness:
-
-            if self.consecutive_correct_answers == CORRECTS_IN_A_ROW_FOR_LEARNED - 1:
-                self.bookmark.learned = True
-                self.bookmark.learned_time = datetime.now()
-                db.session.add(self.bookmark)
-                db.session.commit()
-                db.session.delete(self)
-                db.session.commit()
-                return
-
-            if datetime.now() < self.next_practice_time:
-                # a user might have arrived here by doing the
-                # bookmarks in a text for a second time...
-                # in general, as long as they didn't wait for the
-                # cooldown perio, they might have arrived to do
-                # the exercise again; but it should not count
-                return
-
-            new_cooling_interval = NEXT_COOLING_INTERVAL_ON_SUCCESS[
-                self.cooling_interval
-            ]
-            next_practice_date = datetime.now() + timedelta(
-                minutes=new_cooling_interval
-            )
-            self.cooling_interval = new_cooling_interval
-            self.next_practice_time = next_practice_date
-            self.consecutive_correct_answers += 1
-
-        else:
-            self.next_practice_time = datetime.now()
-            self.cooling_interval = 0
-            self.consecutive_correct_answers = 0
-
-        db_session.add(self)
-        db_session.commit()
-
-    @classmethod
-    def update(cls, db_session, bookmark, correctness):
-        schedule = cls.find_or_create(db_session, bookmark)
-        schedule.update_schedule(db_session, correctness)
-
     @classmethod
-    def find_or_create(cls, db_session, bookmark):
-
-        results = cls.query.filter_by(bookmark=bookmark).all()
-        print(results)
-        if len(results) == 1:
-            print(len(results))
-            print("getting the first element in results")
-            return results[0]
-
-        if len(results) > 1:
-            raise Exception(
-                f"More than one Bookmark schedule entry found for {bookmark.id}"
-            )
-
-        # create a new one
-        b = cls(bookmark)
-        db_session.add(b)
-        db_session.commit()
-        return b
-
-    @classmethod
-    def bookmarks_to_study(cls, user, required_count):
-        scheduled = (
-            Bookmark.query.join(cls)
-            .filter(Bookmark.user_id == user.id)
-            .join(UserWord, Bookmark.origin_id == UserWord.id)
-            .filter(UserWord.language_id == user.learned_language_id)
-            .filter(cls.next_practice_time < datetime.now())
-            .limit(required_count)
-            .all()
+    def update(cls, db_session, bookmark, correctness, time=None):
+        """
+            Reschedules the bookmark after an exercise; see DueQueue.
+            The caller commits.
+        """
+        from zeeguu.core.word_scheduling.basicSR.due_queue import DueQueue
+
+        DueQueue.for_bookmark(bookmark).report_outcome(
+            db_session, bookmark, correctness, time
         )
 
-        return scheduled
-
     @classmethod
-    def schedule_some_more_bookmarks(cls, session, user, required_count):
-
-        from zeeguu.core.sql.queries.query_loader import load_query
-
-        query = load_query("words_to_study")
-        result = list_of_dicts_from_query(
-            query,
-            {
-                "user_id": user.id,
-                "language_id": user.learned_language.id,
-                "required_count": required_count,
-            },
-        )
+    def bookmarks_to_study(cls, user, required_count):
+        """
+            The bookmarks of the user that are due for practice; when
+            there are fewer than required_count, topped up with the best
+            bookmarks that are not yet scheduled, which get scheduled now.
 
-        for b in result:
-            print(b)
-            id = b["bookmark_id"]
-            b = Bookmark.find(id)
-            print(f"scheduling another bookmark_id for now: {id} ")
-            n = cls(b)
-            print(n)
-            session.add(n)
+            The due bookmarks come from the in-memory DueQueue of the user;
+            the bookmarks are loaded together with their words and context.
+        """
+        from zeeguu.core.word_scheduling.basicSR.due_queue import DueQueue
 
-        session.commit()
+        return DueQueue.for_user(user).bookmarks_to_study(db.session, required_count)
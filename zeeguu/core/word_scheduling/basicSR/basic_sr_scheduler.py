@@ -0,0 +1,19 @@
+from zeeguu.core.word_scheduling.basicSR.basicSR import BasicSRSchedule
+from zeeguu.core.word_scheduling.scheduler_strategy import SchedulerStrategy
+
+
+class BasicSRScheduler(SchedulerStrategy):
+    """
+    Fixed cooling intervals of one, two, four, and eight days, kept in
+    basic_sr_schedule; see BasicSRSchedule and DueQueue
+    """
+
+    CUSTOM_NAMES = ["basicSR", "basic"]
+
+    @classmethod
+    def bookmarks_to_study(cls, user, required_count):
+        return BasicSRSchedule.bookmarks_to_study(user, required_count)
+
+    @classmethod
+    def update(cls, db_session, bookmark, correctness, time=None):
+        BasicSRSchedule.update(db_session, bookmark, correctness, time)
@@ -0,0 +1,328 @@
+"""
+
+    The BasicSRSchedule entries of a user, in memory.
+
+    Instead of scanning basic_sr_schedule (joined with bookmark and
+    user_word) at every request for bookmarks to study, the schedules
+    of a user in their learned language are loaded once into a heap
+    keyed by the next practice time, with the starred bookmarks and
+    the more frequent words first among those due at the same time.
+
+    The queue is only a cache for reading: the table stays the truth.
+    The outcome of an exercise is written to the table in the
+    transaction of the exercise, and new schedules are inserted right
+    away, such that the other processes don't schedule the same
+    bookmarks again.
+
+    The queues expire after MAX_AGE, since the other processes of the
+    API have their own queues and change the same schedules; an
+    expired queue is loaded again from the table. Till then, a queue
+    might miss the changes of the other processes; but not when
+    writing: an outcome is applied to the schedule as it is in the
+    table.
+
+"""
+
+import heapq
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import RLock
+
+import zeeguu.core
+from zeeguu.core.model import Bookmark, UserWord
+from zeeguu.core.sql.query_building import list_of_dicts_from_query
+from zeeguu.core.word_scheduling.basicSR.basicSR import (
+    BasicSRSchedule,
+    apply_outcome,
+    LEARNED,
+    UNCHANGED,
+)
+
+db = zeeguu.core.db
+
+MAX_QUEUES = 1000
+MAX_AGE = timedelta(minutes=10)
+
+
+class ScheduleState(object):
+    __slots__ = (
+        "bookmark_id",
+        "next_practice_time",
+        "consecutive_correct_answers",
+        "cooling_interval",
+        "starred",
+        "rank",
+        "version",
+    )
+
+    def __init__(
+        self,
+        bookmark_id,
+        next_practice_time,
+        consecutive_correct_answers,
+        cooling_interval,
+        starred,
+        rank,
+    ):
+        self.bookmark_id = bookmark_id
+        self.next_practice_time = next_practice_time
+        self.consecutive_correct_answers = consecutive_correct_answers or 0
+        self.cooling_interval = cooling_interval or 0
+        self.starred = bool(starred)
+        self.rank = rank
+        self.version = 0
+
+    def heap_entry(self):
+        return (
+            self.next_practice_time,
+            not self.starred,
+            self.rank is None,
+            self.rank or 0,
+            self.bookmark_id,
+            self.version,
+        )
+
+
+class DueQueue(object):
+    _queues = OrderedDict()
+    _queues_lock = RLock()
+
+    def __init__(self, user_id, language_id):
+        self.user_id = user_id
+        self.language_id = language_id
+        self.lock = RLock()
+
+        self.states = {}
+        self.heap = []
+        self.loaded_at = None
+
+    @classmethod
+    def for_user(cls, user):
+        return cls._get(user.id, user.learned_language_id)
+
+    @classmethod
+    def for_bookmark(cls, bookmark):
+        return cls._get(bookmark.user_id, bookmark.origin.language_id)
+
+    @classmethod
+    def _get(cls, user_id, language_id):
+        key = (user_id, language_id)
+        with cls._queues_lock:
+            queue = cls._queues.get(key)
+            if queue is not None and not queue._expired():
+                cls._queues.move_to_end(key)
+                return queue
+
+        # loaded without the lock, such that the other users don't wait
+        loaded = cls(user_id, language_id)
+        loaded.load(db.session)
+
+        with cls._queues_lock:
+            queue = cls._queues.get(key)
+            # another thread might have loaded it in the meantime; that
+            # one might already have changes, so it is kept
+            if queue is None or queue._expired():
+                queue = loaded
+                cls._queues[key] = queue
+
+            cls._queues.move_to_end(key)
+            if len(cls._queues) > MAX_QUEUES:
+                cls._queues.popitem(last=False)
+
+            return queue
+
+    def _expired(self):
+        return datetime.now() - self.loaded_at > MAX_AGE
+
+    @classmethod
+    def forget_all(cls):
+        """
+        Drops the queues, e.g. in the tests
+        """
+        with cls._queues_lock:
+            cls._queues.clear()
+
+    def load(self, session):
+        """
+        Loads the schedules of the user from the table. Also checks them:
+        a bookmark should have at most one schedule, and the schedules
+        of the learned bookmarks should have been deleted; the others
+        are deleted, and the caller commits
+        """
+        rows = (
+            session.query(
+                BasicSRSchedule.id,
+                BasicSRSchedule.bookmark_id,
+                BasicSRSchedule.next_practice_time,
+                BasicSRSchedule.consecutive_correct_answers,
+                BasicSRSchedule.cooling_interval,
+                Bookmark.starred,
+                Bookmark.learned,
+                UserWord.rank,
+            )
+            .join(Bookmark, BasicSRSchedule.bookmark_id == Bookmark.id)
+            .join(UserWord, Bookmark.origin_id == UserWord.id)
+            .filter(Bookmark.user_id == self.user_id)
+            .filter(UserWord.language_id == self.language_id)
+            .order_by(BasicSRSchedule.id)
+            .all()
+        )
+
+        inconsistent = []
+        for id, bookmark_id, time, correct, cooling, starred, learned, rank in rows:
+            if learned or bookmark_id in self.states:
+                inconsistent.append(id)
+                continue
+            self.states[bookmark_id] = ScheduleState(
+                bookmark_id, time, correct, cooling, starred, rank
+            )
+
+        if inconsistent:
+            zeeguu.core.warning(
+                f"deleting {len(inconsistent)} duplicate or learned schedules of user {self.user_id}"
+            )
+            session.query(BasicSRSchedule).filter(
+                BasicSRSchedule.id.in_(inconsistent)
+            ).delete(synchronize_session=False)
+
+        self.heap = [state.heap_entry() for state in self.states.values()]
+        heapq.heapify(self.heap)
+        self.loaded_at = datetime.now()
+
+    def due_bookmark_ids(self, count, now=None):
+        """
+        :return: the ids of at most count bookmarks that are due; the
+        earliest first. O(count log n)
+        """
+        now = now or datetime.now()
+        due = []
+        popped = []
+        with self.lock:
+            while self.heap and len(due) < count:
+                entry = heapq.heappop(self.heap)
+                state = self.states.get(entry[4])
+                if state is None or state.version != entry[5]:
+                    # outdated by a later change
+                    continue
+                popped.append(entry)
+                if entry[0] >= now:
+                    break
+                due.append(state.bookmark_id)
+
+            for entry in popped:
+                heapq.heappush(self.heap, entry)
+
+        return due
+
+    def bookmarks_to_study(self, session, required_count):
+        from zeeguu.core.sql.queries.query_loader import load_query
+
+        ids = self.due_bookmark_ids(required_count)
+
+        if len(ids) < required_count:
+            rows = list_of_dicts_from_query(
+                load_query("words_to_schedule"),
+                {
+                    "user_id": self.user_id,
+                    "language_id": self.language_id,
+                    "required_count": required_count - len(ids),
+                },
+            )
+            new_ids = [row["bookmark_id"] for row in rows]
+            self.schedule(session, rows)
+            ids += new_ids
+
+        # the new schedules, and the ones that load deleted; before the
+        # bookmarks are loaded, such that they are not expired
+        session.commit()
+
+        return Bookmark.find_many_with_context(ids)
+
+    def schedule(self, session, rows):
+        """
+        Inserts new schedules, due now, for the bookmarks; the caller
+        commits
+        :param rows: bookmark_id, starred, and rank of the bookmarks
+        """
+        rows = [row for row in rows if row["bookmark_id"] not in self.states]
+        if not rows:
+            return
+
+        now = datetime.now()
+        session.bulk_insert_mappings(
+            BasicSRSchedule,
+            [
+                dict(
+                    bookmark_id=row["bookmark_id"],
+                    next_practice_time=now,
+                    consecutive_correct_answers=0,
+                    cooling_interval=0,
+                )
+                for row in rows
+            ],
+        )
+
+        with self.lock:
+            for row in rows:
+                state = ScheduleState(
+                    row["bookmark_id"], now, 0, 0, row["starred"], row["rank"]
+                )
+                self.states[state.bookmark_id] = state
+                heapq.heappush(self.heap, state.heap_entry())
+
+    def report_outcome(self, session, bookmark, correctness, time=None):
+        """
+        Updates the schedule of the bookmark after an exercise, in the
+        table and in the queue; does not commit, that is left to the
+        caller. The schedule is read from the table, and locked till the
+        commit, since another process might have changed it after this
+        queue was loaded
+
+        :param time: when the exercise was done; by default, now
+        """
+        schedule = (
+            session.query(BasicSRSchedule)
+            .filter(BasicSRSchedule.bookmark_id == bookmark.id)
+            .with_for_update()
+            .first()
+        )
+        if schedule is None:
+            schedule = BasicSRSchedule(bookmark_id=bookmark.id)
+
+        result = apply_outcome(schedule, correctness, time)
+
+        if result == LEARNED:
+            bookmark.learned = True
+            bookmark.learned_time = time or datetime.now()
+            session.add(bookmark)
+            if schedule.id:
+                session.delete(schedule)
+            with self.lock:
+                self.states.pop(bookmark.id, None)
+            return
+
+        if result != UNCHANGED:
+            session.add(schedule)
+
+        self._cache(schedule, bookmark)
+
+    def _cache(self, schedule, bookmark):
+        with self.lock:
+            state = self.states.get(bookmark.id)
+            if state is None:
+                state = ScheduleState(
+                    bookmark.id,
+                    schedule.next_practice_time,
+                    schedule.consecutive_correct_answers,
+                    schedule.cooling_interval,
+                    bookmark.starred,
+                    bookmark.origin.rank,
+                )
+                self.states[bookmark.id] = state
+            else:
+                state.next_practice_time = schedule.next_practice_time
+                state.consecutive_correct_answers = schedule.consecutive_correct_answers
+                state.cooling_interval = schedule.cooling_interval
+                state.version += 1
+
+            heapq.heappush(self.heap, state.heap_entry())
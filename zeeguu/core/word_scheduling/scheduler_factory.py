@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Type
+
+from zeeguu.core.word_scheduling.scheduler_strategy import SchedulerStrategy
+
+# the scheduler of a user is looked up at every exercise; it
+# is kept for a while, also by the other processes of the API
+CACHED_USERS = 10000
+CACHE_MAX_AGE = timedelta(minutes=5)
+
+
+class SchedulerFactory:
+
+    _cached_names = OrderedDict()
+    _cache_lock = Lock()
+
+    @classmethod
+    def _schedulers(cls):
+        from zeeguu.core.word_scheduling.basicSR.basic_sr_scheduler import (
+            BasicSRScheduler,
+        )
+        from zeeguu.core.word_scheduling.adaptive.adaptive_scheduler import (
+            AdaptiveScheduler,
+        )
+
+        return [BasicSRScheduler, AdaptiveScheduler]
+
+    @classmethod
+    def get_scheduler(cls, scheduler_name: str) -> Type[SchedulerStrategy]:
+        """
+        Returns the scheduler based on the given name: a class name, or
+        one of the custom names of a scheduler. The first one (the basic
+        SR) when no scheduler has the name.
+        """
+        schedulers = cls._schedulers()
+
+        for scheduler in schedulers:
+            if scheduler.__name__ == scheduler_name:
+                return scheduler
+
+        for scheduler in schedulers:
+            if scheduler_name and scheduler.has_custom_name(scheduler_name):
+                return scheduler
+
+        return schedulers[0]
+
+    @classmethod
+    def scheduler_for(cls, user) -> Type[SchedulerStrategy]:
+        """
+        The scheduler chosen for the user (see UserPreference.WORD_SCHEDULER)
+        """
+        return cls.get_scheduler(cls._scheduler_name(user.id))
+
+    @classmethod
+    def forget(cls, user_id):
+        with cls._cache_lock:
+            cls._cached_names.pop(user_id, None)
+
+    @classmethod
+    def forget_all(cls):
+        with cls._cache_lock:
+            cls._cached_names.clear()
+
+    @classmethod
+    def _scheduler_name(cls, user_id):
+        from zeeguu.core.model import User, UserPreference
+
+        now = datetime.now()
+        with cls._cache_lock:
+            cached = cls._cached_names.get(user_id)
+            if cached and now - cached[0] < CACHE_MAX_AGE:
+                return cached[1]
+
+        name = UserPreference.get_word_scheduler(User.query.get(user_id))
+
+        with cls._cache_lock:
+            cls._cached_names[user_id] = (now, name)
+            cls._cached_names.move_to_end(user_id)
+            if len(cls._cached_names) > CACHED_USERS:
+                cls._cached_names.popitem(last=False)
+
+        return name
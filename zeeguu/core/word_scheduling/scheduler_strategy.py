@@ -0,0 +1,41 @@
+from abc import abstractmethod
+
+
+class SchedulerStrategy:
+    """
+    The interface of the word schedulers: which bookmarks a user
+    should study now, and what happens to their schedule after an
+    exercise. See SchedulerFactory for how a user gets one.
+    """
+
+    CUSTOM_NAMES = []
+
+    @classmethod
+    def has_custom_name(cls, scheduler_name: str):
+        """
+        Check if the scheduler name is in the custom name list
+        :param scheduler_name: Scheduler name you want to check
+        :return: True if the given name is listed as a custom name for the implementing scheduler
+        """
+        return scheduler_name.lower() in [name.lower() for name in cls.CUSTOM_NAMES]
+
+    @classmethod
+    @abstractmethod
+    def bookmarks_to_study(cls, user, required_count):
+        """
+        :return: at most required_count bookmarks of the user, in their
+        learned language, the most urgent first; loaded together with
+        their words and context
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    def update(cls, db_session, bookmark, correctness, time=None):
+        """
+        Reschedules the bookmark after an exercise, which is already
+        recorded in the session; the caller commits
+
+        :param time: when the exercise was done; by default, now
+        """
+        pass